@@ -0,0 +1,194 @@
+from hand_event import ActionTaken
+
+
+class BettingRound:
+    """1回のベットラウンドの進行を管理するステートマシン。
+
+    アクションできる席 (フォールドもオール・インもしていない席) を双方向の環状リストで持ち、
+    最大のベット額、フォールドしていない人数、オール・インの人数、まだアクションが必要な人数を
+    アクションのたびに差分で更新する。そのため1アクションあたりの処理はプレイヤー数に依存しない。
+
+    next_player で手番のプレイヤーを、available_actions で利用可能なアクションを取得し、
+    apply でアクションを適用する。入力待ちを挟めるので、同期・非同期どちらの進行にも使える。
+
+    Attributes:
+        dealer (Dealer): ラウンドを進行するディーラー。
+        players (list[Player]): 席順のプレイヤーのリスト。
+        bb_value (int): BBの値。
+        bet_type (str): ベットタイプ。
+        street (str): ベットラウンド。
+        max_bet (int): このラウンドの最大のベット額。
+        num_live (int): フォールドしていないプレイヤー数。
+        num_all_in (int): フォールドしていないプレイヤーのうち、オール・インしている人数。
+        pending (int): このラウンドでまだアクションが必要なプレイヤー数。
+        is_finished (bool): ラウンドが終了したか。
+
+    Tests:
+        [x]: test_betting_round
+
+    """
+
+    # 他のプレイヤーにもう一度アクションを求めるアクション
+    AGGRESSIVE_ACTIONS = ("bet", "raise", "all-in")
+
+    def __init__(self, dealer, players, bb_value, bet_type, street):
+        """ラウンド開始時の状態を作る。
+
+        アクションはディーラーボタンの3つ隣から始まる。
+
+        Args:
+            dealer (Dealer): ラウンドを進行するディーラー。
+            players (list[Player]): 席順のプレイヤーのリスト。
+            bb_value (int): BBの値。
+            bet_type (str): ベットタイプ。
+            street (str): ベットラウンド。
+
+        """
+        self.dealer = dealer
+        self.players = players
+        self.bb_value = bb_value
+        self.bet_type = bet_type
+        self.street = street
+
+        num_players = len(players)
+        start_index = dealer.get_dealer_button_index(players, 3) % num_players
+        seats = []
+        self.max_bet = 0
+        self.num_live = 0
+        self.num_all_in = 0
+        for offset in range(num_players):
+            index = (start_index + offset) % num_players
+            player = players[index]
+            player.has_acted = False
+            self.max_bet = max(self.max_bet, player.current_bet)
+            if player.is_folded:
+                continue
+            self.num_live += 1
+            if player.is_all_in:
+                self.num_all_in += 1
+            else:
+                seats.append(index)
+
+        # アクションできる席の環状リスト
+        self._next = [None] * num_players
+        self._prev = [None] * num_players
+        for position, index in enumerate(seats):
+            self._next[index] = seats[(position + 1) % len(seats)]
+            self._prev[index] = seats[position - 1]
+
+        self.pending = len(seats)
+        self._current = seats[0] if seats else None
+        self.is_finished = self.num_live <= 1 or self.pending == 0
+
+    def next_player(self):
+        """手番のプレイヤーを返す。
+
+        Returns:
+            Player: 手番のプレイヤー。ラウンドが終了している場合はNone。
+
+        """
+        if self.is_finished:
+            return None
+        return self.players[self._current]
+
+    def available_actions(self):
+        """手番のプレイヤーが利用可能なアクションを返す。
+
+        Returns:
+            list[str]: 利用可能なアクションのリスト。
+
+        """
+        return self.dealer.set_action_list(self.players[self._current], self.dealer.bet_record, self.max_bet, self.bet_type)
+
+    def apply(self, action):
+        """手番のプレイヤーのアクションを適用し、手番を進める。
+
+        Args:
+            action (str): 手番のプレイヤーが選択したアクション。
+
+        Raises:
+            RuntimeError: ラウンドが既に終了している場合。
+
+        """
+        if self.is_finished:
+            raise RuntimeError("betting round is already finished")
+
+        dealer = self.dealer
+        index = self._current
+        player = self.players[index]
+
+        previous_bet = player.current_bet
+        dealer.selected_action(action, player, self.max_bet, self.bb_value, self.bet_type, self.street)
+        paid = player.current_bet - previous_bet
+        dealer.pot_ledger.add(player, paid)
+        dealer.action_history.append((self.street, player.name, action, paid))
+        if dealer.event_sink is not None:
+            dealer.event_sink(ActionTaken(self.street, player.name, action, paid))
+        player.has_acted = True
+
+        if player.current_bet > self.max_bet:
+            self.max_bet = player.current_bet
+
+        next_index = self._next[index]
+        if player.is_folded or player.is_all_in:
+            if player.is_folded:
+                self.num_live -= 1
+            else:
+                self.num_all_in += 1
+            self._remove(index)
+
+        if action in self.AGGRESSIVE_ACTIONS:
+            # 他のアクションできるプレイヤー全員に、もう一度アクションを求める
+            self.pending = self.num_live - self.num_all_in - (0 if player.is_folded or player.is_all_in else 1)
+        else:
+            self.pending -= 1
+
+        if self.pending == 0:
+            # ポットの回収、次のカードの公開に進む
+            dealer.bet_record = [0]
+            self.is_finished = True
+        elif self.num_live == 1:
+            self.is_finished = True
+        else:
+            self._current = next_index
+
+    def active_players(self):
+        """フォールドしていないプレイヤーを返す。
+
+        Returns:
+            list[Player]: 席順のフォールドしていないプレイヤーのリスト。
+
+        """
+        return [player for player in self.players if not player.is_folded]
+
+    def _remove(self, index):
+        """アクションできる席の環状リストから席を外す。
+
+        Args:
+            index (int): 外す席の位置。
+
+        """
+        next_index = self._next[index]
+        prev_index = self._prev[index]
+        self._next[prev_index] = next_index
+        self._prev[next_index] = prev_index
+
+
+def drive(steps):
+    """アクションを求めるジェネレータを、各プレイヤーの select_action で最後まで進める。
+
+    steps は (手番のプレイヤー, 利用可能なアクションのリスト) を yield し、選択されたアクションを send で受け取る。
+
+    Args:
+        steps (Generator): Dealer.betting_steps や Game.hand_steps が返すジェネレータ。
+
+    Returns:
+        obj: ジェネレータの戻り値。
+
+    """
+    try:
+        player, actions = next(steps)
+        while True:
+            player, actions = steps.send(player.select_action(actions))
+    except StopIteration as stop:
+        return stop.value
@@ -0,0 +1,319 @@
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from operator import attrgetter
+import random
+
+
+class SeatValues(Sequence):
+    """席順の各プレイヤーの1つの属性を、プレイヤーのリストをコピーせずに参照する読み取り専用のシーケンス。
+
+    要素は参照したときにその場で取り出すので、作るのも1つの要素を見るのも O(1)。
+    タプルやリストとは要素ごとに比較する。
+
+    """
+
+    __slots__ = ("_players", "_get")
+
+    def __init__(self, players, attribute):
+        """SeatValuesクラスの初期化。
+
+        Args:
+            players (list[Player]): 席順のプレイヤーのリスト。
+            attribute (str): 取り出す属性の名前。
+
+        """
+        self._players = players
+        self._get = attrgetter(attribute)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return tuple(map(self._get, self._players[index]))
+        return self._get(self._players[index])
+
+    def __len__(self):
+        return len(self._players)
+
+    def __eq__(self, other):
+        if isinstance(other, (SeatValues, tuple, list)):
+            return len(self) == len(other) and all(value == item for value, item in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self):
+        return repr(tuple(self))
+
+
+class GameStateView:
+    """ボットに渡す、ゲームの状態の読み取り専用ビュー。
+
+    ディーラーとプレイヤーのリストへの参照だけを持ち、各値は参照時にその場で求める。
+    席につくときに1度だけ作れば以降のハンドでもそのまま使えるので、意思決定のたびに
+    プレイヤーのリストや状態をコピーする必要はない。ハンドの間は変わらない自分の席とボタンの位置は
+    ハンドの開始時に set_seat で受け取り、ラウンドの最大のベット額などは進行中の BettingRound から読む。
+
+    Attributes:
+        player (Player): このビューの持ち主のプレイヤー。
+
+    Tests:
+        [x]: test_game_state_view
+
+    """
+
+    __slots__ = ("_dealer", "_players", "_player", "_seat", "_button")
+
+    def __init__(self, dealer, players, player):
+        """GameStateViewクラスの初期化。
+
+        Args:
+            dealer (Dealer): ゲームを進行しているディーラー。
+            players (list[Player]): 席順のプレイヤーのリスト。席の増減はそのまま反映される。
+            player (Player): このビューの持ち主のプレイヤー。
+
+        """
+        self._dealer = dealer
+        self._players = players
+        self._player = player
+        self._seat = None
+        self._button = None
+
+    def set_seat(self, seat, button):
+        """このハンドでの自分の席とディーラーボタンの位置を設定する。席の増減やボタンの移動のあとに呼ぶ。
+
+        Args:
+            seat (int): プレイヤーのリストでの自分の位置。
+            button (int): プレイヤーのリストでのディーラーボタンの位置。
+
+        """
+        self._seat = seat
+        self._button = button
+
+    @property
+    def player(self):
+        """このビューの持ち主のプレイヤーを返す。
+
+        """
+        return self._player
+
+    @property
+    def hole_cards(self):
+        """自分のホールカードを返す。
+
+        Returns:
+            tuple[Card]: ホールカード。
+
+        """
+        return tuple(self._player.hand)
+
+    @property
+    def board(self):
+        """公開済みのコミュニティカードを返す。
+
+        Returns:
+            tuple[Card]: コミュニティカード。
+
+        """
+        return tuple(self._dealer.community_cards)
+
+    @property
+    def street(self):
+        """現在のベットラウンドを返す。
+
+        Returns:
+            str: 'pre_flop'、'flop'、'turn'、'river' のいずれか。ハンド開始前はNone。
+
+        """
+        return self._dealer.street
+
+    @property
+    def chips(self):
+        """自分の残りのチップ数を返す。
+
+        """
+        return self._player.chips
+
+    @property
+    def pot(self):
+        """このハンドで出されたチップの合計を返す。
+
+        Returns:
+            int: このラウンドのベット額を含むポットの合計。
+
+        """
+        return self._dealer.pot_ledger.total
+
+    @property
+    def pots(self):
+        """このラウンドのベット額を含む、現在のポットごとの合計を返す。
+
+        サイドポットはアクセスしたときに pot_ledger から求める。
+
+        Returns:
+            tuple[int]: メインポットから順の合計。
+
+        """
+        return tuple(pot.total for pot in self._dealer.pot_ledger.pots())
+
+    @property
+    def current_bet(self):
+        """このラウンドの最大のベット額を返す。
+
+        ベットラウンドの進行中は BettingRound が更新している値を返す。
+
+        """
+        betting_round = self._dealer.betting_round
+        if betting_round is not None:
+            return betting_round.max_bet
+        return max(player.current_bet for player in self._players)
+
+    @property
+    def to_call(self):
+        """コールに必要な額を返す。
+
+        """
+        return min(self.current_bet - self._player.current_bet, self._player.chips)
+
+    @property
+    def big_blind(self):
+        """ビッグブラインドの額を返す。
+
+        """
+        return self._dealer.big_blind
+
+    @property
+    def num_players(self):
+        """席についているプレイヤー数を返す。
+
+        """
+        return len(self._players)
+
+    @property
+    def num_active(self):
+        """フォールドしていないプレイヤー数を返す。
+
+        """
+        betting_round = self._dealer.betting_round
+        if betting_round is not None:
+            return betting_round.num_live
+        return sum(1 for player in self._players if not player.is_folded)
+
+    @property
+    def position(self):
+        """ディーラーボタンから数えた自分の席の位置を返す。
+
+        Returns:
+            int: ボタンが0、SBが1、BBが2 (ヘッズアップ以外)。
+
+        """
+        if self._seat is None:
+            # set_seat で受け取っていなければ1度だけ求める
+            players = self._players
+            self.set_seat(players.index(self._player), next(index for index, player in enumerate(players) if player.is_dealer))
+        return (self._seat - self._button) % len(self._players)
+
+    @property
+    def stacks(self):
+        """席順の各プレイヤーのチップ数を返す。
+
+        Returns:
+            SeatValues: チップ数。
+
+        """
+        return SeatValues(self._players, "chips")
+
+    @property
+    def bets(self):
+        """席順の各プレイヤーのこのラウンドのベット額を返す。
+
+        Returns:
+            SeatValues: ベット額。
+
+        """
+        return SeatValues(self._players, "current_bet")
+
+    @property
+    def folded(self):
+        """席順の各プレイヤーがフォールドしているかを返す。
+
+        Returns:
+            SeatValues: フォールドしているか。
+
+        """
+        return SeatValues(self._players, "is_folded")
+
+    @property
+    def history(self):
+        """このハンドのアクションの履歴を返す。
+
+        Returns:
+            tuple[tuple[str, str, str, int]]: (ベットラウンド, プレイヤー名, アクション, 支払った額) の履歴。
+
+        """
+        return tuple(self._dealer.action_history)
+
+
+class Bot(ABC):
+    """CPUの意思決定を行うボットの基底クラス。
+
+    decide でアクションと、bet/raise の場合のベット額を返す。ベット額を None にした場合は、
+    最小・最大額が決まった時点で select_bet_amount が呼ばれる。
+
+    Tests:
+        [x]: test_bot
+
+    """
+
+    @abstractmethod
+    def decide(self, view, available_actions):
+        """アクションとベット額を決める。サブクラスで実装する。
+
+        Args:
+            view (GameStateView): ゲームの状態。
+            available_actions (list[str]): 利用可能なアクションのリスト。
+
+        Returns:
+            tuple[str, int]: アクションと、bet/raise の場合のベット額 (未定の場合はNone)。
+
+        """
+
+    def select_bet_amount(self, view, min_amount, max_amount):
+        """decide でベット額を決めなかった場合に、ベット額を決める。
+
+        Args:
+            view (GameStateView): ゲームの状態。
+            min_amount (int): 最小ベット額。
+            max_amount (int): 最大ベット額。
+
+        Returns:
+            int: ベット額。
+
+        """
+        return min_amount
+
+
+class RandomBot(Bot):
+    """利用可能なアクションとベット額を一様にランダムに選ぶボット。
+
+    Attributes:
+        rng (random.Random): 乱数生成器。
+
+    """
+
+    def __init__(self, rng=None):
+        """RandomBotクラスの初期化。
+
+        Args:
+            rng (random.Random, optional): 乱数生成器。Noneの場合は新しい random.Random を作る。
+
+        """
+        self.rng = rng if rng is not None else random.Random()
+
+    def decide(self, view, available_actions):
+        """利用可能なアクションからランダムに選ぶ。
+
+        """
+        return self.rng.choice(available_actions), None
+
+    def select_bet_amount(self, view, min_amount, max_amount):
+        """最小・最大額の範囲からランダムに選ぶ。
+
+        """
+        return self.rng.randint(min_amount, max_amount)
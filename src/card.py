@@ -4,25 +4,49 @@ class Card:
     このクラスはトランプの一枚のカードをモデル化したもので、スートとランクの情報を持つ。
     カードの比較や表示など、基本的な操作をサポートする。
 
+    カードは 0～51 の整数 ID でも表現でき、``id = ランク番号 * 4 + スート番号`` となる。
+    ランク番号は VALID_RANKS、スート番号は VALID_SUITS のインデックス。
+    Deck や HandEvaluator はこの ID を共通の識別子として使う。
+
+    52枚のカードはモジュールの読み込み時に1度だけ生成され、``Card(suit, rank)`` や from_id は
+    そのインスタンスを返す (フライウェイト)。カードは変更できないので、同じカードは常に同じ
+    インスタンスとなり、等価比較とハッシュはオブジェクトの同一性で行われる。
+    pickle やコピーをしても同じインスタンスに戻る。
+
     Attributes:
         suit (str): カードのスート。
         rank (str): カードのランク。
+        id (int): カードの整数 ID (0-51)。
+        rank_index (int): ランク番号 (2 が0、A が12)。
+        rank_value (int): ランクの強さ (2～14)。
+        suit_index (int): スート番号 (0-3)。
+        suit_bit (int): スートのビット (``1 << スート番号``)。
+        rank_weight (int): LookupHandEvaluator のランク構成キーの重み (``5 ** ランク番号``)。
+        suit_count (int): LookupHandEvaluator のスートごとの枚数の増分 (スートごとに4ビット)。
+        rank_mask (int): LookupHandEvaluator のスートごとのランクのビット (スートごとに13ビット)。
 
     Tests:
         [x]: test_card
 
     """
 
+    __slots__ = ("suit", "rank", "id", "rank_index", "rank_value", "suit_index", "suit_bit",
+                 "rank_weight", "suit_count", "rank_mask")
+
     VALID_SUITS = ["♤", "♡", "♢", "♧"]
     VALID_RANKS = ["2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K", "A"]
+    NUM_CARDS = 52
 
-    def __init__(self, suit, rank):
-        """カードを初期化する。
+    def __new__(cls, suit, rank):
+        """スートとランクに対応するカードのインスタンスを返す。
 
         Args:
             suit (str): カードのスート ("♤", "♡", "♢", "♧")
             rank (str): カードのランク ("2"-"10", "J", "Q", "K", "A")
 
+        Returns:
+            Card: 生成済みのカードのインスタンス。
+
         Raises:
             ValueError: VALID_RANK、VALID_SUIT以外が渡された時に発生。
 
@@ -30,13 +54,102 @@ class Card:
             [x]: test_card_initialization
 
         """
-        if suit not in self.VALID_SUITS:
-            raise ValueError(f"Invalid suit: {suit}. Valid suits are: {', '.join(self.VALID_SUITS)}")
-        if rank not in self.VALID_RANKS:
-            raise ValueError(f"Invalid rank: {rank}. Valid ranks are: {', '.join(self.VALID_RANKS)}")
+        card = _CARDS.get((suit, rank))
+        if card is None:
+            if suit not in cls.VALID_SUITS:
+                raise ValueError(f"Invalid suit: {suit}. Valid suits are: {', '.join(cls.VALID_SUITS)}")
+            raise ValueError(f"Invalid rank: {rank}. Valid ranks are: {', '.join(cls.VALID_RANKS)}")
+        return card
+
+    @classmethod
+    def _create(cls, card_id):
+        """整数 ID のカードのインスタンスを生成する。モジュールの読み込み時にのみ使う。
 
-        self.suit = suit
-        self.rank = rank
+        Args:
+            card_id (int): カードの整数 ID (0-51)。
+
+        Returns:
+            Card: 生成したカード。
+
+        """
+        card = object.__new__(cls)
+        rank_index, suit_index = card_id >> 2, card_id & 3
+        for name, value in (("suit", cls.VALID_SUITS[suit_index]), ("rank", cls.VALID_RANKS[rank_index]),
+                            ("id", card_id), ("rank_index", rank_index), ("rank_value", rank_index + 2),
+                            ("suit_index", suit_index), ("suit_bit", 1 << suit_index),
+                            ("rank_weight", 5 ** rank_index), ("suit_count", 1 << suit_index * 4),
+                            ("rank_mask", 1 << suit_index * 13 + rank_index)):
+            object.__setattr__(card, name, value)
+        return card
+
+    @classmethod
+    def from_id(cls, card_id):
+        """整数 ID からカードを取得する。
+
+        Args:
+            card_id (int): カードの整数 ID (0-51)。
+
+        Returns:
+            Card: ID に対応するカード。
+
+        Tests:
+            [x]: test_card_id_conversion
+
+        """
+        return _CARDS_BY_ID[card_id]
+
+    @staticmethod
+    def to_id(suit, rank):
+        """スートとランクの文字列から整数 ID を求める。
+
+        Args:
+            suit (str): カードのスート。
+            rank (str): カードのランク。
+
+        Returns:
+            int: カードの整数 ID (0-51)。
+
+        Raises:
+            KeyError: 無効なスートまたはランクが渡された時に発生。
+
+        """
+        return _CARDS[(suit, rank)].id
+
+    def __setattr__(self, name, value):
+        """カードは変更できないので、属性の設定を禁止する。
+
+        Raises:
+            AttributeError: 常に発生。
+
+        """
+        raise AttributeError(f"Card is immutable: cannot set {name!r}")
+
+    def __delattr__(self, name):
+        """カードは変更できないので、属性の削除を禁止する。
+
+        Raises:
+            AttributeError: 常に発生。
+
+        """
+        raise AttributeError(f"Card is immutable: cannot delete {name!r}")
+
+    def __reduce__(self):
+        """pickle から復元したときに、生成済みのインスタンスを返すようにする。
+
+        """
+        return Card.from_id, (self.id,)
+
+    def __copy__(self):
+        """コピーしても同じインスタンスを返す。
+
+        """
+        return self
+
+    def __deepcopy__(self, memo):
+        """コピーしても同じインスタンスを返す。
+
+        """
+        return self
 
     def __str__(self):
         """カードの文字列表現を返す。
@@ -61,3 +174,9 @@ class Card:
 
         """
         return f"Card('{self.suit}', '{self.rank}')"
+
+
+# 生成済みの52枚のカード。ID 順と、(スート, ランク) から引く辞書
+_CARDS = {}
+_CARDS_BY_ID = tuple(Card._create(card_id) for card_id in range(Card.NUM_CARDS))
+_CARDS.update({(card.suit, card.rank): card for card in _CARDS_BY_ID})
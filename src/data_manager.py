@@ -1,24 +1,39 @@
 import json
 import os
+import tempfile
+import time
 
 
 class DataManager:
     """データを管理するクラス。
 
+    write_behind を有効にすると、更新のたびにファイルへ書き込まず、変更したキーを記録しておき、
+    変更したキーの数か前回の書き込みからの経過時間が閾値を超えたとき、または flush や close を
+    呼んだときにまとめて書き込む。経過時間は更新時と tick を呼んだときにだけ確認するので、
+    更新が途絶えても間隔どおりに書き込むには、ゲームループなどから定期的に tick を呼ぶ。ファイルは一時ファイルに書いてから置き換えるので、書き込み中に
+    異常終了しても以前の内容が残る。
+
     Attributes:
         data_file_path (str): データが保存されるファイルのパス。
         data (dict[str, obj]): ロードしたデータ。
+        write_behind (bool): 書き込みを遅延させるか。
+        max_dirty (int): 書き込みを遅延させる場合に、まとめて書き込む変更したキーの数。
+        flush_interval (float): 書き込みを遅延させる場合に、まとめて書き込む間隔 (秒)。更新時と tick を呼んだときに確認する。
+            Noneの場合は時間では書き込まない。
 
     Tests:
         [ ]: test_data_manager
 
     """
 
-    def __init__(self, file_path):
+    def __init__(self, file_path, write_behind=False, max_dirty=100, flush_interval=5.0):
         """DataManagerクラスの初期化。
 
         Args:
             file_path (str): データが保存されるファイルのパス。
+            write_behind (bool, optional): 書き込みを遅延させるか。
+            max_dirty (int, optional): まとめて書き込む変更したキーの数。
+            flush_interval (float, optional): まとめて書き込む間隔 (秒)。更新時と tick を呼んだときに確認する。
 
         Tests:
             [ ]:
@@ -26,6 +41,11 @@ class DataManager:
         """
         self.data_file_path = file_path
         self.data = {}
+        self.write_behind = write_behind
+        self.max_dirty = max_dirty
+        self.flush_interval = flush_interval
+        self._dirty = set()
+        self._last_flush = time.monotonic()
         self.load_data()
 
     def load_data(self):
@@ -44,12 +64,67 @@ class DataManager:
     def save_data(self):
         """データをデータファイルに保存する。
 
+        同じディレクトリの一時ファイルに書いてから置き換えるので、ファイルが書きかけの状態になることはない。
+
         Tests:
             [ ]:
 
         """
-        with open(self.data_file_path, 'w') as file:
-            json.dump(self.data, file, indent=4)
+        directory = os.path.dirname(os.path.abspath(self.data_file_path))
+        file_descriptor, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+        try:
+            with os.fdopen(file_descriptor, 'w') as file:
+                json.dump(self.data, file, indent=4)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, self.data_file_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        self._dirty.clear()
+        self._last_flush = time.monotonic()
+
+    def flush(self):
+        """遅延させている変更があれば、データファイルに保存する。
+
+        """
+        if self._dirty:
+            self.save_data()
+
+    def tick(self):
+        """遅延させている変更があり、前回の書き込みから flush_interval 以上経過していれば保存する。
+
+        更新がなくても間隔どおりに書き込むため、ゲームループなどから定期的に呼ぶ。
+
+        """
+        if self._dirty and self._interval_elapsed():
+            self.save_data()
+
+    def close(self):
+        """遅延させている変更を保存する。終了時に呼ぶ。
+
+        """
+        self.flush()
+
+    def _mark_dirty(self, user_name):
+        """変更したキーを記録し、書き込みの条件を満たしていればデータファイルに保存する。
+
+        Args:
+            user_name (str): 変更したデータ名。
+
+        """
+        self._dirty.add(user_name)
+        if not self.write_behind or len(self._dirty) >= self.max_dirty or self._interval_elapsed():
+            self.save_data()
+
+    def _interval_elapsed(self):
+        """前回の書き込みから flush_interval 以上経過したかを返す。
+
+        Returns:
+            bool: 経過していれば True。flush_interval が None の場合は常に False。
+
+        """
+        return self.flush_interval is not None and time.monotonic() - self._last_flush >= self.flush_interval
 
     def get_user_data(self, user_name):
         """指定されたデータを取得する。
@@ -78,7 +153,27 @@ class DataManager:
 
         """
         self.data[user_name] = data
-        self.save_data()
+        self._mark_dirty(user_name)
+
+    def adjust_user_data(self, user_name, amount):
+        """指定されたユーザーのチップ数を増減する。
+
+        Args:
+            user_name (str): ユーザー名。
+            amount (int): 増減するチップ数。減らす場合は負の値。
+
+        Returns:
+            int: 増減後のチップ数。
+
+        Raises:
+            KeyError: ユーザーが存在しない場合。
+
+        """
+        if user_name not in self.data:
+            raise KeyError(user_name)
+        chips = self.data[user_name] + amount
+        self.update_user_data(user_name, chips)
+        return chips
 
     def add_new_user(self, user_name, initial_data):
         """新しいデータ名を追加し、初期データを設定する。
@@ -90,7 +185,7 @@ class DataManager:
         """
         if user_name not in self.data:
             self.data[user_name] = initial_data
-            self.save_data()
+            self._mark_dirty(user_name)
 
     def delete_user(self, user_name):
         """指定されたデータ名を削除する。
@@ -101,7 +196,7 @@ class DataManager:
         """
         if user_name in self.data:
             del self.data[user_name]
-            self.save_data()
+            self._mark_dirty(user_name)
 
     def get_or_create_user_data(self, user_name, default_chips=10000):
         """指定されたユーザー名のデータを取得し、存在しない場合は新しいユーザーを追加する。
@@ -1,6 +1,9 @@
+from betting_round import BettingRound, drive
 from deck import Deck
-from hand_evaluator import HandEvaluator
-from pot import Pot
+from hand_event import BlindPosted, BoardDealt, HoleCardsDealt, PotAwarded
+from lookup_hand_evaluator import LookupHandEvaluator
+from output_sink import ACTION
+from pot import Pot, PotLedger
 
 
 class Dealer:
@@ -13,15 +16,23 @@ class Dealer:
         message_handler (MessageHandler): メッセージ処理のインスタンス。
         input_handler (InputHandler): 入力処理のインスタンス。
         pots (list[Pot]): メインポット、サイドポット。
+        pot_ledger (PotLedger): このハンドでプレイヤーが出したチップの記録。
         bet_record (list[int]): 直前のベット額の記録。
         community_cards (list[Card]): コミュニティカード。
-        hand_evaluator (HandEvaluator): ハンド比較のインスタンス。
+        hand_evaluator (LookupHandEvaluator): ハンド比較のインスタンス。
+        street (str): 現在のベットラウンド。
+        betting_round (BettingRound): 進行中のベットラウンド。ラウンドの外ではNone。
+        action_history (list[tuple[str, str, str, int]]): このハンドの (ベットラウンド, プレイヤー名, アクション, 支払った額) の履歴。
+        event_sink (Callable[[HandEvent], None]): ハンドのイベントを受け取る関数。Noneの場合はイベントを作らない。
 
     Tests:
         [ ]: test_dealer
 
     """
 
+    # 公開済みのコミュニティカードの枚数ごとのベットラウンド
+    STREETS_BY_BOARD_SIZE = {3: "flop", 4: "turn", 5: "river"}
+
     def __init__(self, message_handler, input_handler):
         """ディーラーを初期化する。
 
@@ -36,10 +47,26 @@ class Dealer:
         self.message_handler = message_handler
         self.input_handler = input_handler
         self.pots = [Pot()]
+        self.pot_ledger = PotLedger()
         self.bet_record = []
         self.community_cards = []
-        self.hand_evaluator = HandEvaluator()
+        self.hand_evaluator = LookupHandEvaluator()
         self.big_blind = 0
+        self.street = None
+        self.betting_round = None
+        self.action_history = []
+        self.event_sink = None
+
+    def prepare_deck(self, seed):
+        """シードからハンド用のデッキを作り直す。
+
+        同じシードであれば同じ順番のデッキになる。
+
+        Args:
+            seed (int): デッキのシャッフルに使うシード。
+
+        """
+        self.deck.seed(seed)
 
     def burn_card(self):
         """バーンカードを行う。
@@ -82,7 +109,7 @@ class Dealer:
         self.message_handler.display_players_info(players, ["PlayerName", "Hand"])
 
         # 最も高いカードを持っているプレイヤーを特定
-        dealer_player = max(players, key=lambda player: (player.hand[0].rank, player.hand[0].suit))
+        dealer_player = max(players, key=lambda player: player.hand[0].id)
 
         # 一時的に持たせたカードを削除
         for player in players:
@@ -101,7 +128,10 @@ class Dealer:
         Tests:
             [ ]:
         """
-        return [player.is_dealer for player in players].index(True) + count
+        for index, player in enumerate(players):
+            if player.is_dealer:
+                return index + count
+        raise ValueError("no player has the dealer button")
 
     def deal_hole_cards(self, players):
         """各プレイヤーに2枚のホールカードを配るメソッド。
@@ -125,6 +155,10 @@ class Dealer:
         # 2枚目のカードを全プレイヤーに配る
         self.deal_card(players, start_position)
 
+        if self.event_sink is not None:
+            for player in players:
+                self.event_sink(HoleCardsDealt(player.name, tuple(player.hand)))
+
     def set_action_list(self, player, bet_record, current_max_bet, bet_type):
         """プレイヤーごとのアクションリストを作成。
 
@@ -278,6 +312,7 @@ class Dealer:
 
         ディーラーボタンの3つ隣からアクションを開始し、すべてのプレイヤーが
         同じベット額になるか、すべてのプレイヤーがアクションを完了するまで続行する。
+        各プレイヤーのアクションは select_action で選択させる。
 
         Args:
             players (list[Player]): Playerクラスのインスタンスのリスト。
@@ -290,81 +325,72 @@ class Dealer:
             list[Player]: この先もアクションをする人のリスト。
 
         """
-        self.big_blind = big_blind
-        # アクション開始位置をディーラーボタンの3つ隣からに設定
-        start_index = self.get_dealer_button_index(players, 3)
-        start_index %= len(players)
-
-        for player in players:
-            player.has_acted = False
-
-        while True:
-
-            # アクティブなプレイヤーが1人だけになった場合、アクションを終了
-            for i in range(len(players)):
-                current_index = (start_index + i) % len(players)
-                player = players[current_index]
-
-                active_players = [player for player in players if not player.is_folded]
-
-                # ある一人以外全員フォールドした場合
-                if len(active_players) == 1:
-                    # そのプレイヤーが勝ったので、勝利判定に進む
-                    return active_players
+        return drive(self.betting_steps(players, big_blind, bb_value, bet_type, bet_round))
 
-                if player.is_folded:
-                    continue
+    def betting_steps(self, players, big_blind, bb_value, bet_type, bet_round):
+        """ベットラウンドを1アクションずつ進めるジェネレータ。
 
-                # アクションの終了条件を確認
-                all_players_all_in = all(player.is_all_in for player in active_players if not player.is_folded)
-                if all_players_all_in:
-                    return active_players
+        手番のたびに (手番のプレイヤー, 利用可能なアクションのリスト) を yield し、選択されたアクションを
+        send で受け取る。アクションの選択を待つ間に他の処理ができるので、非同期のサーバーから使える。
+        進行状態は BettingRound が差分で管理する。
 
-                if player.is_all_in:  # オール・インしたプレイヤーはアクションを取らない
-                    continue
-
-                # 現在の最大掛け金取得
-                current_max_bet = max([player.current_bet for player in players])
+        Args:
+            players (list[Player]): Playerクラスのインスタンスのリスト。
+            big_blind (int): ビッグブラインド。
+            bb_value (int): BBの値。
+            bet_type (str): ベットタイプ。
+            bet_round (str): ベットラウンド。
 
-                action_list = self.set_action_list(player, self.bet_record, current_max_bet, bet_type)
+        Returns:
+            list[Player]: この先もアクションをする人のリスト。
 
-                # プレイヤーのアクション選択
-                action = player.select_action(action_list)
+        """
+        self.big_blind = big_blind
+        self.street = bet_round
+        betting_round = self.betting_round = BettingRound(self, players, bb_value, bet_type, bet_round)
 
-                self.selected_action(action, player, current_max_bet, bb_value, bet_type, bet_round)
+        while True:
+            player = betting_round.next_player()
+            if player is None:
+                self.betting_round = None
+                return betting_round.active_players()
 
-                player.has_acted = True
+            # プレイヤーのアクション選択
+            action = yield player, betting_round.available_actions()
 
-                self.message_handler.display_community_cards(self.community_cards, sum(pot.total for pot in self.pots))
+            betting_round.apply(action)
 
-                self.message_handler.display_players_info(players)
+            self.message_handler.display_community_cards(self.community_cards, self.pot_ledger.total, level=ACTION)
 
-                self.input_handler.wait_for_user()
+            self.message_handler.display_players_info(players, level=ACTION)
 
-                active_players = [player for player in players if not player.is_folded]
+            self.input_handler.wait_for_user()
 
-                if action in ["bet", "raise", "all-in"]:
-                    for other_player in active_players:
-                        if other_player != player:
-                            other_player.has_acted = False
+    def post_blind(self, player, amount):
+        """ブラインドを支払わせる。
 
-                active_players_bet = {player.current_bet for player in active_players if not player.is_folded}
-                active_players_acted = all(player.has_acted or player.is_all_in for player in active_players if not player.is_folded)
+        Args:
+            player (Player): ブラインドを支払うプレイヤー。
+            amount (int): ブラインドの額。
 
-                if len(active_players_bet) >= 1 and active_players_acted:
-                    # ポットの回収、フロップの公開に進む
-                    self.bet_record = [0]
-                    return active_players
+        Returns:
+            int: 実際に支払われた額。
 
-                # すべてのアクティブプレイヤーがオール・インしたかどうかをチェック
-                all_in_players = [player for player in active_players if player.is_all_in]
-                if len(all_in_players) == len(active_players) and active_players_acted:
-                    self.bet_record = [0]
-                    return active_players
+        """
+        paid = player.bet(amount)
+        self.pot_ledger.add(player, paid)
+        if self.event_sink is not None:
+            self.event_sink(BlindPosted(player.name, paid))
+        if player.chips == 0:
+            player.is_all_in = True
+        return paid
 
     def pot_collect(self, players):
         """プレイヤーの賭け金をポットとして集める。
 
+        賭け金はベットのたびに pot_ledger に記録済みなので、ここではベットラウンドの賭け金を
+        リセットするだけ。メインポットとサイドポットはショーダウンの分配時に記録から求める。
+
         Args:
             players (list[Player]): Playerクラスのインスタンスのリスト。
 
@@ -372,37 +398,11 @@ class Dealer:
             int: ポットの合計値。
 
         """
-        active_bets = sorted({player.current_bet for player in players if not player.is_folded})
-
-        last_bet = 0
-        for index, bet in enumerate(active_bets):
-            # 最初のポット（メインポット）であれば既存のものを使用、それ以外は新しいポットを作成
-            if index == 0:
-                pot = self.pots[0]
-            else:
-                pot = Pot()
-                self.pots.append(pot)
-
-            for player in players:
-                contribution = min(bet - last_bet, player.current_bet)
-                if contribution > 0:
-                    pot.add_contribution(player, contribution)
-                    player.current_bet -= contribution
-
-            last_bet = bet
-
-        # プレイヤーの現在のベットが0でない場合、残りを新しいサイドポットに追加
         for player in players:
-            if player.current_bet > 0:
-                if not self.pots or player.current_bet > self.pots[-1].total:
-                    pot = Pot()
-                    self.pots.append(pot)
-                pot.add_contribution(player, player.current_bet)
-                player.current_bet = 0
-
+            player.current_bet = 0
             player.last_action = []
 
-        return sum(pot.total for pot in self.pots)
+        return self.pot_ledger.total
 
     def reveal_community_cards(self, num_cards):
         """指定された枚数のコミュニティカードを公開する。
@@ -420,51 +420,69 @@ class Dealer:
             card = self.deck.draw()  # デッキからカードを1枚引く
             self.community_cards.append(card)
 
+        if self.event_sink is not None:
+            self.event_sink(BoardDealt(self.STREETS_BY_BOARD_SIZE[len(self.community_cards)], tuple(self.community_cards[-num_cards:])))
+
         return self.community_cards
 
-    def distribute_pots(self, active_players):
-        """アクティブなプレイヤーの手同士を評価し、ポットを分配する。
+    def distribute_pots(self, players):
+        """評価済みの手を比べ、ポットを分配する。
+
+        各ポットは獲得資格のあるプレイヤーの中で最も強い手を持つプレイヤーが獲得する。
+        割り切れない端数のチップは、ディーラーボタンの左隣から席順で先の勝者に1枚ずつ配る。
+        獲得資格のあるプレイヤーがいないポット (チップを出したプレイヤーが全員フォールドした場合) は、
+        出したチップをそれぞれのプレイヤーに返す。
 
         Args:
-            active_players (list[Player]): アクティブなプレイヤーのリスト。
+            players (list[Player]): 席順のプレイヤーのリスト (フォールドしたプレイヤーを含む)。
 
         """
-        ranked_players = sorted(active_players, key=lambda player: (player.hand_category.strength, player.hand_rank), reverse=True)
+        num_players = len(players)
+        button_index = self.get_dealer_button_index(players)
+        seat_order = {player: (index - button_index - 1) % num_players for index, player in enumerate(players)}
 
+        self.pots = self.pot_ledger.pots()
         for index, pot in enumerate(self.pots):
-            involved_players = list(pot.contributions.keys())
-            eligible_players = [player for player in ranked_players if player in involved_players]
+            eligible_players = pot.get_eligible_players()
+            if not eligible_players:
+                # 全員がフォールドした場合だけ起こり、そのときポットは1つなので、各プレイヤーの累計額を返せばよい
+                for player, amount in self.pot_ledger.contributions.items():
+                    player.chips += amount
+                continue
 
             # 一番強い手を持つプレイヤーが複数いる場合、ポットを分割
-            winners = [player for player in eligible_players if player.hand_category == eligible_players[0].hand_category
-                       and player.hand_rank == eligible_players[0].hand_rank]
-
-            total_in_this_pot = sum(pot.contributions.values())
+            best_score = max(player.hand_score for player in eligible_players)
+            winners = sorted((player for player in eligible_players if player.hand_score == best_score), key=seat_order.__getitem__)
 
             if index == 0:
                 self.message_handler.get_message("main_pot")
             else:
                 self.message_handler.get_message("side_pot", index=index)
 
-            for winner in winners:
-                get_chips = total_in_this_pot // len(winners)
+            share, remainder = divmod(pot.total, len(winners))
+            for winner_index, winner in enumerate(winners):
+                get_chips = share + (1 if winner_index < remainder else 0)
                 winner.chips += get_chips
                 self.message_handler.get_message("win_player", player_name=winner.name, get_chips=get_chips, chips=winner.chips)
+                if self.event_sink is not None:
+                    self.event_sink(PotAwarded(index, winner.name, get_chips))
 
-    def evaluate_and_fold_players(self, active_players):
-        """アクティブなプレイヤーの手を評価する。
+    def evaluate_and_fold_players(self, active_players, players):
+        """アクティブなプレイヤーの手を評価し、ポットを分配する。
 
         Args:
             active_players (list[Player]): アクティブなプレイヤーのリスト。
+            players (list[Player]): 席順のプレイヤーのリスト。端数のチップを配る順番に使う。
 
         """
         for player in active_players:
             player.hand_category, player.hand_rank = self.hand_evaluator.evaluate_hand(player.hand, self.community_cards)
+            player.hand_score = self.hand_evaluator.hand_score(player.hand_category, player.hand_rank)
             self.message_handler.get_message("player_best_hand", player_name=player.name,
                                              hand_category=player.hand_category.name_jp, hand_rank=player.hand_rank)
 
         # ポットを分配
-        self.distribute_pots(active_players)
+        self.distribute_pots(players)
 
     def distribute_pot(self, players):
         """勝ったプレイヤーにポットを渡す。
@@ -478,10 +496,12 @@ class Dealer:
         non_folded_players = [player for player in players if not player.is_folded]
 
         # ポットをフォールドしていないプレイヤーに渡す
-        get_chips = sum(pot.total for pot in self.pots)
+        get_chips = self.pot_ledger.total
         for player in non_folded_players:
             player.chips += get_chips
             self.message_handler.get_message("win_player", player_name=player.name, get_chips=get_chips, chips=player.chips)
+            if self.event_sink is not None:
+                self.event_sink(PotAwarded(0, player.name, get_chips))
 
     def reset_round(self, players):
         """ラウンドの終了後に必要な情報をリセットする。
@@ -501,18 +521,23 @@ class Dealer:
             player.is_all_in = False
             player.hand_category = None
             player.hand_rank = None
+            player.hand_score = None
 
         # 2. コミュニティカードのリセット
         self.community_cards = []
 
         # 3. ポットのリセット
         self.pots = [Pot()]
+        self.pot_ledger.reset()
 
         # 4. 別途履歴のリセット
         self.bet_record = []
+        self.street = None
+        self.betting_round = None
+        self.action_history = []
 
         # 5. デッキのリセット
-        self.deck = Deck()
+        self.deck.reset()
 
         # n. その他の必要な情報をリセット
         # 必要に応じて追加してください。
@@ -7,19 +7,53 @@ class Deck:
 
     52枚のカードからなる標準的なデッキを持つ。
 
+    カードは全デッキで共有する52枚の Card を並べた固定長のバッファに持ち、引いた枚数をカーソルで管理する。
+    カードを引くたびに残りのカードから1枚をランダムに選んでカーソルの位置と入れ替える (部分的な
+    Fisher-Yates シャッフル) ため、リセットはカーソルを戻すだけでよく、ハンドごとにカードやリストを作り直さない。
+    除外するカード (デッドカード) はバッファの末尾に寄せ、引く対象から外す。
+
     Attributes:
-        cards (list[Card]): カードのリスト。
+        cards (list[Card]): 残りのカードのリスト。
+        rng (random.Random): シャッフルに使う乱数生成器。
 
     Tests:
-        [ ]: test_deck
+        [x]: test_deck
 
     """
 
-    def __init__(self):
-        """デッキを初期化し、52枚のカードを生成する。
+    # 全デッキで共有する52枚のカード
+    FULL_DECK = tuple(Card.from_id(card_id) for card_id in range(Card.NUM_CARDS))
+
+    def __init__(self, rng=None, dead_cards=None):
+        """デッキを初期化し、52枚のカードを用意する。
+
+        Args:
+            rng (random.Random, optional): シャッフルに使う乱数生成器。Noneの場合は新しく作る。
+            dead_cards (list[Card], optional): デッキから除外するカード。
+
+        """
+        self.rng = rng if rng is not None else random.Random()
+        self._buffer = list(self.FULL_DECK)
+        self._size = Card.NUM_CARDS
+        self._cursor = 0
+        if dead_cards:
+            self.reset(dead_cards)
+
+    def __len__(self):
+        """残りのカードの枚数を返す。
 
         """
-        self.cards = self.generate_deck()
+        return self._size - self._cursor
+
+    @property
+    def cards(self):
+        """残りのカードのリストを返す。
+
+        Returns:
+            list[Card]: 残りのカード。引く順番とは限らない。
+
+        """
+        return self._buffer[self._cursor:self._size]
 
     def generate_deck(self):
         """52枚のカードを生成する。
@@ -28,27 +62,80 @@ class Deck:
             list[Card]: シャッフルされたカードのリスト。
 
         """
-        cards = [Card(suit, rank) for rank in Card.VALID_RANKS for suit in Card.VALID_SUITS]
-        random.shuffle(cards)
+        cards = list(self.FULL_DECK)
+        self.rng.shuffle(cards)
         return cards
 
+    def seed(self, seed):
+        """乱数生成器のシードを設定し、バッファを初期の並びに戻す。
+
+        引く順番はバッファの並びにも依存するので、並びも戻すことで同じシードから同じ順番でカードが引かれる。
+
+        Args:
+            seed (int): シード。
+
+        """
+        self.rng.seed(seed)
+        self._buffer[:] = self.FULL_DECK
+        self.reset()
+
+    def reset(self, dead_cards=None):
+        """引いたカードを全てデッキに戻す。
+
+        カードはバッファに残っているので、カーソルを戻すだけで済む。
+
+        Args:
+            dead_cards (list[Card], optional): デッキから除外するカード。
+
+        """
+        self._cursor = 0
+        self._size = len(self._buffer)
+        if dead_cards:
+            buffer = self._buffer
+            for card in dead_cards:
+                index = buffer.index(card)
+                if index < self._size:
+                    self._size -= 1
+                    buffer[index], buffer[self._size] = buffer[self._size], buffer[index]
+
     def shuffle(self, cards=None):
         """デッキ内のカードをシャッフルする。
 
         Args:
-            cards (list, optical): カードのリスト。
+            cards (list, optical): カードのリスト。指定した場合はデッキをそのカードに置き換える。
 
         """
-        if cards is None:
-            cards = self.cards
-        random.shuffle(cards)
-        self.cards = cards
+        if cards is not None:
+            self._buffer = list(cards)
+            self._size = len(cards)
+            self._cursor = 0
+
+        buffer = self._buffer
+        uniform = self.rng.random
+        start = self._cursor
+        for index in range(self._size - 1, start, -1):
+            swap = start + int(uniform() * (index - start + 1))
+            buffer[index], buffer[swap] = buffer[swap], buffer[index]
 
     def draw(self):
-        """デッキの一番上のカードを引く。
+        """デッキからカードを1枚引く。
 
         Returns:
             Card: 引いたカード。
 
+        Raises:
+            IndexError: デッキにカードが残っていない場合。
+
         """
-        return self.cards.pop()
+        cursor = self._cursor
+        remaining = self._size - cursor
+        if remaining <= 0:
+            raise IndexError("draw from an empty deck")
+
+        buffer = self._buffer
+        index = cursor + int(self.rng.random() * remaining)
+        card = buffer[index]
+        buffer[index] = buffer[cursor]
+        buffer[cursor] = card
+        self._cursor = cursor + 1
+        return card
@@ -0,0 +1,428 @@
+import math
+import random
+from statistics import NormalDist
+
+from card import Card
+from lookup_hand_evaluator import LookupHandEvaluator
+
+
+class EquityResult:
+    """エクイティ計算の結果を表すクラス。
+
+    引き分けの場合は、並んだ人数でポットを等分した割合を獲得ポット割合として加算する。
+
+    Attributes:
+        wins (int): 単独で勝った試行回数。
+        ties (int): 引き分けた試行回数。
+        losses (int): 負けた試行回数。
+        share (float): 獲得ポット割合の合計。
+        share_squares (float): 獲得ポット割合の二乗和。
+
+    Tests:
+        [x]: test_equity_calculator
+
+    """
+
+    def __init__(self, wins=0, ties=0, losses=0, share=0.0, share_squares=0.0):
+        """EquityResultクラスの初期化。
+
+        Args:
+            wins (int, optional): 単独で勝った試行回数。
+            ties (int, optional): 引き分けた試行回数。
+            losses (int, optional): 負けた試行回数。
+            share (float, optional): 獲得ポット割合の合計。
+            share_squares (float, optional): 獲得ポット割合の二乗和。
+
+        """
+        self.wins = wins
+        self.ties = ties
+        self.losses = losses
+        self.share = share
+        self.share_squares = share_squares
+
+    @property
+    def samples(self):
+        """試行回数の合計。
+
+        """
+        return self.wins + self.ties + self.losses
+
+    @property
+    def win(self):
+        """勝率。
+
+        """
+        return self.wins / self.samples if self.samples else 0.0
+
+    @property
+    def tie(self):
+        """引き分け率。
+
+        """
+        return self.ties / self.samples if self.samples else 0.0
+
+    @property
+    def lose(self):
+        """負け率。
+
+        """
+        return self.losses / self.samples if self.samples else 0.0
+
+    @property
+    def equity(self):
+        """引き分けの分割分を含めた、獲得できるポットの期待割合。
+
+        """
+        return self.share / self.samples if self.samples else 0.0
+
+    def standard_error(self):
+        """エクイティの推定値の標準誤差を返す。
+
+        Returns:
+            float: 標準誤差。試行回数が2未満の場合は無限大。
+
+        """
+        samples = self.samples
+        if samples < 2:
+            return math.inf
+        mean = self.share / samples
+        variance = max(self.share_squares / samples - mean * mean, 0.0)
+        return math.sqrt(variance / samples)
+
+    def merge(self, other):
+        """別の結果を合算する。
+
+        Args:
+            other (EquityResult): 合算する結果。
+
+        Returns:
+            EquityResult: 合算後の自身。
+
+        """
+        self.wins += other.wins
+        self.ties += other.ties
+        self.losses += other.losses
+        self.share += other.share
+        self.share_squares += other.share_squares
+        return self
+
+    def __repr__(self):
+        """結果のオブジェクト表現を返す。
+
+        """
+        return f"EquityResult(win={self.win:.4f}, tie={self.tie:.4f}, lose={self.lose:.4f}, samples={self.samples})"
+
+
+class EquityCalculator:
+    """任意の局面のエクイティを計算するクラス。
+
+    calculate は自分のホールカード、公開済みのボード、除外するカードとプレイヤー数を受け取り、
+    残りのデッキから相手のホールカードと残りのボードを無作為に引いて勝敗を数える (モンテカルロ法)。
+    calculate_exact は全員のホールカードが分かっている局面で、残りのボードをすべて列挙する。
+
+    Attributes:
+        hand_evaluator (LookupHandEvaluator): ハンド評価のインスタンス。
+        rng (random.Random): 乱数生成器。
+
+    Tests:
+        [x]: test_equity_calculator
+
+    """
+
+    def __init__(self, hand_evaluator=None, rng=None):
+        """EquityCalculatorクラスの初期化。
+
+        Args:
+            hand_evaluator (LookupHandEvaluator, optional): ハンド評価のインスタンス。
+            rng (random.Random, optional): 乱数生成器。
+
+        """
+        self.hand_evaluator = hand_evaluator if hand_evaluator is not None else LookupHandEvaluator()
+        self.rng = rng if rng is not None else random.Random()
+
+    def calculate(self, hole_cards, board_cards=None, dead_cards=None, num_players=2,
+                  samples=100000, tolerance=None, confidence=0.95, batch_size=1000):
+        """モンテカルロ法でエクイティを計算する。
+
+        batch_size 回の試行ごとに収束を判定し、信頼区間の半幅が tolerance 以下になった時点で打ち切る。
+
+        Args:
+            hole_cards (list[Card]): 自分の2枚のホールカード。
+            board_cards (list[Card], optional): 公開済みのコミュニティカード (0～5枚)。
+            dead_cards (list[Card], optional): デッキから除外するカード。
+            num_players (int, optional): 自分を含めたプレイヤー数。
+            samples (int, optional): 試行回数の上限。
+            tolerance (float, optional): 収束とみなすエクイティの信頼区間の半幅。Noneの場合は打ち切らない。
+            confidence (float, optional): 収束判定に使う信頼水準。
+            batch_size (int, optional): 収束判定を行う間隔。
+
+        Returns:
+            EquityResult: 計算結果。
+
+        Raises:
+            ValueError: カードの枚数やプレイヤー数が不正な場合、カードが重複している場合、
+                または試行回数か収束判定の間隔が1未満の場合に発生。
+
+        """
+        if samples < 1:
+            raise ValueError(f"Invalid number of samples: {samples}")
+        if batch_size < 1:
+            raise ValueError(f"Invalid batch size: {batch_size}")
+        hole_ids, board_ids, remaining_ids = self.prepare_sampling(hole_cards, board_cards, dead_cards, num_players)
+
+        z_value = NormalDist().inv_cdf((1 + confidence) / 2)
+        result = EquityResult()
+        while result.samples < samples:
+            self.sample_ids(result, hole_ids, board_ids, remaining_ids, num_players,
+                            min(batch_size, samples - result.samples))
+            if tolerance is not None and z_value * result.standard_error() <= tolerance:
+                break
+        return result
+
+    def calculate_exact(self, hands, board_cards=None, dead_cards=None):
+        """残りのボードをすべて列挙して、各プレイヤーの正確なエクイティを計算する。
+
+        ボードの状態は1枚ずつ差分で積み上げ、各ランアウトでは各プレイヤーの
+        ホールカードの状態を足して1回テーブルを引くだけで評価する。
+        フロップ以降であれば数ミリ秒～数十ミリ秒で終わる。
+
+        Args:
+            hands (list[list[Card]]): 各プレイヤーの2枚のホールカード。
+            board_cards (list[Card], optional): 公開済みのコミュニティカード (0～5枚)。
+            dead_cards (list[Card], optional): デッキから除外するカード。
+
+        Returns:
+            list[EquityResult]: hands と同じ順の各プレイヤーの計算結果。
+
+        Raises:
+            ValueError: カードの枚数やプレイヤー数が不正な場合、またはカードが重複している場合に発生。
+
+        """
+        hand_ids, board_ids, remaining_ids = self.prepare_exact(hands, board_cards, dead_cards)
+        return self.enumerate_ids(hand_ids, board_ids, remaining_ids)
+
+    def prepare_sampling(self, hole_cards, board_cards, dead_cards, num_players):
+        """モンテカルロ法の入力を検証し、カード ID に変換する。
+
+        Args:
+            hole_cards (list[Card]): 自分の2枚のホールカード。
+            board_cards (list[Card]): 公開済みのコミュニティカード。
+            dead_cards (list[Card]): デッキから除外するカード。
+            num_players (int): 自分を含めたプレイヤー数。
+
+        Returns:
+            tuple[list[int], list[int], list[int]]: ホールカード、ボード、残りのデッキのカード ID。
+
+        Raises:
+            ValueError: カードの枚数やプレイヤー数が不正な場合、またはカードが重複している場合に発生。
+
+        """
+        hole_ids, board_ids, remaining_ids = self.split_deck(hole_cards, board_cards, dead_cards)
+        if num_players < 2:
+            raise ValueError(f"Invalid number of players: {num_players}")
+        if len(remaining_ids) < 5 - len(board_ids) + (num_players - 1) * 2:
+            raise ValueError(f"Not enough cards left in the deck for {num_players} players")
+        return hole_ids, board_ids, remaining_ids
+
+    def prepare_exact(self, hands, board_cards, dead_cards):
+        """全列挙の入力を検証し、カード ID に変換する。
+
+        Args:
+            hands (list[list[Card]]): 各プレイヤーの2枚のホールカード。
+            board_cards (list[Card]): 公開済みのコミュニティカード。
+            dead_cards (list[Card]): デッキから除外するカード。
+
+        Returns:
+            tuple[list[list[int]], list[int], list[int]]: 各プレイヤーのホールカード、ボード、残りのデッキのカード ID。
+
+        Raises:
+            ValueError: カードの枚数やプレイヤー数が不正な場合、またはカードが重複している場合に発生。
+
+        """
+        if len(hands) < 2:
+            raise ValueError(f"Invalid number of players: {len(hands)}")
+        hand_ids = []
+        for hand in hands:
+            if len(hand) != 2:
+                raise ValueError(f"Invalid number of hole cards: {len(hand)}")
+            hand_ids.append([card.id for card in hand])
+        other_hands = [card for hand in hands[1:] for card in hand]
+        _, board_ids, remaining_ids = self.split_deck(hands[0], board_cards, other_hands + list(dead_cards or []))
+        return hand_ids, board_ids, remaining_ids
+
+    def enumerate_ids(self, hand_ids, board_ids, remaining_ids, first_indexes=None):
+        """カード ID で与えられた局面の残りのボードをすべて列挙する。
+
+        first_indexes を指定すると、1枚目に引くカードの位置がその中に含まれるランアウトだけを列挙する。
+        位置ごとに分割した結果を合算すると、全体を列挙した結果と一致する。
+
+        Args:
+            hand_ids (list[list[int]]): 各プレイヤーのホールカード ID。
+            board_ids (list[int]): 公開済みのボードのカード ID。
+            remaining_ids (list[int]): 残りのデッキのカード ID。
+            first_indexes (list[int], optional): 1枚目に引くカードの remaining_ids 内での位置。
+
+        Returns:
+            list[EquityResult]: hand_ids と同じ順の各プレイヤーの計算結果。
+
+        """
+        evaluator = self.hand_evaluator
+        hole_states = [evaluator.hand_state(ids) for ids in hand_ids]
+        results = [EquityResult() for _ in hand_ids]
+        key, suit_counts, rank_masks = evaluator.hand_state(board_ids)
+        num_runout = 5 - len(board_ids)
+
+        if first_indexes is None or num_runout == 0:
+            self._walk_runouts(remaining_ids, 0, num_runout, key, suit_counts, rank_masks, hole_states, results)
+            return results
+
+        for index in first_indexes:
+            card_id = remaining_ids[index]
+            self._walk_runouts(remaining_ids, index + 1, num_runout - 1, key + evaluator.CARD_WEIGHTS[card_id],
+                               suit_counts + evaluator.CARD_SUIT_COUNTS[card_id], rank_masks | evaluator.CARD_MASKS[card_id],
+                               hole_states, results)
+        return results
+
+    def _walk_runouts(self, deck, start, num_cards, key, suit_counts, rank_masks, hole_states, results):
+        """残りのボードを再帰的に列挙し、各ランアウトの勝敗を結果に加算する。
+
+        Args:
+            deck (list[int]): 残りのデッキのカード ID。
+            start (int): 次に引くカードの候補の先頭位置。
+            num_cards (int): まだ引く必要があるボードの枚数。
+            key (int): ここまでのボードのランク構成キー。
+            suit_counts (int): ここまでのボードのスートごとの枚数。
+            rank_masks (int): ここまでのボードのスートごとのランクのビットマスク。
+            hole_states (list[tuple[int, int, int]]): 各プレイヤーのホールカードの状態。
+            results (list[EquityResult]): 加算先の各プレイヤーの結果。
+
+        """
+        evaluator = self.hand_evaluator
+        if num_cards == 0:
+            scores = [evaluator.score_from_state(key + hole_key, suit_counts + hole_counts, rank_masks | hole_masks)
+                      for hole_key, hole_counts, hole_masks in hole_states]
+            best_score = max(scores)
+            num_best = scores.count(best_score)
+            split = 1.0 / num_best
+            for score, result in zip(scores, results):
+                if score != best_score:
+                    result.losses += 1
+                elif num_best == 1:
+                    result.wins += 1
+                    result.share += 1.0
+                    result.share_squares += 1.0
+                else:
+                    result.ties += 1
+                    result.share += split
+                    result.share_squares += split * split
+            return
+
+        weights = evaluator.CARD_WEIGHTS
+        counts = evaluator.CARD_SUIT_COUNTS
+        masks = evaluator.CARD_MASKS
+        for index in range(start, len(deck) - num_cards + 1):
+            card_id = deck[index]
+            self._walk_runouts(deck, index + 1, num_cards - 1, key + weights[card_id], suit_counts + counts[card_id],
+                               rank_masks | masks[card_id], hole_states, results)
+
+    def split_deck(self, hole_cards, board_cards, dead_cards):
+        """既知のカードを ID に変換し、残りのデッキを求める。
+
+        Args:
+            hole_cards (list[Card]): 自分の2枚のホールカード。
+            board_cards (list[Card]): 公開済みのコミュニティカード。
+            dead_cards (list[Card]): デッキから除外するカード。
+
+        Returns:
+            tuple[list[int], list[int], list[int]]: ホールカード、ボード、残りのデッキのカード ID。
+
+        Raises:
+            ValueError: カードの枚数が不正な場合、またはカードが重複している場合に発生。
+
+        """
+        hole_ids = [card.id for card in hole_cards]
+        board_ids = [card.id for card in board_cards or []]
+        dead_ids = [card.id for card in dead_cards or []]
+        if len(hole_ids) != 2:
+            raise ValueError(f"Invalid number of hole cards: {len(hole_ids)}")
+        if len(board_ids) > 5:
+            raise ValueError(f"Invalid number of board cards: {len(board_ids)}")
+
+        known_ids = hole_ids + board_ids + dead_ids
+        if len(set(known_ids)) != len(known_ids):
+            raise ValueError("Duplicate cards are given")
+
+        known = set(known_ids)
+        remaining_ids = [card_id for card_id in range(Card.NUM_CARDS) if card_id not in known]
+        return hole_ids, board_ids, remaining_ids
+
+    def sample_ids(self, result, hole_ids, board_ids, remaining_ids, num_players, batch_size):
+        """カード ID で与えられた局面で指定回数の試行を行い、結果に加算する。
+
+        Args:
+            result (EquityResult): 加算先の結果。
+            hole_ids (list[int]): 自分のホールカード ID。
+            board_ids (list[int]): 公開済みのボードのカード ID。
+            remaining_ids (list[int]): 残りのデッキのカード ID。
+            num_players (int): 自分を含めたプレイヤー数。
+            batch_size (int): 試行回数。
+
+        """
+        evaluator = self.hand_evaluator
+        weights = evaluator.CARD_WEIGHTS
+        counts = evaluator.CARD_SUIT_COUNTS
+        masks = evaluator.CARD_MASKS
+        score_from_state = evaluator.score_from_state
+        uniform = self.rng.random
+
+        board_key, board_counts, board_masks = evaluator.hand_state(board_ids)
+        hole_key, hole_counts, hole_masks = evaluator.hand_state(hole_ids)
+        num_runout = 5 - len(board_ids)
+        num_drawn = num_runout + (num_players - 1) * 2
+        deck = list(remaining_ids)
+        deck_size = len(deck)
+
+        wins = ties = losses = 0
+        share = share_squares = 0.0
+        for _ in range(batch_size):
+            # 先頭の num_drawn 枚だけを部分的にシャッフルして引く
+            for index in range(num_drawn):
+                swap_index = index + int(uniform() * (deck_size - index))
+                deck[index], deck[swap_index] = deck[swap_index], deck[index]
+            drawn = deck[:num_drawn]
+
+            key, suit_counts, rank_masks = board_key, board_counts, board_masks
+            for card_id in drawn[:num_runout]:
+                key += weights[card_id]
+                suit_counts += counts[card_id]
+                rank_masks |= masks[card_id]
+
+            hero_score = score_from_state(key + hole_key, suit_counts + hole_counts, rank_masks | hole_masks)
+
+            best_score = 0
+            num_best = 0
+            for index in range(num_runout, num_drawn, 2):
+                first = drawn[index]
+                second = drawn[index + 1]
+                score = score_from_state(key + weights[first] + weights[second],
+                                         suit_counts + counts[first] + counts[second],
+                                         rank_masks | masks[first] | masks[second])
+                if score > best_score:
+                    best_score = score
+                    num_best = 1
+                elif score == best_score:
+                    num_best += 1
+
+            if hero_score > best_score:
+                wins += 1
+                share += 1.0
+                share_squares += 1.0
+            elif hero_score == best_score:
+                ties += 1
+                split = 1.0 / (num_best + 1)
+                share += split
+                share_squares += split * split
+            else:
+                losses += 1
+
+        result.merge(EquityResult(wins, ties, losses, share, share_squares))
@@ -0,0 +1,214 @@
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from equity_calculator import EquityCalculator, EquityResult
+
+
+# ワーカープロセスごとに1つだけ作る計算インスタンス (評価テーブルの再構築を避ける)
+_worker_calculator = None
+
+
+def _init_worker():
+    """ワーカープロセスの初期化時に評価テーブルを構築する。
+
+    """
+    global _worker_calculator
+    _worker_calculator = EquityCalculator()
+
+
+def _get_worker_calculator():
+    """ワーカープロセスの計算インスタンスを返す。
+
+    Returns:
+        EquityCalculator: 計算インスタンス。
+
+    """
+    if _worker_calculator is None:
+        _init_worker()
+    return _worker_calculator
+
+
+def _sample_shard(hole_ids, board_ids, remaining_ids, num_players, samples, seed):
+    """モンテカルロ法の1シャード分の試行を行う。
+
+    Args:
+        hole_ids (list[int]): 自分のホールカード ID。
+        board_ids (list[int]): 公開済みのボードのカード ID。
+        remaining_ids (list[int]): 残りのデッキのカード ID。
+        num_players (int): 自分を含めたプレイヤー数。
+        samples (int): このシャードの試行回数。
+        seed (int): このシャードの乱数シード。
+
+    Returns:
+        EquityResult: このシャードの結果。
+
+    """
+    calculator = _get_worker_calculator()
+    calculator.rng = random.Random(seed)
+    result = EquityResult()
+    calculator.sample_ids(result, hole_ids, board_ids, remaining_ids, num_players, samples)
+    return result
+
+
+def _enumerate_shard(hand_ids, board_ids, remaining_ids, first_indexes):
+    """全列挙の1シャード分のランアウトを列挙する。
+
+    Args:
+        hand_ids (list[list[int]]): 各プレイヤーのホールカード ID。
+        board_ids (list[int]): 公開済みのボードのカード ID。
+        remaining_ids (list[int]): 残りのデッキのカード ID。
+        first_indexes (list[int]): このシャードが担当する1枚目のカードの位置。
+
+    Returns:
+        list[EquityResult]: このシャードの各プレイヤーの結果。
+
+    """
+    return _get_worker_calculator().enumerate_ids(hand_ids, board_ids, remaining_ids, first_indexes)
+
+
+class EquityExecutor:
+    """エクイティ計算やシミュレーションを複数プロセスに分割して実行するクラス。
+
+    試行回数やランアウトの範囲をシャードに分けてプロセスプールで並列に処理し、部分結果を合算する。
+    各シャードの乱数シードは executor のシードからシャード番号順に決まるので、
+    ワーカー数や処理順に関係なく同じシード・同じシャード数なら同じ結果になる。
+
+    Attributes:
+        max_workers (int): ワーカープロセス数。
+        seed (int): シャードごとのシードを導出する元のシード。
+
+    Tests:
+        [x]: test_equity_executor
+
+    """
+
+    def __init__(self, max_workers=None, seed=None):
+        """EquityExecutorクラスの初期化。
+
+        Args:
+            max_workers (int, optional): ワーカープロセス数。Noneの場合はCPUコア数。
+            seed (int, optional): シャードごとのシードを導出する元のシード。Noneの場合は毎回異なる。
+
+        """
+        self.max_workers = max_workers if max_workers is not None else os.cpu_count() or 1
+        self.seed = seed
+        self.calculator = EquityCalculator()
+        self._pool = None
+
+    def __enter__(self):
+        """with 文で使えるように自身を返す。
+
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """with 文の終了時にプロセスプールを閉じる。
+
+        """
+        self.close()
+
+    def close(self):
+        """プロセスプールを閉じる。
+
+        """
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def shard_seeds(self, num_shards):
+        """シャードごとの乱数シードを導出する。
+
+        Args:
+            num_shards (int): シャード数。
+
+        Returns:
+            list[int]: シャード番号順のシード。
+
+        """
+        seed_source = random.Random(self.seed)
+        return [seed_source.getrandbits(64) for _ in range(num_shards)]
+
+    def map_shards(self, function, total, num_shards=None):
+        """総数 total の仕事をシャードに分けて function を並列に実行する。
+
+        function は (件数, シード) を受け取るトップレベル関数で、各シャードの部分結果を返す。
+        合算方法は結果の型によって異なるので、呼び出し側で行う。
+
+        Args:
+            function (Callable[[int, int], object]): シャードごとに実行する関数。
+            total (int): 仕事の総数。
+            num_shards (int, optional): シャード数。Noneの場合はワーカー数。
+
+        Returns:
+            list[object]: シャード番号順の部分結果。
+
+        """
+        num_shards = num_shards if num_shards is not None else self.max_workers
+        num_shards = max(1, min(num_shards, total))
+        sizes = [total // num_shards + (1 if index < total % num_shards else 0) for index in range(num_shards)]
+        return list(self._get_pool().map(function, sizes, self.shard_seeds(num_shards)))
+
+    def calculate(self, hole_cards, board_cards=None, dead_cards=None, num_players=2, samples=1000000, num_shards=None):
+        """モンテカルロ法のエクイティ計算を並列に実行する。
+
+        Args:
+            hole_cards (list[Card]): 自分の2枚のホールカード。
+            board_cards (list[Card], optional): 公開済みのコミュニティカード (0～5枚)。
+            dead_cards (list[Card], optional): デッキから除外するカード。
+            num_players (int, optional): 自分を含めたプレイヤー数。
+            samples (int, optional): 全体の試行回数。
+            num_shards (int, optional): シャード数。Noneの場合はワーカー数。
+
+        Returns:
+            EquityResult: 全シャードを合算した結果。
+
+        """
+        hole_ids, board_ids, remaining_ids = self.calculator.prepare_sampling(hole_cards, board_cards, dead_cards, num_players)
+        function = partial(_sample_shard, hole_ids, board_ids, remaining_ids, num_players)
+
+        result = EquityResult()
+        for partial_result in self.map_shards(function, samples, num_shards):
+            result.merge(partial_result)
+        return result
+
+    def calculate_exact(self, hands, board_cards=None, dead_cards=None, num_shards=None):
+        """全列挙のエクイティ計算を、1枚目のランアウトのカードごとに分割して並列に実行する。
+
+        Args:
+            hands (list[list[Card]]): 各プレイヤーの2枚のホールカード。
+            board_cards (list[Card], optional): 公開済みのコミュニティカード (0～5枚)。
+            dead_cards (list[Card], optional): デッキから除外するカード。
+            num_shards (int, optional): シャード数。Noneの場合はワーカー数の4倍。
+
+        Returns:
+            list[EquityResult]: hands と同じ順の各プレイヤーの計算結果。
+
+        """
+        hand_ids, board_ids, remaining_ids = self.calculator.prepare_exact(hands, board_cards, dead_cards)
+        if len(board_ids) == 5:
+            return self.calculator.enumerate_ids(hand_ids, board_ids, remaining_ids)
+
+        # 先頭のカードほど後続のランアウトが多いので、位置を交互に割り振って負荷をならす
+        num_shards = num_shards if num_shards is not None else self.max_workers * 4
+        num_shards = max(1, min(num_shards, len(remaining_ids)))
+        shards = [list(range(index, len(remaining_ids), num_shards)) for index in range(num_shards)]
+        function = partial(_enumerate_shard, hand_ids, board_ids, remaining_ids)
+
+        results = [EquityResult() for _ in hands]
+        for partial_results in self._get_pool().map(function, shards):
+            for result, partial_result in zip(results, partial_results):
+                result.merge(partial_result)
+        return results
+
+    def _get_pool(self):
+        """プロセスプールを返す。未作成の場合は作成する。
+
+        Returns:
+            ProcessPoolExecutor: プロセスプール。
+
+        """
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker)
+        return self._pool
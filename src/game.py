@@ -1,5 +1,9 @@
 import random
 
+from betting_round import drive
+from bot import GameStateView
+from hand_event import HandEnded, HandStarted
+from hand_record import HandRecord
 from player import Player
 from table import Table
 
@@ -16,13 +20,16 @@ class Game:
         sb (int): SBの額。
         bb (int): BBの額。
         cpus (list[dict]): CPUの状態。
+        rng (random.Random): 席順、各ハンドのデッキのシード、CPUの行動に使う乱数生成器。
+        last_hand (HandRecord): 直前にプレイしたハンドの記録。
 
     Tests:
         [ ]: test_game
 
     """
 
-    def __init__(self, message_handler, input_handler, data_manager, player_name, chips, bet_type, sb, bb, cpus=None):
+    def __init__(self, message_handler, input_handler, data_manager, player_name, chips, bet_type, sb, bb, cpus=None, rng=None,
+                 event_sink=None):
         """Gameクラスのインスタンスを初期化する。
 
         必要なインスタンス変数の初期化や他のクラスのインスタンス化を行う。
@@ -36,18 +43,23 @@ class Game:
             sb (int): SBの額。
             bb (int): BBの額。
             cpus (list[dict]): CPUの状態。
+            rng (random.Random, optional): 乱数生成器。シードを固定したものを渡すとゲーム全体が再現できる。
+            event_sink (Callable[[HandEvent], None], optional): ハンドのイベントを受け取る関数 (例: HandLogWriter.emit)。
 
         """
         self.message_handler = message_handler
         self.input_handler = input_handler
         self.data_manager = data_manager
         self.table = Table(self.message_handler, self.input_handler)
+        self.table.dealer.event_sink = event_sink
         self.player_name = player_name
         self.chips = chips
         self.bet_type = bet_type
         self.sb = sb
         self.bb = bb
         self.cpus = cpus
+        self.rng = rng if rng is not None else random.Random()
+        self.last_hand = None
 
     def start_game(self):
         """ゲームを開始する。
@@ -60,6 +72,8 @@ class Game:
             last_chips = 0
             end_flg = False
             last_chips, end_flg = self.main_process()
+            # 更新が途絶えても遅延させている変更が間隔どおりに保存されるようにする
+            self.data_manager.tick()
             if end_flg:
                 break
 
@@ -80,18 +94,20 @@ class Game:
             num_cpu = self.input_handler.get_num_cpu()
             for i in range(num_cpu):
                 self.players.append(Player(name=f"CPU{i+1}", chips=self.chips,
-                                           input_handler=self.input_handler, is_cpu=True))
+                                           input_handler=self.input_handler, is_cpu=True, rng=self.rng))
         else:
             for cpu in self.cpus:
                 self.players.append(Player(name=cpu['name'], chips=cpu['chips'],
-                                           input_handler=self.input_handler, is_cpu=True))
+                                           input_handler=self.input_handler, is_cpu=True, bot=cpu.get('bot'), rng=self.rng))
 
         # ランダムに席につかせる
-        random.shuffle(self.players)
+        self.rng.shuffle(self.players)
+        self.attach_state_views()
 
         # ディーラーボタン配置の決定
         self.message_handler.get_message("set_initial_button")
         self.input_handler.wait_for_user()
+        self.table.dealer.prepare_deck(self.rng.getrandbits(64))
         button_holder = self.table.dealer.set_initial_button(self.players)
         self.message_handler.get_message("button_holder", player_name=button_holder.name)
         self.input_handler.wait_for_user()
@@ -99,6 +115,21 @@ class Game:
         # プレイヤー情報の表示
         self.display_game_state()
 
+    def attach_state_views(self):
+        """CPUのプレイヤーに、ボットに渡すゲームの状態のビューを持たせ、席とボタンの位置を教える。
+
+        ビューはディーラーとプレイヤーのリストを参照するだけなので、席につくときに1度だけ作る。
+        席とボタンの位置はハンドの間は変わらないので、ハンドの開始時に呼んで1度だけ求める。
+
+        """
+        button = next((index for index, player in enumerate(self.players) if player.is_dealer), None)
+        for seat, player in enumerate(self.players):
+            if player.is_cpu:
+                if player.state_view is None:
+                    player.state_view = GameStateView(self.table.dealer, self.players, player)
+                if button is not None:
+                    player.state_view.set_seat(seat, button)
+
     def collect_blinds(self):
         """Small BlindとBig Blindを徴収します。
 
@@ -117,8 +148,8 @@ class Game:
         self.bb_amount = self.bb  # ここは任意のBBの額を設定できます。
 
         # SBとBBの徴収
-        sb_player.bet(self.sb_amount)
-        bb_player.bet(self.bb_amount)
+        self.table.dealer.post_blind(sb_player, self.sb_amount)
+        self.table.dealer.post_blind(bb_player, self.bb_amount)
 
         self.table.dealer.bet_record.append(self.sb_amount)
         self.table.dealer.bet_record.append(self.bb_amount)
@@ -133,7 +164,7 @@ class Game:
 
         """
         # コミュニティカードの情報
-        self.message_handler.display_community_cards(self.table.dealer.community_cards, sum(pot.total for pot in self.table.dealer.pots))
+        self.message_handler.display_community_cards(self.table.dealer.community_cards, self.table.dealer.pot_ledger.total)
 
         # プレイヤー情報
         self.message_handler.display_players_info(self.players)
@@ -144,65 +175,10 @@ class Game:
     def main_process(self):
         """ゲームのメインロジックを実行する。
 
-        プリフロップ、フロップ、ターン、リバーなどの各段階での処理を行う。
+        1ハンドをプレイし、チップが0になったプレイヤーの処理や次のハンドの準備を行う。
 
         """
-        # デッキの作り直し
-        self.table.dealer.deck.generate_deck()
-
-        # SBとBBの徴収
-        self.collect_blinds()
-
-        # 各プレイヤーに２枚ずつカードを配る
-        self.table.dealer.deal_hole_cards(self.players)
-
-        # プレイヤー情報の表示
-        self.display_game_state()
-
-        # ベットラウンド開始
-        # コミュニティカードをめくる枚数
-        community_cards_dict = {
-            "flop": 3,
-            "turn": 1,
-            "river": 1
-        }
-
-        # プリフロップの開始
-        remaining_players = self.table.dealer.bet_round(self.players, self.bb_amount, self.bb, self.bet_type, bet_round='pre_flop')
-
-        # 賭け金をポットに移動。その他bet_round関数で設定した値の初期化処理
-        self.table.dealer.pot_collect(self.players)
-
-        # プレイヤー情報の表示
-        self.display_game_state()
-
-        if len(remaining_players) > 1:
-
-            for key, num_cards in community_cards_dict.items():
-
-                # コミュニティカードをめくる
-                self.table.dealer.reveal_community_cards(num_cards)
-
-                # プレイヤー情報の表示
-                self.display_game_state()
-
-                # フロップ、ターン、リバーベッティングラウンドを開始
-                remaining_players = self.table.dealer.bet_round(self.players, self.bb_amount, self.bb, self.bet_type, bet_round=key)
-
-                # 賭け金をポットに移動。その他bet_round関数で設定した値の初期化処理
-                self.table.dealer.pot_collect(self.players)
-
-                # プレイヤー情報の表示
-                self.display_game_state()
-
-                if len(remaining_players) == 1:
-                    break
-
-        # ここまででlen(remaining_players)が2以上なら、アクティブなプレイヤーで手の強さ比べを行う
-        if len(remaining_players) > 1:
-            self.table.dealer.evaluate_and_fold_players(remaining_players)
-        else:
-            self.table.dealer.distribute_pot(remaining_players)
+        self.play_hand()
 
         # CPUのチップ数が0になった場合
         # リバイするか、その席を抜けるか。playerclassでリバイ数を管理して、負けが増えるほど席を立つ確率が上がる
@@ -210,7 +186,7 @@ class Game:
             if player.is_cpu:
                 if player.chips == 0:
                     leave_probability = player.rebuy_count / 5
-                    if random.random() < leave_probability:
+                    if self.rng.random() < leave_probability:
                         self.message_handler.get_message("remove_cpu", player_name=player.name)
                         self.players.remove(player)
                     else:
@@ -233,8 +209,8 @@ class Game:
             else:
                 target_players[0].chips = rebuy_chips
                 # テーブルに持ち込むチップ数をセーブデータから減算
-                player_data = self.data_manager.get_or_create_user_data(self.player_name)
-                self.data_manager.update_user_data(self.player_name, player_data - rebuy_chips)
+                self.data_manager.get_or_create_user_data(self.player_name)
+                self.data_manager.adjust_user_data(self.player_name, -rebuy_chips)
         else:
             # ユーザーからの入力待機
             continue_to_game = self.input_handler.continue_to_game()
@@ -260,3 +236,105 @@ class Game:
         self.display_game_state()
 
         return target_players[0].chips, False
+
+    def play_hand(self, seed=None):
+        """1ハンドをプレイする。
+
+        ブラインドの徴収からプリフロップ、フロップ、ターン、リバーのベットラウンド、
+        ショーダウンとポットの分配までを行う。各プレイヤーのアクションは select_action で選択させる。
+
+        Args:
+            seed (int, optional): デッキのシード。Noneの場合はゲームの乱数生成器から決める。
+
+        Returns:
+            HandRecord: プレイしたハンドの記録。
+
+        """
+        return drive(self.hand_steps(seed))
+
+    def hand_steps(self, seed=None):
+        """1ハンドを1アクションずつ進めるジェネレータ。
+
+        Dealer.betting_steps と同じく、手番のたびに (手番のプレイヤー, 利用可能なアクションのリスト) を yield し、
+        選択されたアクションを send で受け取る。
+
+        Args:
+            seed (int, optional): デッキのシード。Noneの場合はゲームの乱数生成器から決める。
+
+        Returns:
+            HandRecord: プレイしたハンドの記録。
+
+        """
+        if seed is None:
+            seed = self.rng.getrandbits(64)
+        dealer = self.table.dealer
+        record = HandRecord(seed, self.bet_type, self.sb, self.bb, [(player.name, player.chips) for player in self.players],
+                            dealer.get_dealer_button_index(self.players))
+        self.attach_state_views()
+
+        if dealer.event_sink is not None:
+            dealer.event_sink(HandStarted(seed, self.bet_type, self.sb, self.bb, record.button, tuple(record.seats)))
+
+        # デッキの作り直し
+        dealer.prepare_deck(seed)
+
+        # SBとBBの徴収
+        self.collect_blinds()
+
+        # 各プレイヤーに２枚ずつカードを配る
+        self.table.dealer.deal_hole_cards(self.players)
+
+        # プレイヤー情報の表示
+        self.display_game_state()
+
+        # ベットラウンド開始
+        # コミュニティカードをめくる枚数
+        community_cards_dict = {
+            "flop": 3,
+            "turn": 1,
+            "river": 1
+        }
+
+        # プリフロップの開始
+        remaining_players = yield from self.table.dealer.betting_steps(self.players, self.bb_amount, self.bb, self.bet_type, bet_round='pre_flop')
+
+        # 賭け金をポットに移動。その他bet_round関数で設定した値の初期化処理
+        self.table.dealer.pot_collect(self.players)
+
+        # プレイヤー情報の表示
+        self.display_game_state()
+
+        if len(remaining_players) > 1:
+
+            for key, num_cards in community_cards_dict.items():
+
+                # コミュニティカードをめくる
+                self.table.dealer.reveal_community_cards(num_cards)
+
+                # プレイヤー情報の表示
+                self.display_game_state()
+
+                # フロップ、ターン、リバーベッティングラウンドを開始
+                remaining_players = yield from self.table.dealer.betting_steps(self.players, self.bb_amount, self.bb, self.bet_type, bet_round=key)
+
+                # 賭け金をポットに移動。その他bet_round関数で設定した値の初期化処理
+                self.table.dealer.pot_collect(self.players)
+
+                # プレイヤー情報の表示
+                self.display_game_state()
+
+                if len(remaining_players) == 1:
+                    break
+
+        # ここまででlen(remaining_players)が2以上なら、アクティブなプレイヤーで手の強さ比べを行う
+        if len(remaining_players) > 1:
+            self.table.dealer.evaluate_and_fold_players(remaining_players, self.players)
+        else:
+            self.table.dealer.distribute_pot(remaining_players)
+
+        record.actions = list(dealer.action_history)
+        record.result = [player.chips for player in self.players]
+        if dealer.event_sink is not None:
+            dealer.event_sink(HandEnded(tuple(record.result)))
+        self.last_hand = record
+        return record
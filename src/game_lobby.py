@@ -12,6 +12,7 @@ class GameLobby:
         data_manager (DataManager): セーブデータの管理を行うインスタンス。
         player_name (str): プレイヤー名。
         chips (int): 全体で所持しているチップ数。
+        rng (random.Random): テーブルやCPUの生成と、ゲームに渡す乱数生成器。
 
     Tests:
         [ ]: test_game_lobby
@@ -31,17 +32,21 @@ class GameLobby:
         # {'no': '9', 'SB': 5, 'BB': 10, 'bet_type': 'pot'},
     ]
 
-    def __init__(self, message_handler, input_handler, data_manager, player_name):
+    def __init__(self, message_handler, input_handler, data_manager, player_name, rng=None):
         """GameLobbyクラスのインスタンスを初期化する。
 
         必要なインスタンス変数の初期化や他のクラスのインスタンス化を行う。
 
+        Args:
+            rng (random.Random, optional): 乱数生成器。Noneの場合は新しく作る。
+
         """
         self.message_handler = message_handler
         self.input_handler = input_handler
         self.data_manager = data_manager
         self.player_name = player_name
         self.tables = None
+        self.rng = rng if rng is not None else random.Random()
 
     def display_tables(self):
         """テーブル一覧表示用メソッド
@@ -60,7 +65,7 @@ class GameLobby:
         # すでに立っているテーブルの一覧
         # ランダムに生成するテーブルの数を決定 (3〜5個)
         already_tables = []
-        num_of_tables = random.randint(3, 5)
+        num_of_tables = self.rng.randint(3, 5)
 
         # bet_type = ['no', 'fix', 'pot']
         bet_type = ['no', 'fix']
@@ -71,11 +76,11 @@ class GameLobby:
                 new_table_name = count
 
                 # 新しいテーブルのSBとBBをランダムに設定
-                sb = random.choice([1, 2, 5, 10])
+                sb = self.rng.choice([1, 2, 5, 10])
                 bb = sb * 2
 
                 # テーブルに2〜5人のCPUプレイヤーがいるとする
-                num_cpus = random.randint(2, 8)
+                num_cpus = self.rng.randint(2, 8)
                 cpu_players = self.generate_cpu_players(num_cpus, bb)
 
                 # 新しいテーブルをリストに追加
@@ -86,15 +91,16 @@ class GameLobby:
         self.message_handler.display_tables_info(already_tables, 'already')
         self.tables = already_tables
 
-    def generate_cpu_players(self, num_cpus, bb):
+    def generate_cpu_players(self, num_cpus, bb, bots=None):
         """ランダムでCPUを作成する
 
         Args:
             num_cpus (int): CPUの数
             bb (int): BBの値
+            bots (list[Bot], optional): 席ごとのボット。足りない席や None の席は RandomBot になる。
 
         Returns:
-            list[dict]: CPUとそのCPUが所持しているチップの辞書
+            list[dict]: CPUとそのCPUが所持しているチップ、ボットの辞書
 
         Tests:
             [ ]: test_[テストファイル/メソッド名]
@@ -105,12 +111,13 @@ class GameLobby:
             # BBの100倍を基本のチップ数とする
             base_chips = bb * 100
             # チップ数の増減をランダムに決定する（例：1%〜200%の範囲で変動）
-            chips_variation = random.randint(1, 200) / 100
+            chips_variation = self.rng.randint(1, 200) / 100
             chips = int(base_chips * chips_variation)
 
             cpu_player = {
                 'name': f'CPU{_+1}',
-                'chips': chips
+                'chips': chips,
+                'bot': bots[_] if bots is not None and _ < len(bots) else None
             }
             cpu_players.append(cpu_player)
         return cpu_players
@@ -131,22 +138,18 @@ class GameLobby:
             last_chips = self.input_handler.get_initial_chips()
 
             # テーブルに持ち込むチップ数をセーブデータから減算
-            self.data_manager.update_user_data(self.player_name, self.player_data - last_chips)
-
-            # 現在のセーブデータを取得
-            self.player_data = self.data_manager.get_or_create_user_data(self.player_name)
+            self.player_data = self.data_manager.adjust_user_data(self.player_name, -last_chips)
 
             # 選択されたテーブルからCPUs情報を取得
             cpus_info = selected_table.get('CPUs', None)
 
             # ゲームのインスタンスを生成し、ゲームを開始
             game_instance = Game(self.message_handler, self.input_handler, self.data_manager, self.player_name, last_chips,
-                                 sb=selected_table['SB'], bb=selected_table['BB'], bet_type=selected_table['bet_type'], cpus=cpus_info)
+                                 sb=selected_table['SB'], bb=selected_table['BB'], bet_type=selected_table['bet_type'], cpus=cpus_info, rng=self.rng)
             last_chips = game_instance.start_game()
 
             # ゲームが終了したら、プレイヤーのチップ数をセーブデータに保存
-            self.data_manager.update_user_data(self.player_name, self.player_data + last_chips)
-            self.player_data = self.data_manager.get_or_create_user_data(self.player_name)
+            self.player_data = self.data_manager.adjust_user_data(self.player_name, last_chips)
 
             # プレイヤーのチップ数が0になった場合
             if self.player_data == 0:
@@ -39,6 +39,10 @@ class HandCategory(Enum):
 class HandEvaluator:
     """ハンドの強さを比較するクラス。
 
+    ハンドの強さは (HandCategory, rank) の組のほか、カテゴリをまたいで大小比較できる
+    1つの整数スコアとしても表現できる。スコアは上位4ビットがカテゴリの強さ、
+    その下に rank の各値を4ビットずつ最大5つ左詰めで並べた24ビットの整数。
+
     Tests:
         [ ]: test_hand_evaluator
 
@@ -46,9 +50,70 @@ class HandEvaluator:
     RANKS = {str(i): i for i in range(2, 11)}
     RANKS.update({"J": 11, "Q": 12, "K": 13, "A": 14})
 
+    SCORE_RANK_BITS = 4
+    SCORE_RANK_SLOTS = 5
+    SCORE_CATEGORY_SHIFT = SCORE_RANK_BITS * SCORE_RANK_SLOTS
+
     def __init__(self):
         pass
 
+    @classmethod
+    def hand_score(cls, category, rank):
+        """ハンドカテゴリとランクを1つの整数スコアに変換する。
+
+        Args:
+            category (HandCategory): ハンドカテゴリ。
+            rank (list[int] | int | None): ハンドのランク。
+
+        Returns:
+            int: 大きいほど強いハンドのスコア。
+
+        Tests:
+            [x]: test_hand_score_ordering
+
+        """
+        if rank is None:
+            ranks = []
+        elif isinstance(rank, int):
+            ranks = [rank]
+        else:
+            ranks = rank
+
+        score = category.strength
+        for index in range(cls.SCORE_RANK_SLOTS):
+            score = score << cls.SCORE_RANK_BITS | (ranks[index] if index < len(ranks) else 0)
+        return score
+
+    @classmethod
+    def category_from_score(cls, score):
+        """スコアからハンドカテゴリを求める。
+
+        Args:
+            score (int): hand_score で求めたスコア。
+
+        Returns:
+            HandCategory: スコアに対応するハンドカテゴリ。
+
+        """
+        strength = score >> cls.SCORE_CATEGORY_SHIFT
+        for category in HandCategory:
+            if category.strength == strength:
+                return category
+        raise ValueError(f"Invalid hand score: {score}")
+
+    def evaluate_score(self, player_hand, community_cards):
+        """プレイヤーの手とコミュニティカードから、もっとも強い５枚のスコアを返すメソッド。
+
+        Args:
+            player_hand (list[Card]): 2枚のカードのリスト。
+            community_cards (list[Card]): 5枚のカードのリスト。
+
+        Returns:
+            int: そのプレイヤーの最も強いハンドのスコア。
+
+        """
+        return self.hand_score(*self.evaluate_hand(player_hand, community_cards))
+
     def evaluate_hand(self, player_hand, community_cards):
         """プレイヤーの手とコミュニティカードからもっとも強い５枚を選定し、そのハンドのカテゴリトランクを返すメソッド。
 
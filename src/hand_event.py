@@ -0,0 +1,157 @@
+class HandEvent:
+    """ハンド中の出来事を表すイベントの基底クラス。
+
+    各イベントは変更しない値として扱い、サブクラスの __slots__ に並べたフィールドを持つ。
+    Dealer と Game はハンドの進行に合わせてイベントを event_sink に渡す。
+
+    Attributes:
+        KIND (int): イベントの種類を表す番号。ログの形式で使うので変更しないこと。
+
+    Tests:
+        [x]: test_hand_event
+
+    """
+
+    __slots__ = ()
+    KIND = 0
+
+    def __init__(self, *args):
+        """__slots__ の順に各フィールドを設定する。
+
+        Args:
+            *args: __slots__ の順のフィールドの値。
+
+        Raises:
+            TypeError: 値の数がフィールドの数と異なる場合。
+
+        """
+        if len(args) != len(self.__slots__):
+            raise TypeError(f"{type(self).__name__} takes {len(self.__slots__)} arguments ({len(args)} given)")
+        for name, value in zip(self.__slots__, args):
+            setattr(self, name, value)
+
+    def fields(self):
+        """フィールドの値を __slots__ の順に返す。
+
+        Returns:
+            tuple: フィールドの値。
+
+        """
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other):
+        """種類と全てのフィールドが等しいかを比較する。
+
+        """
+        if type(self) is not type(other):
+            return NotImplemented
+        return self.fields() == other.fields()
+
+    def __repr__(self):
+        """イベントのオブジェクト表現を返す。
+
+        """
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({values})"
+
+
+class HandStarted(HandEvent):
+    """ハンドの開始。
+
+    Attributes:
+        seed (int): デッキのシード。
+        bet_type (str): ベットタイプ。
+        sb (int): SBの額。
+        bb (int): BBの額。
+        button (int): ディーラーボタンを持つ席の位置。
+        seats (tuple[tuple[str, int]]): 席順の (プレイヤー名, チップ数)。
+
+    """
+
+    __slots__ = ("seed", "bet_type", "sb", "bb", "button", "seats")
+    KIND = 1
+
+
+class HoleCardsDealt(HandEvent):
+    """ホールカードの配布。
+
+    Attributes:
+        player (str): プレイヤー名。
+        cards (tuple[Card]): 配られたカード。
+
+    """
+
+    __slots__ = ("player", "cards")
+    KIND = 2
+
+
+class BlindPosted(HandEvent):
+    """ブラインドの支払い。
+
+    Attributes:
+        player (str): プレイヤー名。
+        amount (int): 支払った額。
+
+    """
+
+    __slots__ = ("player", "amount")
+    KIND = 3
+
+
+class ActionTaken(HandEvent):
+    """プレイヤーのアクション。
+
+    Attributes:
+        street (str): ベットラウンド。
+        player (str): プレイヤー名。
+        action (str): アクション。
+        amount (int): アクションで支払った額。
+
+    """
+
+    __slots__ = ("street", "player", "action", "amount")
+    KIND = 4
+
+
+class BoardDealt(HandEvent):
+    """コミュニティカードの公開。
+
+    Attributes:
+        street (str): 公開したベットラウンド ('flop'、'turn'、'river')。
+        cards (tuple[Card]): 公開したカード。
+
+    """
+
+    __slots__ = ("street", "cards")
+    KIND = 5
+
+
+class PotAwarded(HandEvent):
+    """ポットの獲得。
+
+    Attributes:
+        pot_index (int): ポットの番号 (0がメインポット)。
+        player (str): 獲得したプレイヤー名。
+        amount (int): 獲得した額。
+
+    """
+
+    __slots__ = ("pot_index", "player", "amount")
+    KIND = 6
+
+
+class HandEnded(HandEvent):
+    """ハンドの終了。
+
+    Attributes:
+        stacks (tuple[int]): 席順のハンド終了時のチップ数。
+
+    """
+
+    __slots__ = ("stacks",)
+    KIND = 7
+
+
+# イベントの種類の番号からクラスを引く辞書
+EVENT_TYPES = {event_type.KIND: event_type for event_type in
+               (HandStarted, HoleCardsDealt, BlindPosted, ActionTaken, BoardDealt, PotAwarded, HandEnded)}
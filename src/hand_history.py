@@ -0,0 +1,340 @@
+import re
+
+from card import Card
+from hand_event import ActionTaken, BlindPosted, BoardDealt, HandEnded, HandStarted, HoleCardsDealt, PotAwarded
+from hand_record import HandRecord
+
+
+# カードは一般的なハンド履歴と同じ2文字 (ランク + スートの頭文字) で表記する
+_RANK_TEXT = {"10": "T"}
+_SUIT_TEXT = {"♤": "s", "♡": "h", "♢": "d", "♧": "c"}
+_CARDS_BY_TEXT = {(_RANK_TEXT.get(card.rank, card.rank) + _SUIT_TEXT[card.suit]): card
+                  for card in (Card.from_id(card_id) for card_id in range(Card.NUM_CARDS))}
+_TEXT_BY_CARD = {card: text for text, card in _CARDS_BY_TEXT.items()}
+
+BET_TYPE_NAMES = {"no": "No Limit", "fix": "Fixed Limit", "pot": "Pot Limit"}
+STREET_HEADERS = {"flop": "FLOP", "turn": "TURN", "river": "RIVER"}
+# アクションの表記。額はそのアクションで支払ったチップ (レイズ後の総額ではない)
+ACTION_VERBS = {"fold": "folds", "check": "checks", "call": "calls", "bet": "bets", "raise": "raises", "all-in": "goes all-in"}
+BLIND_VERBS = ("posts small blind", "posts big blind")
+
+_HEADER_PATTERN = re.compile(r"^Hand #(\d+): Hold'em (.+) \((\d+)/(\d+)\) - Seed (\d+)$")
+_BUTTON_PATTERN = re.compile(r"^Table '.*' \d+-max Seat #(\d+) is the button$")
+_SEAT_PATTERN = re.compile(r"^Seat (\d+): (.+) \((\d+) in chips\)$")
+_DEALT_PATTERN = re.compile(r"^Dealt to (.+) \[(.*)\]$")
+_STREET_PATTERN = re.compile(r"^\*\*\* (FLOP|TURN|RIVER) \*\*\* (?:\[.*\] )?\[(.*)\]$")
+_ACTION_PATTERN = re.compile(r"^(.+): (" + "|".join(re.escape(verb) for verb in list(ACTION_VERBS.values()) + list(BLIND_VERBS))
+                             + r")(?: (\d+))?$")
+_COLLECT_PATTERN = re.compile(r"^(.+) collected (\d+) from (?:main pot|side pot-(\d+))$")
+_SUMMARY_PATTERN = re.compile(r"^Seat (\d+): (.+) ends with (\d+)$")
+
+
+def format_cards(cards):
+    """カードを空白区切りの2文字表記にする。
+
+    Args:
+        cards (Iterable[Card]): カード。
+
+    Returns:
+        str: "As Kh" のような文字列。
+
+    """
+    return " ".join(_TEXT_BY_CARD[card] for card in cards)
+
+
+def parse_cards(text):
+    """format_cards の文字列からカードを復元する。
+
+    Args:
+        text (str): "As Kh" のような文字列。
+
+    Returns:
+        tuple[Card]: カード。
+
+    Raises:
+        ValueError: 無効なカードの表記を含む場合。
+
+    """
+    try:
+        return tuple(_CARDS_BY_TEXT[token] for token in text.split())
+    except KeyError as error:
+        raise ValueError(f"Invalid card: {error.args[0]}") from None
+
+
+def format_hand(events, hand_number, table_name="headless"):
+    """1ハンド分のイベントをテキストのハンド履歴にする。
+
+    Args:
+        events (list[HandEvent]): HandStarted から HandEnded までの1ハンド分のイベント。
+        hand_number (int): ハンド番号。
+        table_name (str, optional): テーブル名。
+
+    Returns:
+        list[str]: ハンド履歴の行 (改行なし)。
+
+    Raises:
+        ValueError: 最初のイベントが HandStarted でない場合。
+
+    """
+    if not events or not isinstance(events[0], HandStarted):
+        raise ValueError("a hand must start with a HandStarted event")
+
+    start = events[0]
+    board = []
+    num_blinds = 0
+    lines = [
+        f"Hand #{hand_number}: Hold'em {BET_TYPE_NAMES[start.bet_type]} ({start.sb}/{start.bb}) - Seed {start.seed}",
+        f"Table '{table_name}' {len(start.seats)}-max Seat #{start.button + 1} is the button",
+    ]
+    lines.extend(f"Seat {index + 1}: {name} ({chips} in chips)" for index, (name, chips) in enumerate(start.seats))
+
+    for event in events[1:]:
+        if isinstance(event, BlindPosted):
+            lines.append(f"{event.player}: {BLIND_VERBS[min(num_blinds, 1)]} {event.amount}")
+            num_blinds += 1
+        elif isinstance(event, HoleCardsDealt):
+            if not lines[-1].startswith("Dealt to "):
+                lines.append("*** HOLE CARDS ***")
+            lines.append(f"Dealt to {event.player} [{format_cards(event.cards)}]")
+        elif isinstance(event, ActionTaken):
+            verb = ACTION_VERBS[event.action]
+            lines.append(f"{event.player}: {verb}" if event.action in ("fold", "check") else f"{event.player}: {verb} {event.amount}")
+        elif isinstance(event, BoardDealt):
+            previous = f"[{format_cards(board)}] " if board else ""
+            board.extend(event.cards)
+            lines.append(f"*** {STREET_HEADERS[event.street]} *** {previous}[{format_cards(event.cards)}]")
+        elif isinstance(event, PotAwarded):
+            pot_name = "main pot" if event.pot_index == 0 else f"side pot-{event.pot_index}"
+            lines.append(f"{event.player} collected {event.amount} from {pot_name}")
+        elif isinstance(event, HandEnded):
+            lines.append("*** SUMMARY ***")
+            lines.extend(f"Seat {index + 1}: {name} ends with {chips}"
+                         for index, ((name, _), chips) in enumerate(zip(start.seats, event.stacks)))
+    return lines
+
+
+class HandHistoryWriter:
+    """ハンドのイベントをテキストのハンド履歴としてファイルに書き込むクラス。
+
+    HandLogWriter と同じく emit でイベントを受け取り、HandEnded を受け取った時点で1ハンド分を
+    空行区切りで追記する。Dealer.event_sink に emit を渡すか、HandLogReader から読んだイベントを
+    write_hand に渡して変換する。
+
+    Attributes:
+        file (TextIO): 書き込み先のファイル。
+        table_name (str): テーブル名。
+        hand_number (int): 最後に書き込んだハンドの番号。
+
+    Tests:
+        [x]: test_hand_history_round_trip
+
+    """
+
+    def __init__(self, path, table_name="headless", first_hand_number=1):
+        """ハンド履歴のファイルを追記モードで開く。
+
+        Args:
+            path (str): ハンド履歴のファイルのパス。
+            table_name (str, optional): テーブル名。
+            first_hand_number (int, optional): 最初に書き込むハンドの番号。
+
+        """
+        self.file = open(path, "a", encoding="utf-8")
+        self.table_name = table_name
+        self.hand_number = first_hand_number - 1
+        self._events = []
+
+    def __enter__(self):
+        """with 文で使えるように自身を返す。
+
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """with 文の終了時にファイルを閉じる。
+
+        """
+        self.close()
+
+    def emit(self, event):
+        """イベントを受け取る。HandEnded を受け取ったら1ハンド分を書き込む。
+
+        Args:
+            event (HandEvent): イベント。
+
+        """
+        if isinstance(event, HandStarted):
+            self._events = []
+        self._events.append(event)
+        if isinstance(event, HandEnded):
+            self.write_hand(self._events)
+            self._events = []
+
+    def write_hand(self, events):
+        """1ハンド分のイベントをハンド履歴として追記する。
+
+        Args:
+            events (list[HandEvent]): 1ハンド分のイベント。
+
+        """
+        self.hand_number += 1
+        self.file.write("\n".join(format_hand(events, self.hand_number, self.table_name)))
+        self.file.write("\n\n")
+
+    def close(self):
+        """ファイルを閉じる。
+
+        """
+        if not self.file.closed:
+            self.file.close()
+
+
+def split_hands(lines):
+    """行の流れを、空行で区切られた1ハンドごとの行のリストに分ける。
+
+    1ハンド分の行しか保持しないので、大きなファイルでも使用メモリは一定になる。
+
+    Args:
+        lines (Iterable[str]): ハンド履歴の行。
+
+    Yields:
+        list[str]: 1ハンド分の行 (改行なし)。
+
+    """
+    block = []
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if line:
+            block.append(line)
+        elif block:
+            yield block
+            block = []
+    if block:
+        yield block
+
+
+def parse_hand(lines):
+    """1ハンド分のハンド履歴の行からイベントを復元する。
+
+    Args:
+        lines (list[str]): format_hand が出力した1ハンド分の行。
+
+    Returns:
+        list[HandEvent]: 1ハンド分のイベント。
+
+    Raises:
+        ValueError: 解釈できない行を含む場合。
+
+    """
+    header = _HEADER_PATTERN.match(lines[0])
+    button = _BUTTON_PATTERN.match(lines[1]) if len(lines) > 1 else None
+    if header is None or button is None:
+        raise ValueError(f"Invalid hand header: {lines[0]!r}")
+    bet_types = {name: bet_type for bet_type, name in BET_TYPE_NAMES.items()}
+
+    seats = []
+    index = 2
+    while index < len(lines):
+        seat = _SEAT_PATTERN.match(lines[index])
+        if seat is None:
+            break
+        seats.append((seat.group(2), int(seat.group(3))))
+        index += 1
+
+    events = [HandStarted(int(header.group(5)), bet_types[header.group(2)], int(header.group(3)), int(header.group(4)),
+                          int(button.group(1)) - 1, tuple(seats))]
+    verbs = {verb: action for action, verb in ACTION_VERBS.items()}
+    street = "pre_flop"
+    stacks = []
+    for line in lines[index:]:
+        if line == "*** HOLE CARDS ***" or line == "*** SUMMARY ***":
+            continue
+        match = _ACTION_PATTERN.match(line)
+        if match is not None:
+            amount = int(match.group(3) or 0)
+            if match.group(2) in BLIND_VERBS:
+                events.append(BlindPosted(match.group(1), amount))
+            else:
+                events.append(ActionTaken(street, match.group(1), verbs[match.group(2)], amount))
+            continue
+        match = _DEALT_PATTERN.match(line)
+        if match is not None:
+            events.append(HoleCardsDealt(match.group(1), parse_cards(match.group(2))))
+            continue
+        match = _STREET_PATTERN.match(line)
+        if match is not None:
+            street = match.group(1).lower()
+            events.append(BoardDealt(street, parse_cards(match.group(2))))
+            continue
+        match = _COLLECT_PATTERN.match(line)
+        if match is not None:
+            events.append(PotAwarded(int(match.group(3) or 0), match.group(1), int(match.group(2))))
+            continue
+        match = _SUMMARY_PATTERN.match(line)
+        if match is not None:
+            stacks.append(int(match.group(3)))
+            continue
+        raise ValueError(f"Invalid hand history line: {line!r}")
+
+    events.append(HandEnded(tuple(stacks)))
+    return events
+
+
+def read_hand_histories(path):
+    """ハンド履歴のファイルを先頭から1ハンドずつ読み込む。
+
+    ファイルを1行ずつ読み、1ハンド分ずつイベントに変換して返すジェネレータなので、
+    ファイルの大きさに関係なく使用メモリは1ハンド分で済む。
+
+    Args:
+        path (str): ハンド履歴のファイルのパス。
+
+    Yields:
+        list[HandEvent]: 1ハンド分のイベント。
+
+    """
+    with open(path, encoding="utf-8") as file:
+        for block in split_hands(file):
+            yield parse_hand(block)
+
+
+def to_hand_record(events):
+    """1ハンド分のイベントを、HeadlessGame.replay_hand で再実行できる記録にする。
+
+    Args:
+        events (list[HandEvent]): 1ハンド分のイベント。
+
+    Returns:
+        HandRecord: ハンドの記録。
+
+    """
+    start = events[0]
+    actions = [(event.street, event.player, event.action, event.amount) for event in events if isinstance(event, ActionTaken)]
+    result = events[-1].stacks if isinstance(events[-1], HandEnded) else None
+    return HandRecord(start.seed, start.bet_type, start.sb, start.bb, start.seats, start.button, actions, result)
+
+
+def evaluate_showdown(events, hand_evaluator):
+    """1ハンド分のイベントから、最後まで残ったプレイヤーの手を評価し直す。
+
+    Args:
+        events (list[HandEvent]): 1ハンド分のイベント。
+        hand_evaluator (HandEvaluator): 評価に使うインスタンス。
+
+    Returns:
+        dict[str, int]: ボードが5枚公開された場合の、フォールドしていないプレイヤーごとのスコア。
+        それ以外は空の辞書。
+
+    """
+    hole_cards = {}
+    board = []
+    for event in events:
+        if isinstance(event, HoleCardsDealt):
+            hole_cards[event.player] = list(event.cards)
+        elif isinstance(event, BoardDealt):
+            board.extend(event.cards)
+        elif isinstance(event, ActionTaken) and event.action == "fold":
+            hole_cards.pop(event.player, None)
+    if len(board) < 5:
+        return {}
+    return {name: hand_evaluator.evaluate_score(cards, board) for name, cards in hole_cards.items()}
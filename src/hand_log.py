@@ -0,0 +1,423 @@
+import mmap
+import os
+import struct
+
+from card import Card
+from hand_event import (EVENT_TYPES, ActionTaken, BlindPosted, BoardDealt, HandEnded, HandStarted, HoleCardsDealt,
+                        PotAwarded)
+
+
+# ファイルの先頭に置く識別子とバージョン
+MAGIC = b"PKHL\x02"
+# 1ハンド分のレコードの長さ (リトルエンディアンの符号なし32ビット整数)。レコードの前後に同じ値を置き、
+# 末尾の長さからファイルの最後のレコードを後ろ向きに確かめられるようにする
+FRAME_HEADER = struct.Struct("<I")
+FRAME_OVERHEAD = 2 * FRAME_HEADER.size
+
+# 文字列のフィールドは番号で保存する
+STREETS = ("pre_flop", "flop", "turn", "river")
+ACTIONS = ("fold", "check", "call", "bet", "raise", "all-in")
+BET_TYPES = ("no", "fix", "pot")
+
+
+def _write_varint(buffer, value):
+    """0以上の整数を可変長 (7ビットずつ、LEB128) で書き込む。
+
+    Args:
+        buffer (bytearray): 書き込み先。
+        value (int): 書き込む値。
+
+    """
+    while value > 0x7F:
+        buffer.append(value & 0x7F | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _read_varint(data, offset):
+    """可変長の整数を読み込む。
+
+    Args:
+        data (bytes): 読み込み元。
+        offset (int): 読み込みを始める位置。
+
+    Returns:
+        tuple[int, int]: 読み込んだ値と、次の位置。
+
+    """
+    result = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, offset
+        shift += 7
+
+
+def _write_cards(buffer, cards):
+    """カードの枚数とカード ID を書き込む。
+
+    """
+    buffer.append(len(cards))
+    buffer.extend(card.id for card in cards)
+
+
+def _read_cards(data, offset):
+    """カードの枚数とカード ID を読み込む。
+
+    """
+    count = data[offset]
+    offset += 1
+    return tuple(Card.from_id(card_id) for card_id in data[offset:offset + count]), offset + count
+
+
+def encode_hand(events):
+    """1ハンド分のイベントをバイト列に変換する。
+
+    最初のイベントは HandStarted でなければならない。以降のイベントのプレイヤー名は席の位置で保存する。
+
+    Args:
+        events (list[HandEvent]): 1ハンド分のイベント。
+
+    Returns:
+        bytes: 変換したバイト列。
+
+    Raises:
+        ValueError: 最初のイベントが HandStarted でない場合や、未知のイベント・値を含む場合。
+
+    """
+    if not events or not isinstance(events[0], HandStarted):
+        raise ValueError("a hand must start with a HandStarted event")
+
+    seats = {name: index for index, (name, _) in enumerate(events[0].seats)}
+    buffer = bytearray()
+    for event in events:
+        buffer.append(event.KIND)
+        if isinstance(event, HandStarted):
+            _write_varint(buffer, event.seed)
+            buffer.append(BET_TYPES.index(event.bet_type))
+            _write_varint(buffer, event.sb)
+            _write_varint(buffer, event.bb)
+            buffer.append(event.button)
+            buffer.append(len(event.seats))
+            for name, chips in event.seats:
+                encoded_name = name.encode("utf-8")
+                _write_varint(buffer, len(encoded_name))
+                buffer.extend(encoded_name)
+                _write_varint(buffer, chips)
+        elif isinstance(event, HoleCardsDealt):
+            buffer.append(seats[event.player])
+            _write_cards(buffer, event.cards)
+        elif isinstance(event, BlindPosted):
+            buffer.append(seats[event.player])
+            _write_varint(buffer, event.amount)
+        elif isinstance(event, ActionTaken):
+            buffer.append(STREETS.index(event.street))
+            buffer.append(seats[event.player])
+            buffer.append(ACTIONS.index(event.action))
+            _write_varint(buffer, event.amount)
+        elif isinstance(event, BoardDealt):
+            buffer.append(STREETS.index(event.street))
+            _write_cards(buffer, event.cards)
+        elif isinstance(event, PotAwarded):
+            _write_varint(buffer, event.pot_index)
+            buffer.append(seats[event.player])
+            _write_varint(buffer, event.amount)
+        elif isinstance(event, HandEnded):
+            buffer.append(len(event.stacks))
+            for chips in event.stacks:
+                _write_varint(buffer, chips)
+        else:
+            raise ValueError(f"unknown event: {event!r}")
+    return bytes(buffer)
+
+
+def decode_hand(data):
+    """encode_hand で変換したバイト列から1ハンド分のイベントを復元する。
+
+    Args:
+        data (bytes): 1ハンド分のバイト列。
+
+    Returns:
+        list[HandEvent]: 1ハンド分のイベント。
+
+    Raises:
+        ValueError: 未知のイベントを含む場合。
+
+    """
+    events = []
+    names = ()
+    offset = 0
+    while offset < len(data):
+        kind = data[offset]
+        offset += 1
+        if kind == HandStarted.KIND:
+            seed, offset = _read_varint(data, offset)
+            bet_type = BET_TYPES[data[offset]]
+            sb, offset = _read_varint(data, offset + 1)
+            bb, offset = _read_varint(data, offset)
+            button, num_seats = data[offset], data[offset + 1]
+            offset += 2
+            seats = []
+            for _ in range(num_seats):
+                length, offset = _read_varint(data, offset)
+                name = data[offset:offset + length].decode("utf-8")
+                chips, offset = _read_varint(data, offset + length)
+                seats.append((name, chips))
+            names = [name for name, _ in seats]
+            events.append(HandStarted(seed, bet_type, sb, bb, button, tuple(seats)))
+        elif kind == HoleCardsDealt.KIND:
+            cards, next_offset = _read_cards(data, offset + 1)
+            events.append(HoleCardsDealt(names[data[offset]], cards))
+            offset = next_offset
+        elif kind == BlindPosted.KIND:
+            amount, next_offset = _read_varint(data, offset + 1)
+            events.append(BlindPosted(names[data[offset]], amount))
+            offset = next_offset
+        elif kind == ActionTaken.KIND:
+            amount, next_offset = _read_varint(data, offset + 3)
+            events.append(ActionTaken(STREETS[data[offset]], names[data[offset + 1]], ACTIONS[data[offset + 2]], amount))
+            offset = next_offset
+        elif kind == BoardDealt.KIND:
+            cards, next_offset = _read_cards(data, offset + 1)
+            events.append(BoardDealt(STREETS[data[offset]], cards))
+            offset = next_offset
+        elif kind == PotAwarded.KIND:
+            pot_index, offset = _read_varint(data, offset)
+            amount, next_offset = _read_varint(data, offset + 1)
+            events.append(PotAwarded(pot_index, names[data[offset]], amount))
+            offset = next_offset
+        elif kind == HandEnded.KIND:
+            num_stacks = data[offset]
+            offset += 1
+            stacks = []
+            for _ in range(num_stacks):
+                chips, offset = _read_varint(data, offset)
+                stacks.append(chips)
+            events.append(HandEnded(tuple(stacks)))
+        else:
+            raise ValueError(f"unknown event kind: {kind} ({EVENT_TYPES.get(kind)})")
+    return events
+
+
+def _tail_is_complete(file, size):
+    """ファイルの最後のレコードが完全に書き込まれているかを、末尾の長さだけを読んで確かめる。
+
+    Args:
+        file (BinaryIO): ログファイル。
+        size (int): ファイルのサイズ。
+
+    Returns:
+        bool: レコードがないか、最後のレコードの前後の長さが一致する場合はTrue。
+
+    """
+    if size == len(MAGIC):
+        return True
+    if size < len(MAGIC) + FRAME_OVERHEAD:
+        return False
+    file.seek(size - FRAME_HEADER.size)
+    (length,) = FRAME_HEADER.unpack(file.read(FRAME_HEADER.size))
+    start = size - FRAME_OVERHEAD - length
+    if start < len(MAGIC):
+        return False
+    file.seek(start)
+    return FRAME_HEADER.unpack(file.read(FRAME_HEADER.size))[0] == length
+
+
+def _complete_frames_end(file, size):
+    """ログファイルのレコードを先頭からたどり、最後の完全なレコードの終わりの位置を返す。
+
+    末尾が途切れている場合にだけ使う。
+
+    Args:
+        file (BinaryIO): ログファイル。
+        size (int): ファイルのサイズ。
+
+    Returns:
+        int: 最後の完全なレコードの終わりの位置。レコードがなければ識別子の直後。
+
+    """
+    offset = len(MAGIC)
+    while offset + FRAME_HEADER.size <= size:
+        file.seek(offset)
+        (length,) = FRAME_HEADER.unpack(file.read(FRAME_HEADER.size))
+        end = offset + FRAME_OVERHEAD + length
+        if end > size:
+            break
+        offset = end
+    return offset
+
+
+class HandLogWriter:
+    """ハンドのイベントを追記専用のバイナリログに書き込むクラス。
+
+    イベントを emit で1つずつ受け取り、HandEnded を受け取った時点で1ハンド分を
+    ``[長さ (4バイト)][encode_hand のバイト列][長さ (4バイト)]`` のレコードとしてファイルの末尾に追記する。
+    Dealer.event_sink に emit を渡せば、ゲームの進行と同時にログが書かれる。
+
+    Attributes:
+        path (str): ログファイルのパス。
+        hands_written (int): このインスタンスで書き込んだハンドの数。
+
+    Tests:
+        [x]: test_hand_log_round_trip
+
+    """
+
+    def __init__(self, path, buffer_size=1 << 16):
+        """ログファイルを追記モードで開く。新しいファイルの場合は先頭に識別子を書く。
+
+        既存のファイルは末尾のレコードの長さだけを確かめる。書き込み途中で途切れたレコードがある場合は、
+        先頭からたどって最後の完全なレコードの直後まで切り詰めてから追記する。途切れたレコードの長さが
+        追記したレコードにかからないようにするため。
+
+        Args:
+            path (str): ログファイルのパス。
+            buffer_size (int, optional): 書き込みバッファのサイズ。
+
+        Raises:
+            ValueError: 既存のファイルがこの形式のログでない場合。
+
+        """
+        self.path = path
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            with open(path, "r+b") as file:
+                if file.read(len(MAGIC)) != MAGIC:
+                    raise ValueError(f"{path} is not a hand log")
+                size = file.seek(0, os.SEEK_END)
+                if not _tail_is_complete(file, size):
+                    file.truncate(_complete_frames_end(file, size))
+        self.file = open(path, "ab", buffering=buffer_size)
+        if self.file.tell() == 0:
+            self.file.write(MAGIC)
+        self.hands_written = 0
+        self._events = []
+
+    def __enter__(self):
+        """with 文で使えるように自身を返す。
+
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """with 文の終了時にファイルを閉じる。
+
+        """
+        self.close()
+
+    def emit(self, event):
+        """イベントを受け取る。HandEnded を受け取ったら1ハンド分を書き込む。
+
+        Args:
+            event (HandEvent): イベント。
+
+        """
+        if isinstance(event, HandStarted):
+            self._events = []
+        self._events.append(event)
+        if isinstance(event, HandEnded):
+            self.write_hand(self._events)
+            self._events = []
+
+    def write_hand(self, events):
+        """1ハンド分のイベントをレコードとして追記する。
+
+        Args:
+            events (list[HandEvent]): 1ハンド分のイベント。
+
+        """
+        payload = encode_hand(events)
+        length = FRAME_HEADER.pack(len(payload))
+        self.file.write(length)
+        self.file.write(payload)
+        self.file.write(length)
+        self.hands_written += 1
+
+    def flush(self):
+        """バッファの内容をファイルに書き出す。
+
+        """
+        self.file.flush()
+
+    def close(self):
+        """ファイルを閉じる。
+
+        """
+        if not self.file.closed:
+            self.file.close()
+
+
+class HandLogReader:
+    """HandLogWriter で書いたログをメモリマップで読み込むクラス。
+
+    ファイル全体を読み込まず、レコードを1つずつ取り出して復元する。書き込み途中で
+    途切れた末尾のレコードは無視する。
+
+    Attributes:
+        path (str): ログファイルのパス。
+
+    Tests:
+        [x]: test_hand_log_round_trip
+
+    """
+
+    def __init__(self, path):
+        """ログファイルをメモリマップで開く。
+
+        Args:
+            path (str): ログファイルのパス。
+
+        Raises:
+            ValueError: ファイルがこの形式のログでない場合。
+
+        """
+        self.path = path
+        with open(path, "rb") as file:
+            if file.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a hand log")
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __enter__(self):
+        """with 文で使えるように自身を返す。
+
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """with 文の終了時にメモリマップを閉じる。
+
+        """
+        self.close()
+
+    def __iter__(self):
+        """ハンドごとのイベントのリストを順に返す。
+
+        """
+        for record in self.records():
+            yield decode_hand(record)
+
+    def records(self):
+        """復元前のレコードのバイト列を順に返す。
+
+        ハンドの数を数えたり、特定のハンドだけを復元したりする場合に使う。
+
+        """
+        data = self._map
+        size = len(data)
+        offset = len(MAGIC)
+        while offset + FRAME_HEADER.size <= size:
+            (length,) = FRAME_HEADER.unpack_from(data, offset)
+            start = offset + FRAME_HEADER.size
+            end = offset + FRAME_OVERHEAD + length
+            if end > size:
+                break
+            yield data[start:start + length]
+            offset = end
+
+    def close(self):
+        """メモリマップを閉じる。
+
+        """
+        self._map.close()
@@ -0,0 +1,143 @@
+from bot import Bot
+
+
+class HandRecord:
+    """1ハンドを再現するための記録を表すクラス。
+
+    デッキのシード、ハンド開始時の席順とチップ数、ディーラーボタンの位置と、
+    全プレイヤーのアクションを持つ。HeadlessGame.replay_hand に渡すと同じハンドを再実行できる。
+
+    Attributes:
+        seed (int): デッキのシャッフルに使ったシード。
+        bet_type (str): ベットタイプ。
+        sb (int): SBの額。
+        bb (int): BBの額。
+        seats (list[tuple[str, int]]): ハンド開始時の席順の (プレイヤー名, チップ数)。
+        button (int): ディーラーボタンを持つ席の位置。
+        actions (list[tuple[str, str, str, int]]): (ベットラウンド, プレイヤー名, アクション, 支払った額) の履歴。
+        result (list[int]): ハンド終了時の席順のチップ数。
+
+    Tests:
+        [x]: test_hand_record_round_trip
+
+    """
+
+    def __init__(self, seed, bet_type, sb, bb, seats, button, actions=None, result=None):
+        """HandRecordクラスの初期化。
+
+        Args:
+            seed (int): デッキのシャッフルに使ったシード。
+            bet_type (str): ベットタイプ。
+            sb (int): SBの額。
+            bb (int): BBの額。
+            seats (list[tuple[str, int]]): ハンド開始時の席順の (プレイヤー名, チップ数)。
+            button (int): ディーラーボタンを持つ席の位置。
+            actions (list[tuple[str, str, str, int]], optional): アクションの履歴。
+            result (list[int], optional): ハンド終了時の席順のチップ数。
+
+        """
+        self.seed = seed
+        self.bet_type = bet_type
+        self.sb = sb
+        self.bb = bb
+        self.seats = [tuple(seat) for seat in seats]
+        self.button = button
+        self.actions = [tuple(action) for action in actions] if actions is not None else []
+        self.result = list(result) if result is not None else []
+
+    def __eq__(self, other):
+        """記録の内容が全て等しいかを比較する。
+
+        """
+        if not isinstance(other, HandRecord):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        """記録の概要を文字列で返す。
+
+        """
+        return f"HandRecord(seed={self.seed}, seats={len(self.seats)}, actions={len(self.actions)})"
+
+    def to_dict(self):
+        """JSON として保存できる辞書に変換する。
+
+        Returns:
+            dict: 記録の辞書。
+
+        """
+        return {
+            'seed': self.seed,
+            'bet_type': self.bet_type,
+            'sb': self.sb,
+            'bb': self.bb,
+            'seats': [list(seat) for seat in self.seats],
+            'button': self.button,
+            'actions': [list(action) for action in self.actions],
+            'result': list(self.result),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """to_dict で変換した辞書から記録を復元する。
+
+        Args:
+            data (dict): 記録の辞書。
+
+        Returns:
+            HandRecord: 復元した記録。
+
+        """
+        return cls(data['seed'], data['bet_type'], data['sb'], data['bb'], data['seats'], data['button'],
+                   data['actions'], data['result'])
+
+
+class ReplayBot(Bot):
+    """記録されたアクションを順番に返すボット。
+
+    Attributes:
+        name (str): 担当するプレイヤー名。
+        decisions (list[tuple[str, int]]): 残りの (アクション, 支払った額) を逆順に並べたもの。
+
+    """
+
+    def __init__(self, name, decisions):
+        """ReplayBotクラスの初期化。
+
+        Args:
+            name (str): 担当するプレイヤー名。
+            decisions (list[tuple[str, int]]): 記録された順の (アクション, 支払った額)。
+
+        """
+        self.name = name
+        self.decisions = list(reversed(decisions))
+
+    @classmethod
+    def from_record(cls, record):
+        """記録からプレイヤーごとのボットを作る。
+
+        Args:
+            record (HandRecord): ハンドの記録。
+
+        Returns:
+            dict[str, ReplayBot]: プレイヤー名ごとのボット。
+
+        """
+        decisions = {name: [] for name, _ in record.seats}
+        for _, name, action, amount in record.actions:
+            decisions[name].append((action, amount))
+        return {name: cls(name, player_decisions) for name, player_decisions in decisions.items()}
+
+    def decide(self, view, available_actions):
+        """記録された次のアクションを返す。
+
+        Raises:
+            ValueError: 記録と異なる状況になり、記録どおりに再現できない場合。
+
+        """
+        if not self.decisions:
+            raise ValueError(f"{self.name} has no more recorded actions")
+        action, amount = self.decisions.pop()
+        if action not in available_actions:
+            raise ValueError(f"recorded action {action!r} of {self.name} is not available in {available_actions}")
+        return action, amount
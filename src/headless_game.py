@@ -0,0 +1,157 @@
+from game import Game
+from hand_record import ReplayBot
+from input_handler import HeadlessInputHandler
+from message_handler import NullMessageHandler
+from player import Player
+
+
+class HeadlessGame(Game):
+    """表示も入力待ちも行わずにハンドを連続で進めるゲームクラス。
+
+    全ての席のアクションとベット額をコールバックで決めるため、ボットの評価や負荷試験のための
+    大量の自己対戦に使える。表示は NullMessageHandler、待機は HeadlessInputHandler で無効にする。
+
+    Attributes:
+        seats (list[dict]): 席ごとの設定。
+        rebuy (bool): チップが0になった席を初期チップでリバイさせるか。Falseの場合は席を立たせる。
+        hands_played (int): プレイしたハンドの数。
+
+    Tests:
+        [x]: test_headless_game_run
+        [x]: test_headless_game_without_rebuy
+
+    """
+
+    def __init__(self, seats, bet_type, sb, bb, rebuy=True, rng=None, event_sink=None):
+        """HeadlessGameクラスの初期化。
+
+        seats の各要素は 'name'、'chips' と、省略可能な 'bot'、'action_callback'、'bet_amount_callback' を持つ辞書。
+        コールバックを省略した席は 'bot' のボット (省略時は RandomBot) で行動する。
+
+        Args:
+            seats (list[dict]): 席ごとの設定。
+            bet_type (str): ベットタイプ。
+            sb (int): SBの額。
+            bb (int): BBの額。
+            rebuy (bool, optional): チップが0になった席を初期チップでリバイさせるか。
+            rng (random.Random, optional): 乱数生成器。シードを固定したものを渡すと全ハンドが再現できる。
+            event_sink (Callable[[HandEvent], None], optional): ハンドのイベントを受け取る関数。
+
+        """
+        message_handler = NullMessageHandler()
+        input_handler = HeadlessInputHandler(message_handler)
+        super().__init__(message_handler, input_handler, None, None, 0, bet_type, sb, bb, cpus=seats, rng=rng,
+                         event_sink=event_sink)
+        self.seats = seats
+        self.rebuy = rebuy
+        self.hands_played = 0
+
+    @classmethod
+    def replay_hand(cls, record):
+        """記録されたハンドを再実行する。
+
+        記録と同じ席順・チップ数・ディーラーボタン・デッキで、各プレイヤーに記録どおりのアクションをさせる。
+        エンジンの変更前後で結果を比べることで、挙動の変化を検出できる。
+
+        Args:
+            record (HandRecord): 再実行するハンドの記録。
+
+        Returns:
+            HandRecord: 再実行したハンドの記録。エンジンの挙動が同じであれば record と等しくなる。
+
+        Raises:
+            ValueError: 記録どおりに再現できない場合。
+
+        """
+        bots = ReplayBot.from_record(record)
+        seats = [{'name': name, 'chips': chips, 'bot': bots[name]} for name, chips in record.seats]
+        game = cls(seats, record.bet_type, record.sb, record.bb)
+        game.players = game.create_players()
+        game.players[record.button].is_dealer = True
+        game.attach_state_views()
+        return game.play_hand(seed=record.seed)
+
+    def create_players(self):
+        """席ごとの設定から、設定の順にプレイヤーを生成する。
+
+        Returns:
+            list[Player]: プレイヤーのリスト。
+
+        """
+        self.initial_chips = {seat['name']: seat['chips'] for seat in self.seats}
+        return [Player(name=seat['name'], chips=seat['chips'], input_handler=self.input_handler, is_cpu=True,
+                       action_callback=seat.get('action_callback'),
+                       bet_amount_callback=seat.get('bet_amount_callback'), bot=seat.get('bot'), rng=self.rng)
+                for seat in self.seats]
+
+    def pre_process(self):
+        """席ごとの設定からプレイヤーを生成し、ディーラーボタンを決める。
+
+        """
+        self.players = self.create_players()
+
+        # ランダムに席につかせる
+        self.rng.shuffle(self.players)
+        self.attach_state_views()
+
+        self.table.dealer.prepare_deck(self.rng.getrandbits(64))
+        self.table.dealer.set_initial_button(self.players)
+
+    def run(self, num_hands, on_hand=None):
+        """指定した数のハンドを連続でプレイする。
+
+        プレイヤーが1人以下になった場合はその時点で終了する。
+
+        Args:
+            num_hands (int): プレイするハンドの数。
+            on_hand (Callable[[HandRecord], None], optional): ハンドごとに記録を受け取る関数。
+
+        Returns:
+            list[Player]: 終了時に席についているプレイヤーのリスト。
+
+        """
+        self.pre_process()
+        for _ in range(num_hands):
+            if len(self.players) < 2:
+                break
+
+            record = self.play_hand()
+            self.hands_played += 1
+            if on_hand is not None:
+                on_hand(record)
+
+            self.finish_hand()
+
+        return self.players
+
+    def finish_hand(self):
+        """ハンドの終了後に、チップが0になったプレイヤーを処理して次のハンドの準備をする。
+
+        """
+        self.handle_busted_players()
+
+        # 必要項目のリセット
+        self.table.dealer.reset_round(self.players)
+
+        # ディーラーボタンを動かす
+        self.table.dealer.move_dealer_button(self.players)
+
+    def handle_busted_players(self):
+        """チップが0になったプレイヤーをリバイさせるか、席を立たせる。
+
+        """
+        for player in list(self.players):
+            if player.chips > 0:
+                continue
+
+            if self.rebuy:
+                player.chips = self.initial_chips[player.name]
+                player.rebuy_count += 1
+                continue
+
+            # ディーラーボタンを持っていた場合は、1つ前の席に渡してから席を立たせる
+            index = self.players.index(player)
+            if player.is_dealer and len(self.players) > 1:
+                player.is_dealer = False
+                self.players[index - 1].is_dealer = True
+            self.players.remove(player)
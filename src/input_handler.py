@@ -87,7 +87,10 @@ class InputHandler:
     def wait_for_user(self):
         """プレイヤーの入力を待機するメソッド。
 
+        待機する前に、まとめて出力しているメッセージを書き出す。
+
         """
+        self.message_handler.flush()
         # return input()
         return time.sleep(1.5)
 
@@ -157,3 +160,56 @@ class InputHandler:
                 return amount
             else:
                 self.message_handler.get_message("invalid_bet_amount", min_amount=min_amount, max_amount=max_amount)
+
+
+class HeadlessInputHandler(InputHandler):
+    """ユーザーの入力を待たない入力処理クラス。
+
+    待機は行わず、ゲームの続行は常に「つづける」、リバイは常に「席を立つ」を選ぶ。
+    アクションとベット額は Player のコールバックで決める前提のため、問い合わせには応じない。
+
+    Tests:
+        [x]: test_headless_input_handler
+
+    """
+
+    def wait_for_user(self):
+        """待機せずにすぐ戻る。
+
+        """
+
+    def continue_to_game(self):
+        """常にゲームを続ける。
+
+        Returns:
+            int: つづける (0)。
+
+        """
+        return 0
+
+    def rebuy_to_game(self):
+        """常にリバイせずに席を立つ。
+
+        Returns:
+            int: 持ち込むチップ数 (0)。
+
+        """
+        return 0
+
+    def select_action(self, available_actions):
+        """ヘッドレスではユーザーにアクションを問い合わせられない。
+
+        Raises:
+            RuntimeError: 常に発生。
+
+        """
+        raise RuntimeError("HeadlessInputHandler cannot ask the user for an action")
+
+    def select_bet_amount(self, min_amount, max_amount):
+        """ヘッドレスではユーザーにベット額を問い合わせられない。
+
+        Raises:
+            RuntimeError: 常に発生。
+
+        """
+        raise RuntimeError("HeadlessInputHandler cannot ask the user for a bet amount")
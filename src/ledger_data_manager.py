@@ -0,0 +1,168 @@
+from contextlib import contextmanager
+import json
+import os
+import sqlite3
+
+from data_manager import DataManager
+
+
+class LedgerDataManager(DataManager):
+    """ユーザーごとのチップ数を SQLite の台帳で管理するクラス。
+
+    DataManager と同じ API を持つが、更新のたびにファイル全体を書き直さず、1ユーザー分の行だけを
+    トランザクションで更新する。データベースは WAL モードで開くので、書き込み中に異常終了しても
+    他のユーザーのチップ数は壊れない。値はチップ数 (int) のみを扱う。
+
+    Attributes:
+        data_file_path (str): データベースファイルのパス。
+        connection (sqlite3.Connection): データベースへの接続。
+
+    Tests:
+        [x]: test_ledger_data_manager
+
+    """
+
+    def __init__(self, file_path, legacy_json_path=None):
+        """データベースを開き、テーブルがなければ作成する。
+
+        Args:
+            file_path (str): データベースファイルのパス。
+            legacy_json_path (str, optional): 以前の DataManager の JSON ファイルのパス。
+                データベースを新しく作成した場合に、その内容を取り込む。
+
+        """
+        self.data_file_path = file_path
+        self.legacy_json_path = legacy_json_path
+        self.connection = None
+        self.load_data()
+
+    def load_data(self):
+        """データベースに接続する。全ユーザーのデータはメモリに読み込まない。
+
+        """
+        if self.connection is not None:
+            return
+        directory = os.path.dirname(self.data_file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # 明示的に BEGIN したときだけトランザクションにする
+        self.connection = sqlite3.connect(self.data_file_path, isolation_level=None, timeout=30)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        with self._transaction():
+            created = self.connection.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'users'").fetchone() is None
+            self.connection.execute("CREATE TABLE IF NOT EXISTS users (name TEXT PRIMARY KEY, chips INTEGER NOT NULL)")
+            if created and self.legacy_json_path and os.path.exists(self.legacy_json_path):
+                with open(self.legacy_json_path, 'r') as file:
+                    legacy_data = json.load(file)
+                self.connection.executemany("INSERT INTO users (name, chips) VALUES (?, ?)", legacy_data.items())
+
+    def save_data(self):
+        """何もしない。各更新はその時点でデータベースに書き込まれる。
+
+        """
+
+    def flush(self):
+        """何もしない。遅延させている変更はない。
+
+        """
+
+    def tick(self):
+        """何もしない。遅延させている変更はない。
+
+        """
+
+    @property
+    def data(self):
+        """全ユーザーのデータを辞書で返す。
+
+        Returns:
+            dict[str, int]: ユーザー名とチップ数。
+
+        """
+        return dict(self.connection.execute("SELECT name, chips FROM users"))
+
+    def get_user_data(self, user_name):
+        """指定されたユーザーのチップ数を取得する。
+
+        Args:
+            user_name (str): ユーザー名。
+
+        Returns:
+            int: チップ数。ユーザーが存在しない場合はNone。
+
+        """
+        row = self.connection.execute("SELECT chips FROM users WHERE name = ?", (user_name,)).fetchone()
+        return None if row is None else row[0]
+
+    def update_user_data(self, user_name, data):
+        """指定されたユーザーのチップ数を設定する。
+
+        Args:
+            user_name (str): ユーザー名。
+            data (int): チップ数。
+
+        """
+        self.connection.execute("INSERT INTO users (name, chips) VALUES (?, ?) ON CONFLICT (name) DO UPDATE SET chips = excluded.chips",
+                                (user_name, data))
+
+    def adjust_user_data(self, user_name, amount):
+        """指定されたユーザーのチップ数を1つのトランザクションで増減する。
+
+        Args:
+            user_name (str): ユーザー名。
+            amount (int): 増減するチップ数。減らす場合は負の値。
+
+        Returns:
+            int: 増減後のチップ数。
+
+        Raises:
+            KeyError: ユーザーが存在しない場合。
+
+        """
+        with self._transaction():
+            cursor = self.connection.execute("UPDATE users SET chips = chips + ? WHERE name = ?", (amount, user_name))
+            if cursor.rowcount == 0:
+                raise KeyError(user_name)
+            return self.connection.execute("SELECT chips FROM users WHERE name = ?", (user_name,)).fetchone()[0]
+
+    def add_new_user(self, user_name, initial_data):
+        """新しいユーザーを追加する。既に存在する場合は何もしない。
+
+        Args:
+            user_name (str): ユーザー名。
+            initial_data (int): 初期のチップ数。
+
+        """
+        self.connection.execute("INSERT OR IGNORE INTO users (name, chips) VALUES (?, ?)", (user_name, initial_data))
+
+    def delete_user(self, user_name):
+        """指定されたユーザーを削除する。
+
+        Args:
+            user_name (str): ユーザー名。
+
+        """
+        self.connection.execute("DELETE FROM users WHERE name = ?", (user_name,))
+
+    def close(self):
+        """データベースへの接続を閉じる。
+
+        """
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    @contextmanager
+    def _transaction(self):
+        """書き込みロックを取ってトランザクションを始め、例外がなければコミット、あればロールバックする。
+
+        """
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.connection
+        except BaseException:
+            self.connection.execute("ROLLBACK")
+            raise
+        self.connection.execute("COMMIT")
@@ -0,0 +1,174 @@
+import argparse
+import asyncio
+import random
+import time
+
+from net_server import ProtocolServer
+from table_protocol import apply_delta, decode_message, encode_message
+
+
+class LoadStats:
+    """負荷試験の計測結果。
+
+    Attributes:
+        messages (int): クライアントが受け取ったメッセージの数。
+        latencies (list[float]): アクションを送ってから次のメッセージを受け取るまでの時間 (秒)。
+        hands (set[tuple[str, int]]): 終了した (テーブル, ハンド番号)。
+        errors (int): 受け取ったエラーの数。
+
+    """
+
+    def __init__(self):
+        """LoadStatsクラスの初期化。
+
+        """
+        self.messages = 0
+        self.latencies = []
+        self.hands = set()
+        self.errors = 0
+
+    def summary(self, elapsed, num_clients):
+        """計測結果をまとめる。
+
+        Args:
+            elapsed (float): 経過時間 (秒)。
+            num_clients (int): クライアントの数。
+
+        Returns:
+            dict: 計測結果。
+
+        """
+        latencies = sorted(self.latencies)
+
+        def percentile(ratio):
+            return latencies[min(len(latencies) - 1, int(len(latencies) * ratio))] * 1000 if latencies else 0.0
+
+        return {
+            'clients': num_clients,
+            'elapsed': elapsed,
+            'messages': self.messages,
+            'messages_per_second': self.messages / elapsed if elapsed else 0.0,
+            'hands': len(self.hands),
+            'hands_per_second': len(self.hands) / elapsed if elapsed else 0.0,
+            'latency_p50_ms': percentile(0.5),
+            'latency_p99_ms': percentile(0.99),
+            'errors': self.errors,
+        }
+
+
+async def run_client(host, port, name, table_no, stats, rng):
+    """1人のボットのプレイヤーとして接続し、テーブルが終わるまでランダムにアクションする。
+
+    Args:
+        host (str): サーバーのアドレス。
+        port (int): サーバーのポート。
+        name (str): プレイヤー名。
+        table_no (str): 座るロビーのテーブルの番号。
+        stats (LoadStats): 計測結果の記録先。
+        rng (random.Random): アクションを選ぶ乱数生成器。
+
+    Returns:
+        dict: テーブルの終了時にクライアントが持っていた状態。
+
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    state = {}
+    sent_at = None
+    try:
+        writer.write(encode_message("sit", table=table_no, name=name))
+        await writer.drain()
+        table_id = None
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            if sent_at is not None:
+                stats.latencies.append(time.perf_counter() - sent_at)
+                sent_at = None
+            stats.messages += 1
+            message = decode_message(line)
+            message_type = message["type"]
+            if message_type == "seated":
+                table_id = message["table"]
+            elif message_type == "state":
+                apply_delta(state, message["delta"])
+            elif message_type == "prompt":
+                writer.write(encode_message("act", action=rng.choice(message["actions"])))
+                await writer.drain()
+                sent_at = time.perf_counter()
+            elif message_type == "hand_end":
+                stats.hands.add((table_id, message["hand"]))
+            elif message_type == "error":
+                stats.errors += 1
+            elif message_type == "table_closed":
+                break
+    finally:
+        writer.close()
+    return state
+
+
+async def run_load(host, port, num_clients, table_no="1", seed=None):
+    """複数のボットのクライアントを同時に接続させ、全てのテーブルが終わるまでの計測結果を返す。
+
+    テーブルの人数にそろわない端数のクライアントは接続しない。
+
+    Args:
+        host (str): サーバーのアドレス。
+        port (int): サーバーのポート。
+        num_clients (int): クライアントの数。
+        table_no (str, optional): 座るロビーのテーブルの番号。
+        seed (int, optional): アクションを選ぶ乱数生成器のシード。
+
+    Returns:
+        dict: 計測結果 (LoadStats.summary)。
+
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(encode_message("list_tables"))
+    await writer.drain()
+    tables = decode_message(await reader.readline())["tables"]
+    writer.close()
+    seats = next(table['seats'] for table in tables if table['no'] == table_no)
+    num_clients -= num_clients % seats
+
+    stats = LoadStats()
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    await asyncio.gather(*(run_client(host, port, f"bot{index}", table_no, stats, random.Random(rng.getrandbits(64)))
+                           for index in range(num_clients)))
+    return stats.summary(time.perf_counter() - start, num_clients)
+
+
+async def main(arguments):
+    """コマンドラインの引数に従って負荷試験を行い、結果を表示する。
+
+    --serve を指定した場合は、同じプロセスでサーバーも起動する。
+
+    """
+    server = None
+    port = arguments.port
+    if arguments.serve:
+        server = ProtocolServer(seats_per_table=arguments.seats_per_table, num_cpus=arguments.cpus,
+                                hands_per_table=arguments.hands_per_table)
+        port = await server.start(arguments.host, 0)
+    try:
+        result = await run_load(arguments.host, port, arguments.clients, arguments.table, seed=arguments.seed)
+    finally:
+        if server is not None:
+            await server.close()
+    for key, value in result.items():
+        print(f"{key}: {value:.2f}" if isinstance(value, float) else f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ボットのクライアントを大量に接続して、テーブルサーバーの負荷を計測する")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--table", default="1")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--serve", action="store_true", help="同じプロセスでサーバーも起動する")
+    parser.add_argument("--seats-per-table", type=int, default=6)
+    parser.add_argument("--cpus", type=int, default=0)
+    parser.add_argument("--hands-per-table", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
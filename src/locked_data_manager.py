@@ -0,0 +1,180 @@
+from contextlib import contextmanager
+import os
+
+from data_manager import DataManager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class LockedDataManager(DataManager):
+    """複数のプロセスから同じ JSON ファイルを安全に更新できる DataManager。
+
+    更新は全てロックファイルの排他ロックを取った状態で行い、ロック中にファイルを読み直してから
+    変更を適用して保存する (read-modify-write)。そのため他のプロセスの更新を上書きしない。
+    ファイルの状態 (更新時刻、サイズ、inode) を覚えておき、変わっていない場合は読み直さないので、
+    ロックを持つ時間は変更の適用と保存の分だけで済む。保存は一時ファイルからの置き換えなので、
+    読み込みはロックを取らない。
+
+    Attributes:
+        data_file_path (str): データが保存されるファイルのパス。
+        lock_path (str): ロックファイルのパス。
+
+    Tests:
+        [x]: test_locked_data_manager
+
+    """
+
+    def __init__(self, file_path):
+        """ロックファイルを開き、データを読み込む。
+
+        Args:
+            file_path (str): データが保存されるファイルのパス。
+
+        """
+        self.lock_path = file_path + ".lock"
+        self._lock_file = open(self.lock_path, "a+b")
+        self._lock_depth = 0
+        self._signature = None
+        # 他のプロセスの更新を上書きしないよう、変更は常にすぐ保存する
+        super().__init__(file_path, write_behind=False)
+
+    def load_data(self):
+        """データをデータファイルから読み込み、ファイルの状態を記録する。
+
+        """
+        self._signature = self._stat()
+        super().load_data()
+
+    def save_data(self):
+        """データをデータファイルに保存し、ファイルの状態を記録する。
+
+        """
+        with self._locked():
+            super().save_data()
+            self._signature = self._stat()
+
+    def get_user_data(self, user_name):
+        """他のプロセスの更新を反映してから、指定されたデータを取得する。
+
+        Args:
+            user_name (str): データ名。
+
+        Returns:
+            obj: 取得したデータ。
+
+        """
+        self._refresh()
+        return super().get_user_data(user_name)
+
+    def update_user_data(self, user_name, data):
+        """ロックを取って、指定されたデータを更新する。
+
+        Args:
+            user_name (str): データ名。
+            data (obj): 更新するデータ。
+
+        """
+        with self._locked():
+            self._refresh()
+            super().update_user_data(user_name, data)
+
+    def adjust_user_data(self, user_name, amount):
+        """ロックを取って、最新のチップ数から増減する。
+
+        Args:
+            user_name (str): ユーザー名。
+            amount (int): 増減するチップ数。減らす場合は負の値。
+
+        Returns:
+            int: 増減後のチップ数。
+
+        Raises:
+            KeyError: ユーザーが存在しない場合。
+
+        """
+        with self._locked():
+            self._refresh()
+            return super().adjust_user_data(user_name, amount)
+
+    def add_new_user(self, user_name, initial_data):
+        """ロックを取って、新しいデータ名を追加する。既に存在する場合は何もしない。
+
+        Args:
+            user_name (str): データ名。
+            initial_data (obj): 初期データ。
+
+        """
+        with self._locked():
+            self._refresh()
+            super().add_new_user(user_name, initial_data)
+
+    def delete_user(self, user_name):
+        """ロックを取って、指定されたデータ名を削除する。
+
+        Args:
+            user_name (str): データ名。
+
+        """
+        with self._locked():
+            self._refresh()
+            super().delete_user(user_name)
+
+    def close(self):
+        """ロックファイルを閉じる。
+
+        """
+        super().close()
+        self._lock_file.close()
+
+    def _stat(self):
+        """データファイルの状態を返す。
+
+        Returns:
+            tuple[int, int, int]: 更新時刻 (ナノ秒)、サイズ、inode。ファイルがない場合はNone。
+
+        """
+        try:
+            stat = os.stat(self.data_file_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def _refresh(self):
+        """データファイルが他のプロセスに更新されていれば読み直す。
+
+        """
+        if self._stat() != self._signature:
+            self.load_data()
+
+    @contextmanager
+    def _locked(self):
+        """ロックファイルの排他ロックを取る。同じインスタンスの中では入れ子にできる。
+
+        """
+        if self._lock_depth == 0:
+            if fcntl is not None:
+                fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX)
+            else:
+                self._lock_file.seek(0)
+                while True:
+                    try:
+                        msvcrt.locking(self._lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        # LK_LOCK は約10秒で諦めるので、取れるまで繰り返す
+                        continue
+        self._lock_depth += 1
+        try:
+            yield
+        finally:
+            self._lock_depth -= 1
+            if self._lock_depth == 0:
+                if fcntl is not None:
+                    fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+                else:
+                    self._lock_file.seek(0)
+                    msvcrt.locking(self._lock_file.fileno(), msvcrt.LK_UNLCK, 1)
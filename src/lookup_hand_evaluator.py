@@ -0,0 +1,354 @@
+from itertools import combinations_with_replacement
+
+try:
+    import numpy as np
+except ImportError:  # evaluate_batch を使わなければ NumPy は不要
+    np = None
+
+from card import Card
+from hand_evaluator import HandCategory, HandEvaluator
+
+
+class LookupHandEvaluator(HandEvaluator):
+    """事前計算したテーブルを使ってハンドを評価するクラス。
+
+    カードの集合を「ハンドの状態」(ランク構成キー, スートごとの枚数, スートごとのランクのビットマスク)
+    に変換し、テーブルを1回引くだけで (HandCategory, rank) を求める。
+    戻り値の形式は HandEvaluator.best_hand_from_seven と同じ。
+
+    ハンドの状態はカードごとの値を足し合わせる (ビットマスクは論理和を取る) だけで作れるので、
+    ボードを共有する複数のハンドや、1枚ずつ増えていくボードを差分で評価できる。
+    score_from_state は同じテーブルから HandEvaluator.hand_score 形式の整数スコアを直接求める。
+    テーブルはクラス全体で共有し、最初のインスタンス生成時に一度だけ構築する。
+
+    Attributes:
+        RANK_WEIGHTS (list[int]): ランク番号ごとのランク構成キーの重み。
+        CARD_WEIGHTS (list[int]): カード ID ごとのランク構成キーの重み。
+        CARD_SUIT_COUNTS (list[int]): カード ID ごとのスート枚数の増分 (スートごとに4ビット)。
+        CARD_MASKS (list[int]): カード ID ごとのランクのビット (スートごとに13ビット)。
+
+    Tests:
+        [x]: test_lookup_hand_evaluator
+
+    """
+    # ランク構成キーの重み。1ランクにつき最大4枚なので5進数で一意になる
+    RANK_WEIGHTS = [5 ** index for index in range(13)]
+    CARD_WEIGHTS = [Card.from_id(card_id).rank_weight for card_id in range(Card.NUM_CARDS)]
+    CARD_SUIT_COUNTS = [Card.from_id(card_id).suit_count for card_id in range(Card.NUM_CARDS)]
+    CARD_MASKS = [Card.from_id(card_id).rank_mask for card_id in range(Card.NUM_CARDS)]
+
+    # スートごとの枚数に3を足して8の位が立てば5枚以上 (フラッシュ)
+    FLUSH_COUNT_OFFSET = 0x3333
+    FLUSH_COUNT_TEST = 0x8888
+
+    _straight_table = None
+    _flush_table = None
+    _rank_table = None
+    _flush_score_table = None
+    _rank_score_table = None
+    _batch_tables = None
+
+    def __init__(self):
+        """テーブルが未構築であれば構築する。
+
+        """
+        super().__init__()
+        if LookupHandEvaluator._rank_table is None:
+            LookupHandEvaluator._build_tables()
+
+    def best_hand_from_seven(self, cards):
+        """5～7枚のカードから最も強い5枚の手をテーブル参照で求める。
+
+        Args:
+            cards (list[Card]): 5～7枚のカードのリスト。
+
+        Returns:
+            tuple[HandCategory, list[int]]: そのプレイヤー最も強いハンドカテゴリとそのランク。
+
+        """
+        return self._best_hand_from_state(*self.card_state(cards))
+
+    def best_hand_from_ids(self, card_ids):
+        """5～7枚のカード ID から最も強い5枚の手をテーブル参照で求める。
+
+        Args:
+            card_ids (list[int]): 5～7枚のカード ID のリスト。
+
+        Returns:
+            tuple[HandCategory, list[int]]: そのプレイヤー最も強いハンドカテゴリとそのランク。
+
+        """
+        return self._best_hand_from_state(*self.hand_state(card_ids))
+
+    def _best_hand_from_state(self, key, suit_counts, rank_masks):
+        """ハンドの状態から最も強い5枚の手をテーブル参照で求める。
+
+        Args:
+            key (int): ランク構成キー。
+            suit_counts (int): スートごとの枚数。
+            rank_masks (int): スートごとのランクのビットマスク。
+
+        Returns:
+            tuple[HandCategory, list[int]]: 最も強いハンドカテゴリとそのランク。
+
+        """
+        rank_result = self._rank_table.get(key, (None, None))
+        flush_suits = (suit_counts + self.FLUSH_COUNT_OFFSET) & self.FLUSH_COUNT_TEST
+        if flush_suits:
+            suit = flush_suits.bit_length() >> 2
+            flush_result = self._flush_table[rank_masks >> (suit - 1) * 13 & 0x1FFF]
+            # フルハウスとフォーカードはフラッシュより強い
+            if flush_result[0] is HandCategory.FLUSH and rank_result[0].strength > HandCategory.FLUSH.strength:
+                return rank_result
+            return flush_result
+        return rank_result
+
+    def evaluate_score(self, player_hand, community_cards):
+        """プレイヤーの手とコミュニティカードから、もっとも強い５枚のスコアをテーブル参照で求める。
+
+        Args:
+            player_hand (list[Card]): 2枚のカードのリスト。
+            community_cards (list[Card]): 5枚のカードのリスト。
+
+        Returns:
+            int: そのプレイヤーの最も強いハンドのスコア。
+
+        """
+        return self.score_from_state(*self.card_state(player_hand + community_cards))
+
+    def score_from_ids(self, card_ids):
+        """5～7枚のカード ID から最も強い5枚の手のスコアをテーブル参照で求める。
+
+        Args:
+            card_ids (list[int]): 5～7枚のカード ID のリスト。
+
+        Returns:
+            int: 最も強いハンドのスコア。5枚未満の場合は0。
+
+        """
+        return self.score_from_state(*self.hand_state(card_ids))
+
+    def evaluate_batch(self, cards_array):
+        """カード ID の2次元配列から、各行のハンドのスコアを NumPy でまとめて求める。
+
+        行ごとの Python のループは行わず、すべてテーブル参照と配列演算で計算する。
+        結果は各行を score_from_ids で評価した値と一致する。
+
+        Args:
+            cards_array (numpy.ndarray): 形状 (N, 5～7) のカード ID の整数配列。
+
+        Returns:
+            numpy.ndarray: 形状 (N,) の int32 のスコアの配列。
+
+        Raises:
+            ImportError: NumPy がインストールされていない場合に発生。
+            ValueError: 配列の形状が不正な場合、または同じランクが5枚以上ある行など、ありえないランク構成の行がある場合に発生。
+
+        """
+        if np is None:
+            raise ImportError("evaluate_batch requires NumPy")
+        cards = np.asarray(cards_array, dtype=np.intp)
+        if cards.ndim != 2 or not 5 <= cards.shape[1] <= 7:
+            raise ValueError(f"Invalid shape of cards array: {cards.shape}")
+
+        weights, masks, rank_keys, rank_scores, flush_scores = self._get_batch_tables()
+        keys = weights[cards].sum(axis=1)
+        positions = np.searchsorted(rank_keys, keys).clip(max=len(rank_keys) - 1)
+        if np.any(rank_keys[positions] != keys):
+            raise ValueError("Cards array contains an invalid hand")
+        scores = rank_scores[positions]
+
+        rank_masks = np.bitwise_or.reduce(masks[cards], axis=1)
+        for suit in range(4):
+            # 5枚未満のスートはフラッシュのスコアが0なので、そのまま最大値を取ればよい
+            np.maximum(scores, flush_scores[(rank_masks >> suit * 13) & 0x1FFF], out=scores)
+        return scores
+
+    @classmethod
+    def _get_batch_tables(cls):
+        """evaluate_batch 用の NumPy 配列のテーブルを返す。未作成の場合は作成する。
+
+        Returns:
+            tuple[numpy.ndarray, ...]: カードごとの重み、カードごとのビット、昇順のランク構成キー、
+            それに対応するスコア、ビットマスクごとのフラッシュのスコア。
+
+        """
+        if cls._batch_tables is None:
+            rank_keys = np.array(sorted(cls._rank_score_table), dtype=np.int64)
+            rank_scores = np.array([cls._rank_score_table[key] for key in rank_keys.tolist()], dtype=np.int32)
+            cls._batch_tables = (
+                np.array(cls.CARD_WEIGHTS, dtype=np.int64),
+                np.array(cls.CARD_MASKS, dtype=np.int64),
+                rank_keys,
+                rank_scores,
+                np.array(cls._flush_score_table, dtype=np.int32),
+            )
+        return cls._batch_tables
+
+    def hand_state(self, card_ids):
+        """カード ID のリストをハンドの状態に変換する。
+
+        Args:
+            card_ids (list[int]): カード ID のリスト (0枚以上7枚以下)。
+
+        Returns:
+            tuple[int, int, int]: ランク構成キー、スートごとの枚数、スートごとのランクのビットマスク。
+
+        """
+        weights = self.CARD_WEIGHTS
+        counts = self.CARD_SUIT_COUNTS
+        masks = self.CARD_MASKS
+        key = 0
+        suit_counts = 0
+        rank_masks = 0
+        for card_id in card_ids:
+            key += weights[card_id]
+            suit_counts += counts[card_id]
+            rank_masks |= masks[card_id]
+        return key, suit_counts, rank_masks
+
+    @staticmethod
+    def card_state(cards):
+        """カードのリストをハンドの状態に変換する。
+
+        各カードが持つ事前計算済みの値を足し合わせるので、カード ID への変換や表の参照は不要。
+
+        Args:
+            cards (list[Card]): カードのリスト (0枚以上7枚以下)。
+
+        Returns:
+            tuple[int, int, int]: ランク構成キー、スートごとの枚数、スートごとのランクのビットマスク。
+
+        """
+        key = 0
+        suit_counts = 0
+        rank_masks = 0
+        for card in cards:
+            key += card.rank_weight
+            suit_counts += card.suit_count
+            rank_masks |= card.rank_mask
+        return key, suit_counts, rank_masks
+
+    def score_from_state(self, key, suit_counts, rank_masks):
+        """ハンドの状態から最も強い5枚の手のスコアを求める。
+
+        Args:
+            key (int): ランク構成キー。
+            suit_counts (int): スートごとの枚数。
+            rank_masks (int): スートごとのランクのビットマスク。
+
+        Returns:
+            int: 最も強いハンドのスコア。5枚未満の場合は0。
+
+        """
+        score = self._rank_score_table.get(key, 0)
+        flush_suits = (suit_counts + self.FLUSH_COUNT_OFFSET) & self.FLUSH_COUNT_TEST
+        if flush_suits:
+            flush_score = self._flush_score_table[rank_masks >> ((flush_suits.bit_length() >> 2) - 1) * 13 & 0x1FFF]
+            if flush_score > score:
+                return flush_score
+        return score
+
+    @classmethod
+    def _build_tables(cls):
+        """ストレート、フラッシュ、ランク構成の各テーブルを構築する。
+
+        """
+        straight_table = [cls._find_straight_top(mask) for mask in range(1 << 13)]
+
+        flush_table = [None] * (1 << 13)
+        for mask in range(1 << 13):
+            if mask.bit_count() < 5:
+                continue
+            top_rank = straight_table[mask]
+            if top_rank == 14:
+                flush_table[mask] = (HandCategory.ROYAL_FLUSH, None)
+            elif top_rank:
+                flush_table[mask] = (HandCategory.STRAIGHT_FLUSH, top_rank)
+            else:
+                ranks = [index + 2 for index in range(12, -1, -1) if mask >> index & 1]
+                flush_table[mask] = (HandCategory.FLUSH, ranks[:5])
+
+        rank_table = {}
+        for num_cards in range(5, 8):
+            for indexes in combinations_with_replacement(range(12, -1, -1), num_cards):
+                counts = {}
+                for index in indexes:
+                    counts[index] = counts.get(index, 0) + 1
+                if max(counts.values()) > 4:
+                    continue
+                key = sum(cls.RANK_WEIGHTS[index] for index in indexes)
+                rank_table[key] = cls._evaluate_rank_counts(counts, straight_table)
+
+        cls._straight_table = straight_table
+        cls._flush_table = flush_table
+        cls._rank_table = rank_table
+        cls._flush_score_table = [cls.hand_score(*result) if result else 0 for result in flush_table]
+        cls._rank_score_table = {key: cls.hand_score(*result) for key, result in rank_table.items()}
+
+    @staticmethod
+    def _find_straight_top(mask):
+        """ランクのビットマスクからストレートの最高ランクを求める。
+
+        Args:
+            mask (int): ランク番号をビット位置とするビットマスク。
+
+        Returns:
+            int: ストレートの最高ランク。ストレートでない場合は0。
+
+        """
+        for top_index in range(12, 3, -1):
+            straight_mask = 0b11111 << (top_index - 4)
+            if mask & straight_mask == straight_mask:
+                return top_index + 2
+
+        # A-2-3-4-5のストレートを特別にチェック
+        wheel_mask = (1 << 12) | 0b1111
+        if mask & wheel_mask == wheel_mask:
+            return 5
+
+        return 0
+
+    @staticmethod
+    def _evaluate_rank_counts(counts, straight_table):
+        """フラッシュを除いたランク構成だけからハンドを評価する。
+
+        Args:
+            counts (dict[int, int]): ランク番号ごとの枚数。
+            straight_table (list[int]): ビットマスクごとのストレートの最高ランク。
+
+        Returns:
+            tuple[HandCategory, list[int]]: ハンドカテゴリとそのランク。
+
+        """
+        values = sorted((index + 2 for index in counts), reverse=True)
+        quads = [value for value in values if counts[value - 2] == 4]
+        trips = [value for value in values if counts[value - 2] == 3]
+        pairs = [value for value in values if counts[value - 2] == 2]
+
+        if quads:
+            kickers = [value for value in values if value != quads[0]]
+            return (HandCategory.FOUR_OF_A_KIND, [quads[0], kickers[0]])
+
+        if trips and (len(trips) >= 2 or pairs):
+            return (HandCategory.FULL_HOUSE, [trips[0], max(trips[1:] + pairs)])
+
+        mask = 0
+        for index in counts:
+            mask |= 1 << index
+        if straight_table[mask]:
+            return (HandCategory.STRAIGHT, straight_table[mask])
+
+        if trips:
+            kickers = [value for value in values if value != trips[0]]
+            return (HandCategory.THREE_OF_A_KIND, [trips[0]] + kickers[:2])
+
+        if len(pairs) >= 2:
+            kickers = [value for value in values if value not in pairs[:2]]
+            return (HandCategory.TWO_PAIR, pairs[:2] + kickers[:1])
+
+        if pairs:
+            kickers = [value for value in values if value != pairs[0]]
+            return (HandCategory.ONE_PAIR, [pairs[0]] + kickers[:3])
+
+        return (HandCategory.HIGH_CARD, values[:5])
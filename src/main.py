@@ -1,7 +1,10 @@
-from data_manager import DataManager
+import os
+
 from game_lobby import GameLobby
 from input_handler import InputHandler
-from message_handler import MessageHandler
+from ledger_data_manager import LedgerDataManager
+from message_handler import DeltaMessageHandler
+from output_sink import StdoutSink, level_from_name
 
 
 """
@@ -48,12 +51,14 @@ from message_handler import MessageHandler
 if __name__ == "__main__":
     try:
         # 初期値の定義
-        player_name, last_chips = None, None
+        player_name, last_chips, data_manager, message_handler = None, None, None, None
 
         # クラスのインスタンス化
-        message_handler = MessageHandler()
+        # 表示の詳細さは環境変数 POKER_VERBOSITY (action、state、info、prompt)、言語は POKER_LOCALE (ja、en) で変えられる
+        message_handler = DeltaMessageHandler(StdoutSink(level=level_from_name(os.environ.get("POKER_VERBOSITY", "action"))),
+                                              locale=os.environ.get("POKER_LOCALE"))
         input_handler = InputHandler(message_handler)
-        data_manager = DataManager("./data/user_data.json")
+        data_manager = LedgerDataManager("./data/user_data.sqlite3", legacy_json_path="./data/user_data.json")
 
         # プレイヤー名の取得、プレイヤー名に紐づくセーブデータの取得
         player_name = input_handler.get_player_name()
@@ -78,3 +83,7 @@ if __name__ == "__main__":
     finally:
         if player_name is not None and last_chips is not None:
             data_manager.update_user_data(player_name, last_chips)
+        if data_manager is not None:
+            data_manager.close()
+        if message_handler is not None:
+            message_handler.flush()
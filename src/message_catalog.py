@@ -0,0 +1,341 @@
+"""表示する文言のカタログ。
+
+言語 (ロケール) ごとの文言をモジュールに1つだけ持ち、各文言は最初に使うときに一度だけ解析して
+組み立て用の関数にコンパイルする。MessageHandler はインスタンスごとに文言の辞書を作らず、
+get_catalog で共有のカタログを受け取る。
+
+文言は str.format と同じ "{name}" 形式で書く。lazy で作った LazyMessage は文字列に変換されるまで
+組み立てないので、出力先が捨てるメッセージは組み立ての費用がかからない。
+"""
+
+import string
+from types import MappingProxyType
+
+
+DEFAULT_LOCALE = "ja"
+
+# キーがない場合に表示する文言のキー
+MISSING_KEY = "message_not_found"
+
+MESSAGES = {
+    "ja": {
+        "args": "{args}",
+        "user_list": "ユーザー一覧",
+        "user_input": "ユーザー名を入力してください:",
+        "player_chips": "プレイヤー名: {player_name} チップ数: {chips}",
+        "table_detail": "{table_name}: {sb}-{bb}",
+        "select_table": "テーブル番号を選択してください(または0で終了):",
+        "abst_table": "テーブル一覧:\n-----------------\n'新規' テーブルはプレイヤーとCPUのチップ数が同じ状態で始まります。\n'既存' テーブルはプレイヤーとCPUのチップ数に差がある状態で始まります。",
+        "new_table": "新規",
+        "existing_table": "既存",
+        "welcome_user": "ようこそ, {user_name}!",
+        "now_chips": "現在のチップ: {chips}",
+        "add_user": "{user_name} として新規登録します。",
+        "initial_chips": "初期チップ: {initial_chips} が付与されました。",
+        "enter_game_mode": "ゲームモードを選択してください 1:リミット 2:ポットリミット 3:ノーリミット : ",
+        "enter_initial_chips": "ゲームに持ち込むチップの数を入力してください: ",
+        "enter_num_cpu": "参加するCPUの数を入力してください: ",
+        "invalid_input": "無効な入力です。もう一度入力してください。",
+        "invalid_range": "無効な範囲です。{min}～{max}の範囲で入力して下さい。",
+        "set_initial_button": "ディーラーボタンの位置を決定中...",
+        "button_holder": "{player_name}がディーラーボタンを獲得。",
+        "choose_action": "利用可能なアクション: {available_actions}\nアクションを選択してください(数値で入力):",
+        "invalid_action": "無効なアクションです。もう一度選択してください。",
+        "enter_bet_amount": "{min_amount} から {max_amount} までのベット額を入力してください:",
+        "invalid_bet_amount": "無効なベット額です。{min_amount} から {max_amount} までの間で入力してください。",
+        "community_cards": "コミュニティカード: ",
+        "pots": "ポット: {pots}",
+        "best_hand": "\nプレイヤーのベストハンド:",
+        "player_best_hand": "{player_name} - ハンドカテゴリ: {hand_category}, ランク: {hand_rank}\n",
+        "win_player": "{player_name} - チップ獲得: {get_chips} → 合計: {chips}\n",
+        "main_pot": "メインポット勝者",
+        "side_pot": "サイドポット{index}勝者",
+        "remove_cpu": "{player_name}が席を立ちました。",
+        "rebuy_cpu": "{player_name}が、チップを{initial_chips}にリバイしました。",
+        "continue_to_game": "0: つづける 1: やめる : ",
+        "zero_chips": "所持チップが0になりました",
+        "rebuy_chips": "リバイする場合、新たに持ち込むチップ数を入力(0の場合は席を立つ):",
+        "game_exit": "ゲーム終了。お疲れ様でした。",
+        "message_not_found": "メッセージが見つかりません。",
+    },
+    "en": {
+        "args": "{args}",
+        "user_list": "Users",
+        "user_input": "Enter your user name:",
+        "player_chips": "Player: {player_name} Chips: {chips}",
+        "table_detail": "{table_name}: {sb}-{bb}",
+        "select_table": "Select a table number (or 0 to quit):",
+        "abst_table": "Tables:\n-----------------\n'New' tables start with the player and the CPUs holding the same chips.\n"
+                      "'Existing' tables start with the player and the CPUs holding different chips.",
+        "new_table": "New",
+        "existing_table": "Existing",
+        "welcome_user": "Welcome, {user_name}!",
+        "now_chips": "Current chips: {chips}",
+        "add_user": "Registering a new user {user_name}.",
+        "initial_chips": "You received {initial_chips} initial chips.",
+        "enter_game_mode": "Select a game mode 1:Limit 2:Pot limit 3:No limit : ",
+        "enter_initial_chips": "Enter the number of chips to bring to the game: ",
+        "enter_num_cpu": "Enter the number of CPU players: ",
+        "invalid_input": "Invalid input. Please try again.",
+        "invalid_range": "Out of range. Please enter a value from {min} to {max}.",
+        "set_initial_button": "Deciding the dealer button...",
+        "button_holder": "{player_name} has the dealer button.",
+        "choose_action": "Available actions: {available_actions}\nSelect an action (enter a number):",
+        "invalid_action": "Invalid action. Please choose again.",
+        "enter_bet_amount": "Enter a bet amount from {min_amount} to {max_amount}:",
+        "invalid_bet_amount": "Invalid bet amount. Please enter a value from {min_amount} to {max_amount}.",
+        "community_cards": "Community cards: ",
+        "pots": "Pot: {pots}",
+        "best_hand": "\nBest hands:",
+        "player_best_hand": "{player_name} - Category: {hand_category}, Rank: {hand_rank}\n",
+        "win_player": "{player_name} - Won: {get_chips} → Total: {chips}\n",
+        "main_pot": "Main pot winners",
+        "side_pot": "Side pot {index} winners",
+        "remove_cpu": "{player_name} left the table.",
+        "rebuy_cpu": "{player_name} rebought to {initial_chips} chips.",
+        "continue_to_game": "0: continue 1: quit : ",
+        "zero_chips": "You have no chips left",
+        "rebuy_chips": "Enter the chips to rebuy (0 to leave the table):",
+        "game_exit": "Game over. Thanks for playing.",
+        "message_not_found": "Message not found.",
+    },
+}
+
+AVAILABLE_LOCALES = tuple(MESSAGES)
+
+
+class MessageTemplate:
+    """1つの文言を組み立てる関数にコンパイルしたもの。
+
+    "{name}" と "{name:spec}"、"{name!r}" の形式の置換を、文言の解析を毎回行わずに組み立てる。
+    "{name.attr}" や "{name[0]}" のような置換を含む文言は str.format で組み立てる。
+
+    Attributes:
+        text (str): 元の文言。
+        fields (frozenset[str]): 組み立てに必要な変数の名前。
+
+    Tests:
+        [x]: test_message_template
+
+    """
+
+    __slots__ = ("text", "fields", "_render")
+
+    def __init__(self, text):
+        """文言を解析し、組み立てる関数を作る。
+
+        Args:
+            text (str): str.format 形式の文言。
+
+        Raises:
+            ValueError: 文言の形式が正しくない場合。
+
+        """
+        self.text = text
+        parts = list(string.Formatter().parse(text))
+        self.fields = frozenset(name for _, name, _, _ in parts if name is not None)
+
+        if not self.fields:
+            # 置換がない文言は、波括弧のエスケープだけ戻した文字列をそのまま返す
+            literal = "".join(literal for literal, _, _, _ in parts)
+            self._render = lambda kwargs: literal
+        elif all(name.isidentifier() and not set(spec) & set("{}\"\\") for _, name, spec, _ in parts if name is not None):
+            # 文言を f-string の式にして一度だけコンパイルする。隣り合う文字列の連結はコンパイル時に1つにまとまる
+            pieces = []
+            for literal, name, spec, conversion in parts:
+                if literal:
+                    pieces.append(repr(literal))
+                if name is not None:
+                    conversion = f"!{conversion}" if conversion else ""
+                    spec = f":{spec}" if spec else ""
+                    pieces.append(f'f"{{kwargs[{name!r}]{conversion}{spec}}}"')
+            self._render = eval(f"lambda kwargs: {' '.join(pieces)}", {})
+        else:
+            self._render = text.format_map
+
+    def format(self, **kwargs):
+        """文言を組み立てる。
+
+        Args:
+            ``**kwargs``: 置換する変数。文言で使わない変数は無視する。
+
+        Returns:
+            str: 組み立てた文字列。
+
+        Raises:
+            KeyError: 必要な変数がない場合。
+
+        """
+        return self._render(kwargs)
+
+    def render(self, kwargs):
+        """変数の辞書から文言を組み立てる。format と同じだが、キーワード引数に展開しない。
+
+        Args:
+            kwargs (dict): 置換する変数。
+
+        Returns:
+            str: 組み立てた文字列。
+
+        Raises:
+            KeyError: 必要な変数がない場合。
+
+        """
+        return self._render(kwargs)
+
+
+class LazyMessage:
+    """文字列に変換されるまで組み立てを遅らせるメッセージ。
+
+    作成時に必要な変数がそろっているかだけを確認し、組み立ては最初に str() されたときに1回だけ行う。
+
+    Attributes:
+        template (MessageTemplate): 組み立てる文言。
+        kwargs (dict): 置換する変数。
+
+    Tests:
+        [x]: test_lazy_message
+
+    """
+
+    __slots__ = ("template", "kwargs", "_text")
+
+    def __init__(self, template, kwargs):
+        """LazyMessageクラスの初期化。
+
+        Args:
+            template (MessageTemplate): 組み立てる文言。
+            kwargs (dict): 置換する変数。
+
+        Raises:
+            KeyError: 必要な変数がない場合。
+
+        """
+        if not template.fields <= kwargs.keys():
+            raise KeyError(min(template.fields - kwargs.keys()))
+        self.template = template
+        self.kwargs = kwargs
+        self._text = None
+
+    def __str__(self):
+        """組み立てた文字列を返す。
+
+        """
+        if self._text is None:
+            self._text = self.template.render(self.kwargs)
+        return self._text
+
+    def __repr__(self):
+        return f"LazyMessage({self.template.text!r}, {self.kwargs!r})"
+
+
+class MessageCatalog:
+    """1つのロケールの文言のカタログ。
+
+    Attributes:
+        locale (str): ロケール。
+        messages (Mapping[str, str]): キーごとの文言 (読み取り専用)。
+
+    Tests:
+        [x]: test_message_catalog
+
+    """
+
+    def __init__(self, locale, messages):
+        """MessageCatalogクラスの初期化。文言は最初に使うときにコンパイルする。
+
+        Args:
+            locale (str): ロケール。
+            messages (dict[str, str]): キーごとの文言。
+
+        """
+        self.locale = locale
+        self.messages = MappingProxyType(messages)
+        self._templates = {}
+
+    def __contains__(self, key):
+        return key in self.messages
+
+    def template(self, key):
+        """キーに対応するコンパイル済みの文言を返す。
+
+        Args:
+            key (str): メッセージのキー。ない場合は MISSING_KEY の文言を返す。
+
+        Returns:
+            MessageTemplate: コンパイル済みの文言。
+
+        """
+        template = self._templates.get(key)
+        if template is None:
+            if key not in self.messages:
+                return self.template(MISSING_KEY)
+            template = self._templates[key] = MessageTemplate(self.messages[key])
+        return template
+
+    def format(self, key, **kwargs):
+        """キーに対応する文言をすぐに組み立てる。
+
+        Args:
+            key (str): メッセージのキー。
+            ``**kwargs``: 置換する変数。
+
+        Returns:
+            str: 組み立てた文字列。
+
+        """
+        return self.template(key).render(kwargs)
+
+    def lazy(self, key, **kwargs):
+        """キーに対応する文言を、文字列に変換されるまで組み立てないメッセージにする。
+
+        Args:
+            key (str): メッセージのキー。
+            ``**kwargs``: 置換する変数。
+
+        Returns:
+            LazyMessage: メッセージ。
+
+        """
+        template = self._templates.get(key)
+        return LazyMessage(template if template is not None else self.template(key), kwargs)
+
+
+_catalogs = {}
+
+
+def normalize_locale(name):
+    """"ja_JP.UTF-8" や "en-US" のようなロケール名を、カタログのロケールに変換する。
+
+    Args:
+        name (str): ロケール名。空かNoneの場合は DEFAULT_LOCALE。
+
+    Returns:
+        str: カタログのロケール。
+
+    """
+    if not name:
+        return DEFAULT_LOCALE
+    return name.split(".")[0].replace("-", "_").split("_")[0].lower()
+
+
+def get_catalog(locale=None):
+    """ロケールのカタログを返す。カタログはプロセスごとに1回だけ作り、以降は同じものを返す。
+
+    Args:
+        locale (str, optional): ロケール名。Noneの場合は DEFAULT_LOCALE。
+
+    Returns:
+        MessageCatalog: カタログ。
+
+    Raises:
+        ValueError: カタログのないロケールの場合。
+
+    """
+    locale = normalize_locale(locale)
+    catalog = _catalogs.get(locale)
+    if catalog is None:
+        if locale not in MESSAGES:
+            raise ValueError(f"Unknown locale: {locale} (available: {', '.join(AVAILABLE_LOCALES)})")
+        catalog = _catalogs[locale] = MessageCatalog(locale, MESSAGES[locale])
+    return catalog
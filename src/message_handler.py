@@ -1,67 +1,76 @@
+from message_catalog import LazyMessage, get_catalog
+from output_sink import INFO, PROMPT, STATE, NullSink, StdoutSink
+
+
 class MessageHandler:
     """
     ゲーム内のメッセージを管理するクラス。
 
+    メッセージは出力先 (OutputSink) に、メッセージごとのレベルを付けて渡す。出力先のレベル未満の
+    メッセージは組み立てずに捨てるので、1アクションごとの表示なども出力先の設定だけで抑制できる。
+    文言は message_catalog のコンパイル済みのカタログから取り出し、出力先が書き込むときに組み立てる。
+
     Attributes:
-        messages (dict[str, str]): 表示する文言の一覧。
+        sink (OutputSink): 出力先。
+        catalog (MessageCatalog): 表示する言語の文言のカタログ。プロセス内で共有する。
 
     Tests:
         [ ]: test_message_manager
 
     """
 
-    def __init__(self):
+    # 入力を求めるメッセージ。表示する前に出力先のバッファを書き出させる
+    PROMPT_KEYS = frozenset(["user_input", "select_table", "enter_game_mode", "enter_initial_chips", "enter_num_cpu",
+                             "choose_action", "enter_bet_amount", "continue_to_game", "rebuy_chips"])
+
+    def __init__(self, sink=None, locale=None):
         """MessageHandler クラスのコンストラクタ。
 
+        Args:
+            sink (OutputSink, optional): 出力先。Noneの場合は print と同じく1件ずつ標準出力に書き込む。
+            locale (str, optional): 表示する言語 ('ja'、'en' など)。Noneの場合は日本語。
+
         """
-        self.messages = {
-            "args": "{args}",
-            "user_list": "ユーザー一覧",
-            "user_input": "ユーザー名を入力してください:",
-            "player_chips": "プレイヤー名: {player_name} チップ数: {chips}",
-            "table_detail": "{table_name}: {sb}-{bb}",
-            "select_table": "テーブル番号を選択してください(または0で終了):",
-            "abst_table": "テーブル一覧:\n-----------------\n'新規' テーブルはプレイヤーとCPUのチップ数が同じ状態で始まります。\n'既存' テーブルはプレイヤーとCPUのチップ数に差がある状態で始まります。",
-            "welcome_user": "ようこそ, {user_name}!",
-            "now_chips": "現在のチップ: {chips}",
-            "add_user": "{user_name} として新規登録します。",
-            "initial_chips": "初期チップ: {initial_chips} が付与されました。",
-            "enter_game_mode": "ゲームモードを選択してください 1:リミット 2:ポットリミット 3:ノーリミット : ",
-            "enter_initial_chips": "ゲームに持ち込むチップの数を入力してください: ",
-            "enter_num_cpu": "参加するCPUの数を入力してください: ",
-            "invalid_input": "無効な入力です。もう一度入力してください。",
-            "invalid_range": "無効な範囲です。{min}～{max}の範囲で入力して下さい。",
-            "set_initial_button": "ディーラーボタンの位置を決定中...",
-            "button_holder": "{player_name}がディーラーボタンを獲得。",
-            "choose_action": "利用可能なアクション: {available_actions}\nアクションを選択してください(数値で入力):",
-            "invalid_action": "無効なアクションです。もう一度選択してください。",
-            "enter_bet_amount": "{min_amount} から {max_amount} までのベット額を入力してください:",
-            "invalid_bet_amount": "無効なベット額です。{min_amount} から {max_amount} までの間で入力してください。",
-            "community_cards": "コミュニティカード: ",
-            "pots": "ポット: {pots}",
-            "best_hand": "\nプレイヤーのベストハンド:",
-            "player_best_hand": "{player_name} - ハンドカテゴリ: {hand_category}, ランク: {hand_rank}\n",
-            "win_player": "{player_name} - チップ獲得: {get_chips} → 合計: {chips}\n",
-            "main_pot": "メインポット勝者",
-            "side_pot": "サイドポット{index}勝者",
-            "remove_cpu": "{player_name}が席を立ちました。",
-            "rebuy_cpu": "{player_name}が、チップを{initial_chips}にリバイしました。",
-            "continue_to_game": "0: つづける 1: やめる : ",
-            "zero_chips": "所持チップが0になりました",
-            "rebuy_chips": "リバイする場合、新たに持ち込むチップ数を入力(0の場合は席を立つ):",
-            "game_exit": "ゲーム終了。お疲れ様でした。",
-            # 他のメッセージも必要に応じて追加してください
-        }
+        self.sink = sink if sink is not None else StdoutSink(batch_size=1)
+        self.catalog = get_catalog(locale)
+
+    @property
+    def messages(self):
+        """表示する文言の一覧 (カタログの読み取り専用の辞書) を返す。
+
+        """
+        return self.catalog.messages
 
     def get_message(self, key, **kwargs):
-        """キーに対応するメッセージを返す。必要に応じて文字列のフォーマットも行う。
+        """キーに対応するメッセージを出力先に渡す。文字列の組み立ては出力先が書き込むときに行う。
 
         Args:
             key (str): メッセージのキー。
             ``**kwarg``: フォーマット用の変数。
 
+        Raises:
+            KeyError: フォーマット用の変数が足りない場合。
+
         """
-        print(self.messages.get(key, "メッセージが見つかりません。").format(**kwargs))
+        level = PROMPT if key in self.PROMPT_KEYS else INFO
+        if not self.sink.enabled(level):
+            return
+        self.sink.emit(LazyMessage(self.catalog.template(key), kwargs), level, key)
+
+    def flush(self):
+        """出力先のバッファを書き出す。
+
+        """
+        self.sink.flush()
+
+    @staticmethod
+    def _display_width(text):
+        """表示幅を返す。ASCII 以外の文字は幅2として数える。
+
+        """
+        if text.isascii():
+            return len(text)
+        return len(text) + sum(1 for ch in text if ord(ch) > 127)
 
     def display_tables_info(self, tables, status, columns_to_display=["No", "SB-BB", "Bet Type", "CPU Players", "Total Chips"]):
         """テーブルの情報をカスタマイズされた表形式で表示する。
@@ -70,15 +79,15 @@ class MessageHandler:
             tables (list[dict]): テーブル情報を含む辞書のリスト。
             columns_to_display (list[str]): 表示したい項目のリスト。Noneの場合はすべて表示。
         """
+        if not self.sink.enabled(INFO):
+            return
+
         # 説明
         if status == 'new':
             self.get_message("abst_table")
-        abst = "+------+\n"
-        if status == 'new':
-            abst += "| 新規 |\n"
-        else:
-            abst += "| 既存 |\n"
-        abst += "+------+\n"
+        label = self.catalog.format("new_table" if status == 'new' else "existing_table")
+        border = "+" + "-" * (self._display_width(label) + 2) + "+\n"
+        abst = f"{border}| {label} |\n{border}"
         # カラム毎の最大長さ導出
         column_max_widths = {}
 
@@ -141,16 +150,20 @@ class MessageHandler:
         footer += "\n"
 
         # 全体のテーブルを組み合わせ、表示する
-        print(abst + header + body + footer)
+        self.sink.emit(abst + header + body + footer, INFO, "tables_info")
 
-    def display_players_info(self, players, columns_to_display=["PlayerName", "Chips", "Hand", "Bet", "DB", "Action"]):
+    def display_players_info(self, players, columns_to_display=["PlayerName", "Chips", "Hand", "Bet", "DB", "Action"], level=STATE):
         """プレイヤーの情報をカスタマイズされた表形式で表示する。
 
         Args:
             players (list[Player]): Playerクラスのインスタンスのリスト。
             columns_to_display (list[str]): 表示したい項目のリスト。Noneの場合はすべて表示。
+            level (int, optional): 表示のレベル。1アクションごとの表示は ACTION。
 
         """
+        if not self.sink.enabled(level):
+            return
+
         # カラム毎の最大長さ導出
         column_max_widths = {}
 
@@ -232,19 +245,207 @@ class MessageHandler:
         footer += "\n"
 
         # 全体のテーブルを組み合わせ、リターンする
-        print(header + body + footer)
+        self.sink.emit(header + body + footer, level, "players_info")
 
-    def display_community_cards(self, community_cards, pots):
+    def display_community_cards(self, community_cards, pots, level=STATE):
         """コミュニティカードとポットの情報を表示する。
 
         Args:
             community_cards (list[Card]): コミュニティカードとして表示するカードのリスト。
             pot (int): ポットの現在の合計額。
+            level (int, optional): 表示のレベル。1アクションごとの表示は ACTION。
+
+        """
+        if not self.sink.enabled(level):
+            return
+        cards = "".join(f"{card} " for card in community_cards)
+        text = f"{self.catalog.format('community_cards')}\n{cards}\n{'-' * 30}\n{self.catalog.format('pots', pots=pots)}\n\n{'-' * 30}"
+        self.sink.emit(text, level, "community_cards")
+
+
+class NullMessageHandler(MessageHandler):
+    """何も表示しないメッセージ処理クラス。
+
+    ヘッドレスでの大量の自己対戦など、表示が不要な場合に使う。
+
+    Tests:
+        [x]: test_null_message_handler
+
+    """
+
+    def __init__(self):
+        """NullMessageHandler クラスのコンストラクタ。出力先は NullSink。
+
+        """
+        super().__init__(NullSink())
+
+    def get_message(self, key, **kwargs):
+        """何も表示しない。
+
+        """
+
+    def display_tables_info(self, tables, status, columns_to_display=None):
+        """何も表示しない。
+
+        """
+
+    def display_players_info(self, players, columns_to_display=None, level=STATE):
+        """何も表示しない。
+
+        """
+
+    def display_community_cards(self, community_cards, pots, level=STATE):
+        """何も表示しない。
+
+        """
+
+
+class DeltaMessageHandler(MessageHandler):
+    """前回の表示から変わった部分だけを表示するメッセージ処理クラス。
+
+    プレイヤー情報の表は、列幅 (レイアウト) と前回表示した各行のセルを覚えておき、
+    変わった行だけを表示する。列幅に収まらないセルが出た場合、行の数や並びが変わった場合は
+    列幅を広げて表全体を表示し直す。コミュニティカードとポットも、変わった場合だけ表示する。
+    1アクションごとに表全体を組み立て直さないので、CPUだけのテーブルでも表示が律速にならない。
+
+    Tests:
+        [x]: test_delta_message_handler
+
+    """
+
+    def __init__(self, sink=None, locale=None):
+        """DeltaMessageHandler クラスのコンストラクタ。
+
+        Args:
+            sink (OutputSink, optional): 出力先。Noneの場合は1件ずつ標準出力に書き込む。
+            locale (str, optional): 表示する言語。Noneの場合は日本語。
+
+        """
+        super().__init__(sink, locale)
+        self.reset()
+
+    def reset(self):
+        """覚えている表示内容を捨て、次の表示で全体を表示し直す。
+
+        """
+        self._columns = None
+        self._widths = {}
+        self._keys = []
+        self._rows = []
+        self._community = None
+
+    def display_players_info(self, players, columns_to_display=["PlayerName", "Chips", "Hand", "Bet", "DB", "Action"], level=STATE):
+        """プレイヤーの情報のうち、前回から変わった行だけを表示する。
+
+        表示しないレベルの場合は、次に表示するときに表全体を表示し直す。
+
+        Args:
+            players (list[Player]): Playerクラスのインスタンスのリスト。
+            columns_to_display (list[str]): 表示したい項目のリスト。
+            level (int, optional): 表示のレベル。1アクションごとの表示は ACTION。
+
+        """
+        if not self.sink.enabled(level):
+            self._columns = None
+            return
+        columns = tuple(columns_to_display)
+        full = columns != self._columns or len(players) != len(self._rows)
+        if full:
+            self._columns = columns
+            self._widths = {column: self._display_width(column) for column in columns}
+            self._keys = [None] * len(players)
+            self._rows = [None] * len(players)
+
+        # 表示に関わる値が前回と同じプレイヤーは、セルを組み立て直さない
+        changed = []
+        for index, player in enumerate(players):
+            key = (player.name, player.chips, player.current_bet, player.is_dealer, tuple(player.hand),
+                   player.last_action[-1] if player.last_action else None, getattr(player, "last_bet_amount", None))
+            if key == self._keys[index]:
+                continue
+            self._keys[index] = key
+            row = tuple(self._player_cell(player, column) for column in columns)
+            if row == self._rows[index]:
+                continue
+            if self._rows[index] is not None and row[0] != self._rows[index][0]:
+                full = True
+            self._rows[index] = row
+            changed.append(row)
+            for column, cell in zip(columns, row):
+                width = self._display_width(cell)
+                if width > self._widths[column]:
+                    self._widths[column] = width
+                    full = True
+
+        # 半分を超える行が変わった場合 (新しいハンドの開始など) は、表全体を表示し直す
+        if full or len(changed) * 2 > len(players):
+            lines = [self._border(), self._format_row(columns), self._border()]
+            lines.extend(self._format_row(row) for row in self._rows)
+            lines.append(self._border())
+        else:
+            lines = [self._format_row(row) for row in changed]
+        if lines:
+            self.sink.emit("\n".join(lines), level, "players_info")
+
+    def display_community_cards(self, community_cards, pots, level=STATE):
+        """コミュニティカードかポットが前回から変わった場合だけ表示する。
+
+        Args:
+            community_cards (list[Card]): コミュニティカードとして表示するカードのリスト。
+            pots (int): ポットの現在の合計額。
+            level (int, optional): 表示のレベル。1アクションごとの表示は ACTION。
+
+        """
+        if not self.sink.enabled(level):
+            self._community = None
+            return
+        community = (tuple(community_cards), pots)
+        if community == self._community:
+            return
+        self._community = community
+        super().display_community_cards(community_cards, pots, level)
+
+    @staticmethod
+    def _player_cell(player, column):
+        """プレイヤーの1つの列に表示する文字列を返す。
+
+        Args:
+            player (Player): プレイヤー。
+            column (str): 列の名前。
+
+        Returns:
+            str: 表示する文字列。
+
+        """
+        if column == "PlayerName":
+            return player.name
+        if column == "Chips":
+            return str(player.chips)
+        if column == "Hand":
+            return ", ".join([str(card) for card in player.hand])
+        if column == "Bet":
+            return str(player.current_bet)
+        if column == "DB":
+            return "○" if player.is_dealer else " "
+        if player.last_action and player.last_action[-1] in ["Bet", "Raise"]:
+            return f"{player.last_action[-1]}: {player.last_bet_amount}"
+        return player.last_action[-1] if player.last_action else ""
+
+    def _format_row(self, cells):
+        """キャッシュした列幅で1行を組み立てる。
+
+        Args:
+            cells (tuple[str]): 各列のセル。
+
+        Returns:
+            str: 表の1行。
+
+        """
+        return "|" + "".join(f" {cell}{' ' * (self._widths[column] - self._display_width(cell))} |"
+                             for column, cell in zip(self._columns, cells))
+
+    def _border(self):
+        """キャッシュした列幅で罫線の行を組み立てる。
 
         """
-        self.get_message("community_cards")
-        for card in community_cards:
-            print(card, end=" ")
-        print("\n" + "-"*30)
-        self.get_message("pots", pots=pots)
-        print("\n" + "-"*30)
+        return "+" + "".join("-" * (self._widths[column] + 2) + "+" for column in self._columns)
@@ -0,0 +1,358 @@
+import argparse
+import asyncio
+import itertools
+import random
+
+from game_lobby import GameLobby
+from hand_event import HandEnded
+from hand_history import format_cards
+from table_protocol import decode_message, encode_message, state_delta
+from table_server import HumanSeat, TableServer
+
+
+class Session:
+    """1つの接続 (クライアント) の状態。
+
+    Attributes:
+        writer (asyncio.StreamWriter): 送信先。
+        name (str): プレイヤー名。
+        chips (int): テーブルに持ち込むチップ数。
+        seat (HumanSeat): 座っている席。座っていなければNone。
+        table (AsyncTable): 座っているテーブル。
+        player (Player): テーブル上のプレイヤー。最初の状態の送信時に決まる。
+        last_state (dict): 最後に送った状態。
+
+    """
+
+    def __init__(self, writer):
+        """Sessionクラスの初期化。
+
+        Args:
+            writer (asyncio.StreamWriter): 送信先。
+
+        """
+        self.writer = writer
+        self.name = None
+        self.chips = 0
+        self.seat = None
+        self.table = None
+        self.player = None
+        self.last_state = {}
+
+    def send(self, message_type, **fields):
+        """メッセージを送る。接続が閉じている場合は何もしない。
+
+        """
+        if not self.writer.is_closing():
+            self.writer.write(encode_message(message_type, **fields))
+
+
+class ProtocolServer:
+    """TableServer を TCP の JSON Lines プロトコルで公開するサーバー。
+
+    クライアントはロビーのテーブル (GameLobby.tables) を一覧し、席を予約する。1つのテーブルに
+    seats_per_table 人がそろうと、num_cpus 人の CPU を加えたテーブルを TableServer で開始する。
+    テーブルのイベントのたびに、各クライアントに席から見える状態の差分だけを送り、手番になると
+    Dealer.set_action_list が作った利用可能なアクションを送る。メッセージの形式は table_protocol を参照。
+
+    Attributes:
+        table_server (TableServer): テーブルを動かすサーバー。
+        lobby_tables (list[dict]): ロビーのテーブルの設定。
+        seats_per_table (int): テーブルを開始するのに必要なクライアントの数。
+        num_cpus (int): テーブルに加える CPU の数。
+        hands_per_table (int): 1つのテーブルでプレイするハンドの数。Noneの場合は無制限。
+        messages_sent (int): 送ったメッセージの数。
+
+    Tests:
+        [x]: test_protocol_server
+
+    """
+
+    def __init__(self, table_server=None, lobby_tables=None, seats_per_table=1, num_cpus=5, hands_per_table=None, rng=None):
+        """ProtocolServerクラスの初期化。
+
+        Args:
+            table_server (TableServer, optional): テーブルを動かすサーバー。Noneの場合は新しく作る。
+            lobby_tables (list[dict], optional): ロビーのテーブルの設定。Noneの場合は GameLobby.tables を使う。
+            seats_per_table (int, optional): テーブルを開始するのに必要なクライアントの数。
+            num_cpus (int, optional): テーブルに加える CPU の数。
+            hands_per_table (int, optional): 1つのテーブルでプレイするハンドの数。
+            rng (random.Random, optional): テーブルに渡す乱数生成器のシードを決める乱数生成器。
+
+        """
+        self.table_server = table_server if table_server is not None else TableServer()
+        self.lobby_tables = {str(table['no']): table for table in (lobby_tables if lobby_tables is not None else GameLobby.tables)}
+        self.seats_per_table = seats_per_table
+        self.num_cpus = num_cpus
+        self.hands_per_table = hands_per_table
+        self.rng = rng if rng is not None else random.Random()
+        self.messages_sent = 0
+        self._waiting = {no: [] for no in self.lobby_tables}
+        self._sessions_by_table = {}
+        self._table_numbers = itertools.count(1)
+        self._server = None
+
+    async def start(self, host="127.0.0.1", port=0):
+        """接続の受け付けを始める。
+
+        Args:
+            host (str, optional): 待ち受けるアドレス。
+            port (int, optional): 待ち受けるポート。0の場合は空いているポートを使う。
+
+        Returns:
+            int: 待ち受けているポート。
+
+        """
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        """接続の受け付けをやめ、全てのテーブルを止める。
+
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        await self.table_server.close()
+
+    async def _handle_connection(self, reader, writer):
+        """1つの接続のメッセージを順に処理する。
+
+        Args:
+            reader (asyncio.StreamReader): 受信元。
+            writer (asyncio.StreamWriter): 送信先。
+
+        """
+        session = Session(writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    self._dispatch(session, decode_message(line))
+                except (ValueError, TypeError, KeyError, RuntimeError) as error:
+                    self._send(session, "error", message=str(error))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._leave(session)
+            writer.close()
+
+    def _dispatch(self, session, message):
+        """メッセージの種類ごとの処理を行う。
+
+        Args:
+            session (Session): 送信元の接続。
+            message (dict): 受け取ったメッセージ。
+
+        Raises:
+            ValueError: 未知のメッセージや、フィールドの型が違うなど無効な内容の場合。
+
+        """
+        message_type = message["type"]
+        if message_type == "list_tables":
+            tables = [{'no': no, 'sb': table['SB'], 'bb': table['BB'], 'bet_type': table['bet_type'],
+                       'seats': self.seats_per_table, 'waiting': len(self._waiting[no])}
+                      for no, table in self.lobby_tables.items()]
+            self._send(session, "tables", tables=tables)
+        elif message_type == "sit":
+            table_no, name, chips = message["table"], message["name"], message.get("chips", 0)
+            if not isinstance(table_no, (str, int)) or isinstance(table_no, bool):
+                raise ValueError(f"Invalid table: {table_no!r}")
+            if not isinstance(name, str) or not name:
+                raise ValueError(f"Invalid name: {name!r}")
+            if not isinstance(chips, int) or isinstance(chips, bool):
+                raise ValueError(f"Invalid chips: {chips!r}")
+            self._sit(session, str(table_no), name, chips)
+        elif message_type == "act":
+            if session.seat is None:
+                raise ValueError("not seated")
+            session.seat.submit(message["action"], message.get("amount"))
+        else:
+            raise ValueError(f"unknown message type: {message_type}")
+
+    def _sit(self, session, no, name, chips):
+        """ロビーのテーブルに席を予約し、人数がそろったらテーブルを開始する。
+
+        Args:
+            session (Session): 座る接続。
+            no (str): ロビーのテーブルの番号。
+            name (str): プレイヤー名。
+            chips (int): 持ち込むチップ数。0以下の場合はBBの100倍。
+
+        Raises:
+            ValueError: 既に座っている場合や、テーブルが存在しない場合、同じ名前のプレイヤーが予約している場合。
+
+        """
+        if session.seat is not None or session in self._waiting.get(no, ()):
+            raise ValueError("already seated")
+        if no not in self.lobby_tables:
+            raise ValueError(f"unknown table: {no}")
+        # 状態はプレイヤー名で席を見分けるので、同じテーブルに同じ名前は座らせない (CPU の名前も含む)
+        if name in {waiting.name for waiting in self._waiting[no]} or name in self._cpu_names():
+            raise ValueError(f"name already taken: {name}")
+        lobby_table = self.lobby_tables[no]
+        session.name = name
+        session.chips = chips if chips > 0 else lobby_table['BB'] * 100
+        waiting = self._waiting[no]
+        waiting.append(session)
+        self._send(session, "waiting", table=no, waiting=len(waiting))
+        if len(waiting) >= self.seats_per_table:
+            self._waiting[no] = []
+            self._open_table(lobby_table, waiting)
+
+    def _open_table(self, lobby_table, sessions):
+        """予約した接続と CPU でテーブルを開始する。
+
+        Args:
+            lobby_table (dict): ロビーのテーブルの設定。
+            sessions (list[Session]): 座る接続。
+
+        """
+        table_id = f"{lobby_table['no']}-{next(self._table_numbers)}"
+        seats = []
+        for session in sessions:
+            session.seat = HumanSeat(on_prompt=lambda seat, actions, session=session: self._prompt(session, actions))
+            seats.append({'name': session.name, 'chips': session.chips, 'bot': session.seat})
+        seats.extend({'name': name, 'chips': lobby_table['BB'] * 100} for name in self._cpu_names())
+
+        self._sessions_by_table[table_id] = sessions
+        table = self.table_server.open_table(table_id, seats, lobby_table['bet_type'], lobby_table['SB'], lobby_table['BB'],
+                                             num_hands=self.hands_per_table, rng=random.Random(self.rng.getrandbits(64)),
+                                             event_sink=lambda event: self._broadcast(table_id, event),
+                                             on_close=lambda _: self._close_table(table_id))
+        for session in sessions:
+            session.table = table
+            self._send(session, "seated", table=table_id)
+
+    def _cpu_names(self):
+        """テーブルに加える CPU の名前のリストを返す。
+
+        """
+        return [f"CPU{index + 1}" for index in range(self.num_cpus)]
+
+    def _prompt(self, session, actions):
+        """手番のクライアントに、最新の状態と利用可能なアクションを送る。
+
+        Args:
+            session (Session): 手番の接続。
+            actions (list[str]): 利用可能なアクションのリスト。
+
+        """
+        if session.writer.is_closing():
+            # 切断した席はチェックかフォールドを続ける
+            asyncio.get_running_loop().call_soon(session.seat.submit, "check" if "check" in actions else "fold")
+            return
+        self._send_state(session)
+        self._send(session, "prompt", actions=actions, to_call=session.player.state_view.to_call)
+
+    def _broadcast(self, table_id, event):
+        """テーブルのイベントのたびに、各クライアントに状態の差分を送る。
+
+        Args:
+            table_id (str): テーブルの識別子。
+            event (HandEvent): イベント。
+
+        """
+        for session in self._sessions_by_table.get(table_id, ()):
+            self._send_state(session)
+            if isinstance(event, HandEnded):
+                self._send(session, "hand_end", hand=session.table.hands_played + 1)
+
+    def _send_state(self, session):
+        """席から見える状態を作り、前回送った状態との差分があれば送る。
+
+        Args:
+            session (Session): 送信先の接続。
+
+        """
+        table = session.table
+        if session.player is None:
+            session.player = next(player for player in table.players if player.bot is session.seat)
+        dealer = table.table.dealer
+        players = table.players
+        state = {
+            'names': [player.name for player in players],
+            'stacks': [player.chips for player in players],
+            'bets': [player.current_bet for player in players],
+            'folded': [player.is_folded for player in players],
+            'button': next((index for index, player in enumerate(players) if player.is_dealer), None),
+            'street': dealer.street,
+            'board': format_cards(dealer.community_cards),
+            'pot': dealer.pot_ledger.total,
+            'hand': format_cards(session.player.hand),
+        }
+        delta = state_delta(session.last_state, state)
+        if delta:
+            session.last_state = state
+            self._send(session, "state", delta=delta)
+
+    def _send(self, session, message_type, **fields):
+        """メッセージを送り、送った数を数える。
+
+        """
+        session.send(message_type, **fields)
+        self.messages_sent += 1
+
+    def _leave(self, session):
+        """切断した接続を、予約中のテーブルから外す。座っている席は手番で自動的にチェックかフォールドする。
+
+        Args:
+            session (Session): 切断した接続。
+
+        """
+        for waiting in self._waiting.values():
+            if session in waiting:
+                waiting.remove(session)
+        if session.seat is not None and session.seat.is_waiting:
+            actions = session.seat.available_actions
+            session.seat.submit("check" if "check" in actions else "fold")
+
+    def _close_table(self, table_id):
+        """テーブルの終了をクライアントに知らせる。
+
+        Args:
+            table_id (str): テーブルの識別子。
+
+        """
+        for session in self._sessions_by_table.pop(table_id, ()):
+            self._send(session, "table_closed")
+            session.seat = None
+            session.table = None
+            session.player = None
+            session.last_state = {}
+
+
+async def serve(host, port, **options):
+    """ProtocolServer を起動し、止められるまで動かす。
+
+    Args:
+        host (str): 待ち受けるアドレス。
+        port (int): 待ち受けるポート。
+        **options: ProtocolServer に渡す引数。
+
+    """
+    server = ProtocolServer(**options)
+    port = await server.start(host, port)
+    print(f"listening on {host}:{port}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="テーブルサーバーを TCP で公開する")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--seats-per-table", type=int, default=1)
+    parser.add_argument("--cpus", type=int, default=5)
+    parser.add_argument("--hands-per-table", type=int, default=None)
+    arguments = parser.parse_args()
+    try:
+        asyncio.run(serve(arguments.host, arguments.port, seats_per_table=arguments.seats_per_table, num_cpus=arguments.cpus,
+                          hands_per_table=arguments.hands_per_table))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,296 @@
+from abc import ABC, abstractmethod
+import json
+import sys
+import time
+
+from table_protocol import encode_message
+
+
+# 表示の詳細さのレベル。値が大きいほど重要で、出力先の level 以上のものだけを出力する
+ACTION = 10  # 1アクションごとの表示
+STATE = 20  # ベットラウンドごとのテーブルの状態
+INFO = 30  # ロビーやゲームの進行のメッセージ
+PROMPT = 40  # 入力を求めるメッセージ。出力先はバッファを書き出してから表示する
+
+LEVELS = {"action": ACTION, "state": STATE, "info": INFO, "prompt": PROMPT}
+LEVEL_NAMES = {level: name for name, level in LEVELS.items()}
+
+
+def level_from_name(name):
+    """レベルの名前から値を返す。
+
+    Args:
+        name (str): 'action'、'state'、'info'、'prompt' のいずれか (大文字小文字は区別しない)。
+
+    Returns:
+        int: レベルの値。
+
+    Raises:
+        ValueError: 未知の名前の場合。
+
+    """
+    try:
+        return LEVELS[name.lower()]
+    except KeyError:
+        raise ValueError(f"Unknown level: {name}") from None
+
+
+class OutputSink(ABC):
+    """MessageHandler の出力先の基底クラス。
+
+    level 未満のメッセージは捨てる。呼び出し側は enabled で先に確認することで、
+    出力しないメッセージの組み立てを省略できる。
+
+    Attributes:
+        level (int): 出力する最低のレベル。
+
+    Tests:
+        [x]: test_output_sink_levels
+
+    """
+
+    def __init__(self, level=ACTION):
+        """OutputSinkクラスの初期化。
+
+        Args:
+            level (int, optional): 出力する最低のレベル。
+
+        """
+        self.level = level
+
+    def enabled(self, level):
+        """指定したレベルのメッセージを出力するかを返す。
+
+        """
+        return level >= self.level
+
+    def emit(self, text, level=INFO, key=None):
+        """レベルが level 以上であればメッセージを出力する。
+
+        Args:
+            text (str | LazyMessage): メッセージ。LazyMessage は書き込むときに str() で組み立てる。
+            level (int, optional): メッセージのレベル。
+            key (str, optional): メッセージの種類 (MessageHandler のキーなど)。
+
+        """
+        if level >= self.level:
+            self.write(text, level, key)
+
+    @abstractmethod
+    def write(self, text, level, key):
+        """メッセージを出力する。サブクラスで実装する。
+
+        """
+
+    def flush(self):
+        """バッファしているメッセージを書き出す。
+
+        """
+
+    def close(self):
+        """バッファを書き出して、出力先を閉じる。
+
+        """
+        self.flush()
+
+
+class NullSink(OutputSink):
+    """何も出力しない出力先。
+
+    """
+
+    def __init__(self):
+        """NullSinkクラスの初期化。全てのレベルを捨てる。
+
+        """
+        super().__init__(level=PROMPT + 1)
+
+    def write(self, text, level, key):
+        """何もしない。
+
+        """
+
+
+class StdoutSink(OutputSink):
+    """標準出力にまとめて書き込む出力先。
+
+    メッセージをバッファに貯め、batch_size 件たまったとき、PROMPT のメッセージを受け取ったとき、
+    flush を呼んだときにまとめて書き込む。
+
+    Attributes:
+        stream (TextIO): 書き込み先。
+        batch_size (int): まとめて書き込む件数。1の場合は毎回書き込む。
+
+    """
+
+    def __init__(self, level=ACTION, stream=None, batch_size=64):
+        """StdoutSinkクラスの初期化。
+
+        Args:
+            level (int, optional): 出力する最低のレベル。
+            stream (TextIO, optional): 書き込み先。Noneの場合は書き込む時点の sys.stdout。
+            batch_size (int, optional): まとめて書き込む件数。
+
+        """
+        super().__init__(level)
+        self.stream = stream
+        self.batch_size = batch_size
+        self._buffer = []
+
+    def write(self, text, level, key):
+        """メッセージをバッファに追加し、必要であれば書き込む。LazyMessage は書き込むときに組み立てる。
+
+        """
+        self._buffer.append(text)
+        if level >= PROMPT or len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """バッファのメッセージを書き込む。
+
+        """
+        if not self._buffer:
+            return
+        stream = self.stream if self.stream is not None else sys.stdout
+        stream.write("\n".join(map(str, self._buffer)) + "\n")
+        stream.flush()
+        self._buffer = []
+
+
+class MemorySink(OutputSink):
+    """メッセージをメモリに記録する出力先。テストで表示内容を確認するために使う。
+
+    Attributes:
+        records (list[tuple[int, str, str]]): (レベル, キー, メッセージ) の記録。
+
+    """
+
+    def __init__(self, level=ACTION):
+        """MemorySinkクラスの初期化。
+
+        Args:
+            level (int, optional): 出力する最低のレベル。
+
+        """
+        super().__init__(level)
+        self.records = []
+
+    @property
+    def texts(self):
+        """記録したメッセージを返す。
+
+        """
+        return [text for _, _, text in self.records]
+
+    def write(self, text, level, key):
+        """メッセージを記録する。
+
+        """
+        self.records.append((level, key, str(text)))
+
+
+class JsonLogSink(OutputSink):
+    """メッセージを1行1件の JSON でファイルに追記する出力先。
+
+    Attributes:
+        file (TextIO): 書き込み先のファイル。
+
+    """
+
+    def __init__(self, path, level=ACTION):
+        """ログファイルを追記モードで開く。
+
+        Args:
+            path (str): ログファイルのパス。
+            level (int, optional): 出力する最低のレベル。
+
+        """
+        super().__init__(level)
+        self.file = open(path, "a", encoding="utf-8")
+
+    def write(self, text, level, key):
+        """メッセージを時刻、レベル、キーとともに書き込む。
+
+        """
+        record = {"time": time.time(), "level": LEVEL_NAMES.get(level, level), "key": key, "text": str(text)}
+        self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def flush(self):
+        """ファイルのバッファを書き出す。
+
+        """
+        self.file.flush()
+
+    def close(self):
+        """ファイルを閉じる。
+
+        """
+        if not self.file.closed:
+            self.file.close()
+
+
+class ConnectionSink(OutputSink):
+    """メッセージを1つの接続に table_protocol の "message" として送る出力先。
+
+    Attributes:
+        writer (asyncio.StreamWriter): 送信先。
+
+    """
+
+    def __init__(self, writer, level=INFO):
+        """ConnectionSinkクラスの初期化。
+
+        Args:
+            writer (asyncio.StreamWriter): 送信先。
+            level (int, optional): 出力する最低のレベル。
+
+        """
+        super().__init__(level)
+        self.writer = writer
+
+    def write(self, text, level, key):
+        """メッセージを送る。接続が閉じている場合は何もしない。
+
+        """
+        if not self.writer.is_closing():
+            self.writer.write(encode_message("message", level=LEVEL_NAMES.get(level, level), key=key, text=str(text)))
+
+
+class MultiSink(OutputSink):
+    """複数の出力先に同じメッセージを出力する出力先。
+
+    Attributes:
+        sinks (list[OutputSink]): 出力先のリスト。
+
+    """
+
+    def __init__(self, sinks):
+        """MultiSinkクラスの初期化。
+
+        Args:
+            sinks (list[OutputSink]): 出力先のリスト。
+
+        """
+        super().__init__(min(sink.level for sink in sinks))
+        self.sinks = sinks
+
+    def write(self, text, level, key):
+        """各出力先に出力する。
+
+        """
+        for sink in self.sinks:
+            sink.emit(text, level, key)
+
+    def flush(self):
+        """各出力先のバッファを書き出す。
+
+        """
+        for sink in self.sinks:
+            sink.flush()
+
+    def close(self):
+        """各出力先を閉じる。
+
+        """
+        for sink in self.sinks:
+            sink.close()
@@ -1,4 +1,4 @@
-import random
+from bot import RandomBot
 
 
 class Player:
@@ -19,13 +19,19 @@ class Player:
         is_all_in (bool): オール・インしているかのフラグ。
         hand_category (HandCategory): プレイヤーが所持している手のカテゴリ。
         hand_rank (list[int]): プレイヤーが所持している手のランク。
+        hand_score (int): プレイヤーが所持している手の強さを表すスコア。
+        action_callback (Callable, optional): アクションを決める関数。指定時は入力やランダム選択の代わりに使う。
+        bet_amount_callback (Callable, optional): ベット額を決める関数。指定時は入力やランダム選択の代わりに使う。
+        bot (Bot): CPUの意思決定を行うボット。CPUでない場合はNone。
+        state_view (GameStateView): ボットに渡すゲームの状態。席についたときに設定される。
 
     Tests:
         [ ]: test_player
 
     """
 
-    def __init__(self, name, chips, input_handler, is_cpu=False):
+    def __init__(self, name, chips, input_handler, is_cpu=False, action_callback=None, bet_amount_callback=None, bot=None,
+                 rng=None):
         """Playerクラスの初期化。
 
         Args:
@@ -33,6 +39,10 @@ class Player:
             chips (int): 初期チップ数。
             input_handler (InputHandler): 入力クラス。
             is_cpu (bool, optical): CPUであるかどうか。
+            action_callback (Callable[[Player, list[str]], str], optional): アクションを決める関数。
+            bet_amount_callback (Callable[[Player, int, int], int], optional): ベット額を決める関数。
+            bot (Bot, optional): CPUの意思決定を行うボット。CPUでNoneの場合は RandomBot を使う。
+            rng (random.Random, optional): 既定の RandomBot に渡す乱数生成器。
 
         """
         self.name = name
@@ -48,7 +58,13 @@ class Player:
         self.is_all_in = False
         self.hand_category = None
         self.hand_rank = None
+        self.hand_score = None
         self.rebuy_count = 0
+        self.action_callback = action_callback
+        self.bet_amount_callback = bet_amount_callback
+        self.bot = bot if bot is not None or not is_cpu else RandomBot(rng)
+        self.state_view = None
+        self.pending_bet_amount = None
 
     def bet(self, amount):
         """プレイヤーがベットするメソッド。
@@ -85,14 +101,18 @@ class Player:
 
         """
         action = ""
-        if self.is_cpu:
+        if self.action_callback is not None:
+            action = self.action_callback(self, available_actions)
+        elif self.is_cpu:
             action = self._cpu_select_action(available_actions)
         else:
             action = self._player_select_action(available_actions)
         return action
 
     def _cpu_select_action(self, available_actions):
-        """CPUとしてのアクションを選択する。
+        """CPUとしてのアクションをボットに選択させる。
+
+        ボットがベット額も決めた場合は、select_bet_amount で使うために保持する。
 
         Args:
             available_actions (list): 利用可能なアクションのリスト。
@@ -101,7 +121,8 @@ class Player:
             str: 選択されたアクション。
 
         """
-        return random.choice(available_actions)
+        action, self.pending_bet_amount = self.bot.decide(self.state_view, available_actions)
+        return action
 
     def _player_select_action(self, available_actions):
         """プレイヤーとしてのアクションを選択する。
@@ -126,19 +147,28 @@ class Player:
             int: 選択されたベットまたはレイズの額。
 
         """
+        if self.bet_amount_callback is not None:
+            return self.bet_amount_callback(self, min_amount, max_amount)
         return self._cpu_select_bet_amount(min_amount, max_amount) if self.is_cpu else self._player_select_bet_amount(min_amount, max_amount)
 
     def _cpu_select_bet_amount(self, min_amount, max_amount):
         """CPUとしてのベットまたはレイズの額を選択する。
 
+        アクションと同時にボットが決めた額があればそれを最小・最大額の範囲に収めて使い、
+        なければボットに選択させる。
+
         Args:
             min_amount (int): 最小ベット額。
+            max_amount (int): 最大ベット額。
 
         Returns:
             int: 選択されたベットまたはレイズの額。
 
         """
-        return random.randint(min_amount, max_amount)
+        amount, self.pending_bet_amount = self.pending_bet_amount, None
+        if amount is None:
+            amount = self.bot.select_bet_amount(self.state_view, min_amount, max_amount)
+        return max(min_amount, min(amount, max_amount))
 
     def _player_select_bet_amount(self, min_amount, max_amount):
         """プレイヤーとしてのベットまたはレイズの額を選択する。
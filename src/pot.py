@@ -4,8 +4,9 @@ class Pot:
 
     Attributes:
         total (int): ポットにあるチップの合計。
-        contributions (dict[str, int]): プレイヤーごとのチップの寄与額。
+        contributions (dict[Player, int]): プレイヤーごとのチップの寄与額。
         max_contribution (int): このポットに対する最大寄与額。
+        eligible_players (list[Player]): このポットを獲得する資格があるプレイヤー。PotLedger が設定する。
 
     Tests:
         [ ]: test_pot
@@ -19,12 +20,13 @@ class Pot:
         self.total = 0
         self.contributions = {}
         self.max_contribution = 0
+        self.eligible_players = None
 
     def add_contribution(self, player, amount):
         """プレイヤーからの指定された量の寄与を追加する。
 
         Args:
-            player (str): プレイヤーの名前。
+            player (Player): プレイヤー。
             amount (int): 寄与する額。
 
         """
@@ -36,7 +38,7 @@ class Pot:
         """指定されたプレイヤーの寄与額を返す。
 
         Args:
-            player (str): プレイヤーの名前。
+            player (Player): プレイヤー。
 
         Returns:
             int: プレイヤーの寄与額。
@@ -47,8 +49,106 @@ class Pot:
     def get_eligible_players(self):
         """このポットを獲得する資格があるプレイヤーのリストを返す。
 
+        PotLedger が作ったポットであれば、その時点でフォールドしていない寄与者を返す。
+        それ以外は最大寄与額を出したプレイヤーを返す。
+
         Returns:
             list[Player]: 資格があるプレイヤーのリスト。
 
         """
+        if self.eligible_players is not None:
+            return self.eligible_players
         return [player for player, amount in self.contributions.items() if amount >= self.max_contribution]
+
+
+class PotLedger:
+    """1ハンドの間にプレイヤーが出したチップを記録し、メインポットとサイドポットを求めるクラス。
+
+    チップが出されるたびにプレイヤーごとの累計額を更新するだけなので、ベットのたびの処理は O(1)。
+    ポットは、フォールドしていないプレイヤーの累計額の段階ごとに求める。累計額を一度ソートしたあと、
+    段階を小さい順にたどりながら、その段階に届いていないプレイヤーを1度ずつ取り除き、残りの人数と
+    段階の差からポットの額を求める。オール・インが何人いても正しいサイドポットになり、
+    誰にもコールされなかった額は出したプレイヤーだけが資格を持つポットとして返る。
+
+    Attributes:
+        contributions (dict[Player, int]): このハンドでプレイヤーが出したチップの累計額。
+        total (int): このハンドで出されたチップの合計。
+
+    Tests:
+        [x]: test_pot_ledger
+
+    """
+
+    def __init__(self):
+        """PotLedgerクラスの初期化。
+
+        """
+        self.contributions = {}
+        self.total = 0
+
+    def add(self, player, amount):
+        """プレイヤーが出したチップを記録する。
+
+        Args:
+            player (Player): チップを出したプレイヤー。
+            amount (int): 出した額。
+
+        """
+        if amount > 0:
+            self.contributions[player] = self.contributions.get(player, 0) + amount
+            self.total += amount
+
+    def reset(self):
+        """次のハンドのために記録を消す。
+
+        """
+        self.contributions.clear()
+        self.total = 0
+
+    def pots(self):
+        """メインポットから順に、ポットと獲得資格を求める。
+
+        フォールドしたプレイヤーのチップもポットに含まれるが、獲得資格は持たない。
+        求めたポットは合計額と獲得資格だけを持ち、プレイヤーごとの寄与額 (contributions) は持たない。
+        獲得資格のあるプレイヤーは、累計額の小さい順に並ぶ。
+
+        Returns:
+            list[Pot]: メインポット、サイドポットの順のポット。チップが出されていない場合は空のメインポット1つ。
+
+        """
+        # 累計額の小さい順。同じ額のプレイヤーは記録した順のまま
+        entries = sorted(self.contributions.items(), key=lambda item: item[1])
+        live = [player for player, _ in entries if not player.is_folded]
+        live_amounts = [self.contributions[player] for player in live]
+        levels = list(dict.fromkeys(live_amounts))
+        if not levels:
+            pot = Pot()
+            pot.total = self.total
+            pot.eligible_players = []
+            return [pot]
+
+        pots = []
+        previous_level = 0
+        collected = 0
+        entry_index = 0
+        live_index = 0
+        for level in levels[:-1]:
+            pot = Pot()
+            # この段階までに出し切ったプレイヤーは残りの分だけ、まだ出しているプレイヤーは段階の差の分だけ入れる
+            while entries[entry_index][1] <= level:
+                pot.total += entries[entry_index][1] - previous_level
+                entry_index += 1
+            pot.total += (len(entries) - entry_index) * (level - previous_level)
+            pot.eligible_players = live[live_index:]
+            while live_amounts[live_index] <= level:
+                live_index += 1
+            collected += pot.total
+            pots.append(pot)
+            previous_level = level
+
+        # 最後のポットには、フォールドしたプレイヤーが出した上限を超える分も含める
+        pot = Pot()
+        pot.total = self.total - collected
+        pot.eligible_players = live[live_index:]
+        pots.append(pot)
+        return pots
@@ -0,0 +1,234 @@
+from collections import OrderedDict
+import json
+import os
+import zlib
+
+from data_manager import DataManager
+
+
+class ShardedDataManager(DataManager):
+    """ユーザーのデータをユーザー名のハッシュで複数のファイル (シャード) に分けて管理するクラス。
+
+    DataManager と同じ API を持つ。シャードは最初にアクセスしたときに読み込み、読み込んだシャードは
+    LRU で max_resident_shards 個までに制限する。追い出すシャードに未保存の変更があれば保存する。
+    そのため起動時間と使用メモリは登録ユーザー数ではなく、アクセスしたシャードの数で決まる。
+
+    シャードの数はディレクトリの meta.json に保存し、既存のディレクトリを開く場合はその値を使う。
+
+    Attributes:
+        data_file_path (str): シャードのファイルを置くディレクトリのパス。
+        num_shards (int): シャードの数。
+        max_resident_shards (int): メモリに保持するシャードの最大数。
+
+    Tests:
+        [x]: test_sharded_data_manager
+
+    """
+
+    META_FILE_NAME = "meta.json"
+
+    def __init__(self, directory, num_shards=256, max_resident_shards=16, write_behind=False, max_dirty=100, flush_interval=5.0):
+        """シャードのディレクトリを開く。シャードはまだ読み込まない。
+
+        Args:
+            directory (str): シャードのファイルを置くディレクトリのパス。
+            num_shards (int, optional): 新しく作成する場合のシャードの数。
+            max_resident_shards (int, optional): メモリに保持するシャードの最大数。
+            write_behind (bool, optional): 各シャードの書き込みを遅延させるか。
+            max_dirty (int, optional): 各シャードでまとめて書き込む変更したキーの数。
+            flush_interval (float, optional): 各シャードでまとめて書き込む間隔 (秒)。
+
+        """
+        self.data_file_path = directory
+        self.num_shards = num_shards
+        self.max_resident_shards = max_resident_shards
+        self.write_behind = write_behind
+        self.max_dirty = max_dirty
+        self.flush_interval = flush_interval
+        self._shards = OrderedDict()
+        self._merged_data = None
+        self.load_data()
+
+    def load_data(self):
+        """ディレクトリを作成し、シャードの数を読み込む。新しいディレクトリの場合は保存する。
+
+        """
+        os.makedirs(self.data_file_path, exist_ok=True)
+        meta_path = os.path.join(self.data_file_path, self.META_FILE_NAME)
+        if os.path.exists(meta_path):
+            with open(meta_path, 'r') as file:
+                self.num_shards = json.load(file)["num_shards"]
+        else:
+            with open(meta_path, 'w') as file:
+                json.dump({"num_shards": self.num_shards}, file)
+
+    def save_data(self):
+        """読み込んでいる全てのシャードを保存する。
+
+        """
+        for shard in self._shards.values():
+            shard.save_data()
+
+    def flush(self):
+        """読み込んでいるシャードの遅延させている変更を保存する。
+
+        """
+        for shard in self._shards.values():
+            shard.flush()
+
+    def tick(self):
+        """読み込んでいるシャードごとに、間隔が経過していれば遅延させている変更を保存する。
+
+        """
+        for shard in self._shards.values():
+            shard.tick()
+
+    def close(self):
+        """遅延させている変更を保存し、読み込んだシャードを解放する。
+
+        """
+        self.flush()
+        self._shards.clear()
+
+    @property
+    def data(self):
+        """全ユーザーのデータを辞書で返す。
+
+        初回は読み込んでいるシャードのメモリ上の (未保存の変更を含む) データと、それ以外のシャードの
+        ファイルを読んでまとめる。まとめた結果は更新されるまで保持し、次からはその写しを返す。
+        ファイルから読んだシャードは LRU に加えない。
+
+        Returns:
+            dict[str, int]: ユーザー名とチップ数。
+
+        """
+        if self._merged_data is None:
+            merged_data = {}
+            for index in range(self.num_shards):
+                shard = self._shards.get(index)
+                if shard is not None:
+                    merged_data.update(shard.data)
+                    continue
+                path = self._shard_path(index)
+                if os.path.exists(path):
+                    with open(path, 'r') as file:
+                        merged_data.update(json.load(file))
+            self._merged_data = merged_data
+        return dict(self._merged_data)
+
+    @property
+    def resident_shards(self):
+        """メモリに読み込んでいるシャードの数を返す。
+
+        """
+        return len(self._shards)
+
+    def shard_index(self, user_name):
+        """ユーザー名からシャードの番号を求める。
+
+        プロセスごとに値が変わる hash() ではなく CRC32 を使う。
+
+        Args:
+            user_name (str): ユーザー名。
+
+        Returns:
+            int: シャードの番号。
+
+        """
+        return zlib.crc32(user_name.encode("utf-8")) % self.num_shards
+
+    def get_user_data(self, user_name):
+        """指定されたデータを取得する。
+
+        Args:
+            user_name (str): データ名。
+
+        Returns:
+            obj: 取得したデータ。
+
+        """
+        return self._shard(user_name).get_user_data(user_name)
+
+    def update_user_data(self, user_name, data):
+        """指定されたデータを更新する。
+
+        Args:
+            user_name (str): データ名。
+            data (obj): 更新するデータ。
+
+        """
+        self._merged_data = None
+        self._shard(user_name).update_user_data(user_name, data)
+
+    def adjust_user_data(self, user_name, amount):
+        """指定されたユーザーのチップ数を増減する。
+
+        Args:
+            user_name (str): ユーザー名。
+            amount (int): 増減するチップ数。減らす場合は負の値。
+
+        Returns:
+            int: 増減後のチップ数。
+
+        Raises:
+            KeyError: ユーザーが存在しない場合。
+
+        """
+        self._merged_data = None
+        return self._shard(user_name).adjust_user_data(user_name, amount)
+
+    def add_new_user(self, user_name, initial_data):
+        """新しいデータ名を追加し、初期データを設定する。
+
+        Args:
+            user_name (str): データ名。
+            initial_data (obj): 初期データ。
+
+        """
+        self._merged_data = None
+        self._shard(user_name).add_new_user(user_name, initial_data)
+
+    def delete_user(self, user_name):
+        """指定されたデータ名を削除する。
+
+        Args:
+            user_name (str): データ名。
+
+        """
+        self._merged_data = None
+        self._shard(user_name).delete_user(user_name)
+
+    def _shard(self, user_name):
+        """ユーザーが属するシャードを返す。読み込んでいなければ読み込み、必要なら最も古いシャードを追い出す。
+
+        Args:
+            user_name (str): ユーザー名。
+
+        Returns:
+            DataManager: シャード。
+
+        """
+        index = self.shard_index(user_name)
+        shard = self._shards.get(index)
+        if shard is not None:
+            self._shards.move_to_end(index)
+            return shard
+
+        shard = DataManager(self._shard_path(index), write_behind=self.write_behind, max_dirty=self.max_dirty, flush_interval=self.flush_interval)
+        self._shards[index] = shard
+        if len(self._shards) > self.max_resident_shards:
+            _, evicted = self._shards.popitem(last=False)
+            evicted.close()
+        return shard
+
+    def _shard_path(self, index):
+        """シャードのファイルのパスを返す。
+
+        Args:
+            index (int): シャードの番号。
+
+        Returns:
+            str: シャードのファイルのパス。
+
+        """
+        return os.path.join(self.data_file_path, f"shard-{index:04d}.json")
@@ -0,0 +1,103 @@
+"""テーブルサーバーとクライアントの間のプロトコル。
+
+1行に1つの JSON オブジェクトを送る (JSON Lines)。各メッセージは "type" を持つ。
+
+クライアント → サーバー:
+    {"type": "list_tables"}
+    {"type": "sit", "table": "1", "name": "Alice", "chips": 200}
+    {"type": "act", "action": "raise", "amount": 10}
+
+サーバー → クライアント:
+    {"type": "tables", "tables": [{"no": "1", "sb": 1, "bb": 2, "bet_type": "no", "seats": 6, "waiting": 2}, ...]}
+    {"type": "waiting", "table": "1", "waiting": 2}
+    {"type": "seated", "table": "1-3"}
+    {"type": "state", "delta": {...}}
+    {"type": "prompt", "actions": ["fold", "call", "raise"], "to_call": 2}
+    {"type": "hand_end", "hand": 12}
+    {"type": "table_closed"}
+    {"type": "error", "message": "..."}
+
+状態 (state) は席から見えるテーブルの状態の辞書で、前回送った状態との差分 (state_delta) だけを送る。
+"""
+
+import json
+
+
+def encode_message(message_type, **fields):
+    """メッセージを1行のバイト列にする。
+
+    Args:
+        message_type (str): メッセージの種類。
+        **fields: メッセージのフィールド。
+
+    Returns:
+        bytes: 改行で終わる JSON のバイト列。
+
+    """
+    fields["type"] = message_type
+    return json.dumps(fields, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def decode_message(line):
+    """1行のバイト列からメッセージを復元する。
+
+    Args:
+        line (bytes): JSON の1行。
+
+    Returns:
+        dict: メッセージ。
+
+    Raises:
+        ValueError: JSON のオブジェクトでないか、"type" がない場合。
+
+    """
+    message = json.loads(line)
+    if not isinstance(message, dict) or "type" not in message:
+        raise ValueError("a message must be an object with a type")
+    return message
+
+
+def state_delta(previous, current):
+    """前回送った状態から変わった部分だけを返す。
+
+    値が変わったキーだけを含める。同じ長さのリストは、変わった位置だけを {"位置": 値} で表す。
+
+    Args:
+        previous (dict): 前回送った状態。
+        current (dict): 現在の状態。
+
+    Returns:
+        dict: 差分。変わっていなければ空の辞書。
+
+    """
+    delta = {}
+    for key, value in current.items():
+        old = previous.get(key)
+        if old == value:
+            continue
+        if isinstance(value, list) and isinstance(old, list) and len(old) == len(value):
+            delta[key] = {str(index): item for index, (old_item, item) in enumerate(zip(old, value)) if old_item != item}
+        else:
+            delta[key] = value
+    return delta
+
+
+def apply_delta(state, delta):
+    """state_delta の差分を状態に適用する。
+
+    Args:
+        state (dict): クライアントが持つ状態。この辞書を書き換える。
+        delta (dict): 差分。
+
+    Returns:
+        dict: 適用後の状態。
+
+    """
+    for key, value in delta.items():
+        if isinstance(value, dict) and isinstance(state.get(key), list):
+            items = state[key]
+            for index, item in value.items():
+                items[int(index)] = item
+        else:
+            state[key] = value
+    return state
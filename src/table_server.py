@@ -0,0 +1,270 @@
+import asyncio
+
+from bot import Bot
+from headless_game import HeadlessGame
+
+
+class HumanSeat(Bot):
+    """人間のプレイヤーの席で、アクションを非同期に受け取るボット。
+
+    手番になると wait_decision がアクションの入力を待ち、submit で渡されたアクションとベット額を
+    decide で返す。入力がないまま制限時間を過ぎた場合は、チェックできればチェック、できなければフォールドする。
+
+    Attributes:
+        available_actions (list[str]): 入力待ちのときに利用可能なアクション。入力待ちでなければ空。
+        on_prompt (Callable[[HumanSeat, list[str]], None]): 手番になったときに呼ぶ関数。
+        timeouts (int): 制限時間を過ぎた回数。
+
+    Tests:
+        [x]: test_human_seat
+
+    """
+
+    def __init__(self, on_prompt=None):
+        """HumanSeatクラスの初期化。
+
+        Args:
+            on_prompt (Callable[[HumanSeat, list[str]], None], optional): 手番になったときに呼ぶ関数。
+                クライアントへのアクションの要求に使う。
+
+        """
+        self.available_actions = []
+        self.on_prompt = on_prompt
+        self.timeouts = 0
+        self._future = None
+        self._decision = None
+
+    @property
+    def is_waiting(self):
+        """アクションの入力待ちかを返す。
+
+        """
+        return self._future is not None and not self._future.done()
+
+    def submit(self, action, amount=None):
+        """入力待ちの手番にアクションを渡す。
+
+        Args:
+            action (str): アクション。
+            amount (int, optional): bet/raise の場合のベット額。最小・最大額の範囲に収めて使う。
+
+        Raises:
+            RuntimeError: 入力待ちでない場合。
+            ValueError: 利用可能なアクションでない場合や、ベット額が None でも整数でもない場合。
+
+        """
+        if not self.is_waiting:
+            raise RuntimeError("not waiting for an action")
+        if action not in self.available_actions:
+            raise ValueError(f"Invalid action: {action}")
+        # クライアントから届いた値をそのままテーブルに渡さない (bool は int のサブクラスなので除く)
+        if amount is not None and (not isinstance(amount, int) or isinstance(amount, bool)):
+            raise ValueError(f"Invalid amount: {amount!r}")
+        self._future.set_result((action, amount))
+
+    async def wait_decision(self, available_actions, timeout):
+        """アクションが渡されるまで待つ。
+
+        Args:
+            available_actions (list[str]): 利用可能なアクションのリスト。
+            timeout (float): 制限時間 (秒)。Noneの場合は無制限。
+
+        Returns:
+            tuple[str, int]: アクションとベット額。
+
+        """
+        self._future = asyncio.get_running_loop().create_future()
+        self.available_actions = available_actions
+        if self.on_prompt is not None:
+            self.on_prompt(self, available_actions)
+        try:
+            self._decision = await asyncio.wait_for(self._future, timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            self._decision = ("check" if "check" in available_actions else "fold", None)
+        finally:
+            self._future = None
+            self.available_actions = []
+        return self._decision
+
+    def decide(self, view, available_actions):
+        """wait_decision で受け取ったアクションとベット額を返す。
+
+        """
+        return self._decision
+
+
+class AsyncTable(HeadlessGame):
+    """1つのイベントループの中で他のテーブルと並行して進むテーブル。
+
+    Game.hand_steps でハンドを1アクションずつ進め、HumanSeat の席では入力を await で待ち、
+    ボットの席では1アクションごとに他のテーブルに処理を譲る。入力待ちのテーブルはスレッドも
+    プロセスも占有しないので、1プロセスで数百のテーブルを動かせる。
+
+    Attributes:
+        table_id (str): テーブルの識別子。
+        decision_timeout (float): 人間のプレイヤーの1アクションの制限時間 (秒)。
+
+    Tests:
+        [x]: test_table_server_runs_tables_concurrently
+
+    """
+
+    def __init__(self, table_id, seats, bet_type, sb, bb, decision_timeout=30.0, rebuy=True, rng=None, event_sink=None):
+        """AsyncTableクラスの初期化。
+
+        seats の形式は HeadlessGame と同じ。人間のプレイヤーの席は 'bot' に HumanSeat を指定する。
+
+        Args:
+            table_id (str): テーブルの識別子。
+            seats (list[dict]): 席ごとの設定。
+            bet_type (str): ベットタイプ。
+            sb (int): SBの額。
+            bb (int): BBの額。
+            decision_timeout (float, optional): 人間のプレイヤーの1アクションの制限時間 (秒)。
+            rebuy (bool, optional): チップが0になった席を初期チップでリバイさせるか。
+            rng (random.Random, optional): 乱数生成器。
+            event_sink (Callable[[HandEvent], None], optional): ハンドのイベントを受け取る関数。
+
+        """
+        super().__init__(seats, bet_type, sb, bb, rebuy=rebuy, rng=rng, event_sink=event_sink)
+        self.table_id = table_id
+        self.decision_timeout = decision_timeout
+
+    async def play_hand_async(self, seed=None):
+        """1ハンドをプレイする。手番のたびに、入力を待つか他のテーブルに処理を譲る。
+
+        Args:
+            seed (int, optional): デッキのシード。
+
+        Returns:
+            HandRecord: プレイしたハンドの記録。
+
+        """
+        steps = self.hand_steps(seed)
+        try:
+            player, actions = next(steps)
+            while True:
+                if isinstance(player.bot, HumanSeat):
+                    await player.bot.wait_decision(actions, self.decision_timeout)
+                else:
+                    await asyncio.sleep(0)
+                player, actions = steps.send(player.select_action(actions))
+        except StopIteration as stop:
+            return stop.value
+
+    async def run_async(self, num_hands=None, on_hand=None):
+        """ハンドを連続でプレイする。
+
+        Args:
+            num_hands (int, optional): プレイするハンドの数。Noneの場合はプレイヤーが1人以下になるか、キャンセルされるまで続ける。
+            on_hand (Callable[[AsyncTable, HandRecord], None], optional): ハンドごとに記録を受け取る関数。
+
+        Returns:
+            list[Player]: 終了時に席についているプレイヤーのリスト。
+
+        """
+        self.pre_process()
+        while num_hands is None or self.hands_played < num_hands:
+            if len(self.players) < 2:
+                break
+
+            record = await self.play_hand_async()
+            self.hands_played += 1
+            if on_hand is not None:
+                on_hand(self, record)
+
+            self.finish_hand()
+
+        return self.players
+
+
+class TableServer:
+    """多数の AsyncTable を1つのイベントループで並行に動かすサーバー。
+
+    Attributes:
+        tables (dict[str, AsyncTable]): テーブルの識別子ごとのテーブル。
+        decision_timeout (float): 人間のプレイヤーの1アクションの制限時間 (秒)。
+
+    Tests:
+        [x]: test_table_server_runs_tables_concurrently
+
+    """
+
+    def __init__(self, decision_timeout=30.0):
+        """TableServerクラスの初期化。
+
+        Args:
+            decision_timeout (float, optional): 人間のプレイヤーの1アクションの制限時間 (秒)。
+
+        """
+        self.tables = {}
+        self.decision_timeout = decision_timeout
+        self._tasks = {}
+
+    def open_table(self, table_id, seats, bet_type, sb, bb, num_hands=None, rebuy=True, rng=None, event_sink=None, on_hand=None,
+                   on_close=None):
+        """テーブルを作成し、イベントループ上で進行を始める。実行中のイベントループの中で呼ぶ。
+
+        Args:
+            table_id (str): テーブルの識別子。
+            seats (list[dict]): 席ごとの設定。
+            bet_type (str): ベットタイプ。
+            sb (int): SBの額。
+            bb (int): BBの額。
+            num_hands (int, optional): プレイするハンドの数。Noneの場合は無制限。
+            rebuy (bool, optional): チップが0になった席を初期チップでリバイさせるか。
+            rng (random.Random, optional): 乱数生成器。
+            event_sink (Callable[[HandEvent], None], optional): ハンドのイベントを受け取る関数。
+            on_hand (Callable[[AsyncTable, HandRecord], None], optional): ハンドごとに記録を受け取る関数。
+            on_close (Callable[[AsyncTable], None], optional): テーブルの進行が終わったときに呼ぶ関数。
+
+        Returns:
+            AsyncTable: 作成したテーブル。
+
+        Raises:
+            ValueError: 同じ識別子のテーブルが既にある場合。
+
+        """
+        if table_id in self.tables:
+            raise ValueError(f"Table already exists: {table_id}")
+        table = AsyncTable(table_id, seats, bet_type, sb, bb, decision_timeout=self.decision_timeout, rebuy=rebuy, rng=rng,
+                           event_sink=event_sink)
+        self.tables[table_id] = table
+        task = asyncio.get_running_loop().create_task(table.run_async(num_hands, on_hand))
+        task.add_done_callback(lambda _: self._close_table(table_id, on_close))
+        self._tasks[table_id] = task
+        return table
+
+    async def wait_closed(self):
+        """全てのテーブルの進行が終わるまで待つ。
+
+        Raises:
+            Exception: テーブルの進行中に発生した例外。
+
+        """
+        tasks = list(self._tasks.values())
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    async def close(self):
+        """全てのテーブルの進行を止める。
+
+        """
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _close_table(self, table_id, on_close):
+        """進行が終わったテーブルを一覧から外す。
+
+        Args:
+            table_id (str): テーブルの識別子。
+            on_close (Callable[[AsyncTable], None]): テーブルの進行が終わったときに呼ぶ関数。
+
+        """
+        table = self.tables.pop(table_id, None)
+        self._tasks.pop(table_id, None)
+        if on_close is not None:
+            on_close(table)
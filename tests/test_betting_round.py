@@ -0,0 +1,84 @@
+import pytest
+
+from betting_round import BettingRound
+from dealer import Dealer
+from message_handler import NullMessageHandler
+from player import Player
+
+
+def setup_round(chips, button=0):
+    """ブラインドを支払った状態のプリフロップのラウンドを作る。
+
+    """
+    dealer = Dealer(NullMessageHandler(), None)
+    players = [Player(f"P{i}", amount, None, is_cpu=True) for i, amount in enumerate(chips)]
+    players[button].is_dealer = True
+    dealer.big_blind = 2
+    dealer.post_blind(players[(button + 1) % len(players)], 1)
+    dealer.post_blind(players[(button + 2) % len(players)], 2)
+    dealer.bet_record = [1, 2]
+    return dealer, players, BettingRound(dealer, players, 2, 'no', 'pre_flop')
+
+
+def test_betting_round():
+    """ステップ実行でアクション順と終了条件が正しく進むことを確認
+
+    """
+    dealer, players, betting_round = setup_round([100, 100, 100, 100])
+    assert (betting_round.max_bet, betting_round.num_live, betting_round.pending) == (2, 4, 4)
+
+    # ボタンの3つ隣から始まる
+    assert betting_round.next_player() is players[3]
+    assert betting_round.available_actions() == ["fold", "call", "raise"]
+    betting_round.apply("call")
+    assert betting_round.next_player() is players[0]
+    betting_round.apply("fold")
+    assert betting_round.next_player() is players[1]
+    betting_round.apply("call")
+    assert betting_round.pending == 1
+    assert betting_round.next_player() is players[2]
+    betting_round.apply("check")
+
+    assert betting_round.is_finished
+    assert betting_round.next_player() is None
+    assert betting_round.active_players() == [players[1], players[2], players[3]]
+    assert dealer.pot_ledger.total == 6
+    assert dealer.bet_record == [0]
+    with pytest.raises(RuntimeError):
+        betting_round.apply("check")
+
+
+def test_betting_round_raise_reopens_action():
+    """レイズすると他のプレイヤーに再びアクションが回ることを確認
+
+    """
+    dealer, players, betting_round = setup_round([100, 100, 100])
+    players[0].bet_amount_callback = lambda player, min_amount, max_amount: 10
+    # 3人の場合はボタンの3つ隣 = ボタン自身から始まる
+    assert betting_round.next_player() is players[0]
+    betting_round.apply("raise")
+    assert betting_round.max_bet == 10
+    assert betting_round.pending == 2
+    betting_round.apply("call")
+    betting_round.apply("fold")
+    assert betting_round.is_finished
+    assert [player.name for player in betting_round.active_players()] == ["P0", "P1"]
+
+
+def test_betting_round_all_in():
+    """全員がオール・インした場合と、1人を残して全員フォールドした場合に終了することを確認
+
+    """
+    dealer, players, betting_round = setup_round([50, 30, 20])
+    betting_round.apply("all-in")
+    assert betting_round.num_all_in == 1
+    betting_round.apply("all-in")
+    betting_round.apply("all-in")
+    assert betting_round.is_finished
+    assert BettingRound(dealer, players, 2, 'no', 'flop').is_finished
+
+    dealer, players, betting_round = setup_round([100, 100, 100])
+    betting_round.apply("fold")
+    betting_round.apply("fold")
+    assert betting_round.is_finished
+    assert betting_round.active_players() == [players[2]]
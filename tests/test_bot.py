@@ -0,0 +1,102 @@
+import random
+
+import pytest
+
+from bot import Bot, GameStateView, RandomBot
+from card import Card
+from dealer import Dealer
+from headless_game import HeadlessGame
+from message_handler import NullMessageHandler
+from player import Player
+
+
+class AllInBot(Bot):
+    """常に最大額でベット・レイズするボット。
+
+    """
+
+    def __init__(self):
+        self.views = []
+
+    def decide(self, view, available_actions):
+        self.views.append((view.street, view.position, view.to_call, len(view.history)))
+        for action in ("raise", "bet", "all-in", "call", "check"):
+            if action in available_actions:
+                return action, view.chips
+        return "fold", None
+
+
+class FixedBot(Bot):
+    """常に指定したアクションとベット額を返すボット。
+
+    """
+
+    def __init__(self, action, amount):
+        self.action = action
+        self.amount = amount
+
+    def decide(self, view, available_actions):
+        return self.action, self.amount
+
+
+def test_game_state_view():
+    """ビューがプレイヤーのリストのコピーではなく、最新の状態を参照することを確認
+
+    """
+    dealer = Dealer(NullMessageHandler(), None)
+    players = [Player(f"CPU{i}", 100, None, is_cpu=True) for i in range(3)]
+    players[0].is_dealer = True
+    view = GameStateView(dealer, players, players[2])
+    assert view.position == 2
+    assert view.stacks == (100, 100, 100)
+    assert list(view.bets) == [0, 0, 0] and view.folded[2] is False
+
+    dealer.post_blind(players[1], 2)
+    dealer.post_blind(players[2], 4)
+    players[2].hand = [Card("♤", "A"), Card("♡", "K")]
+    dealer.community_cards.append(Card("♢", "7"))
+    assert view.current_bet == 4
+    assert view.to_call == 0
+    assert view.pot == 6
+    assert view.hole_cards == (Card("♤", "A"), Card("♡", "K"))
+    assert view.board == (Card("♢", "7"),)
+
+    # 席の増減は set_seat で受け取った席とボタンの位置に反映される
+    players.pop(0)
+    players[0].is_dealer = True
+    view.set_seat(1, 0)
+    assert view.num_players == 2
+    assert view.stacks == (98, 96)
+    assert view.position == 1
+
+    with pytest.raises(TypeError):
+        Bot()
+
+
+def test_bot():
+    """ボットが決めたベット額が最小・最大額の範囲に収められることを確認
+
+    """
+    player = Player("CPU1", 500, None, is_cpu=True, bot=FixedBot("bet", 500))
+    assert player.select_action(["fold", "check", "bet"]) == "bet"
+    assert player.select_bet_amount(4, 80) == 80
+
+    player = Player("CPU2", 100, None, is_cpu=True, bot=RandomBot(random.Random(0)))
+    assert player.select_action(["fold", "call"]) in ["fold", "call"]
+    assert 4 <= player.select_bet_amount(4, 80) <= 80
+
+    # 乱数生成器を渡さない場合も、random モジュールの共有の状態は使わない
+    bot = RandomBot()
+    assert isinstance(bot.rng, random.Random) and bot.rng is not RandomBot().rng
+
+
+def test_bots_in_headless_game():
+    """席ごとに登録したボットがゲーム中に状態を受け取って意思決定することを確認
+
+    """
+    bot = AllInBot()
+    seats = [{'name': 'Shover', 'chips': 200, 'bot': bot}] + [{'name': f'CPU{i}', 'chips': 200} for i in range(3)]
+    HeadlessGame(seats, 'no', 1, 2).run(50)
+    assert len(bot.views) > 0
+    assert {street for street, _, _, _ in bot.views} <= {"pre_flop", "flop", "turn", "river"}
+    assert all(0 <= position < 4 for _, position, _, _ in bot.views)
@@ -1,3 +1,8 @@
+import copy
+import pickle
+
+import pytest
+
 from card import Card
 
 
@@ -45,3 +50,55 @@ def test_card_representation():
     """
     card1 = Card("♤", "A")
     assert print(card1) is None
+
+
+def test_card_id_conversion():
+    """
+    Cardクラスの整数IDとの相互変換をテストします。
+
+    Tests:
+        全52枚のIDが0～51で重複しない。
+        IDから生成したカードが元のカードと等しい。
+    """
+    cards = [Card(suit, rank) for rank in Card.VALID_RANKS for suit in Card.VALID_SUITS]
+    assert sorted(card.id for card in cards) == list(range(52))
+
+    for card in cards:
+        restored = Card.from_id(card.id)
+        assert restored == card
+        assert (restored.suit, restored.rank) == (card.suit, card.rank)
+        assert Card.to_id(card.suit, card.rank) == card.id
+
+    assert Card("♤", "2").id == 0
+    assert Card("♧", "A").id == 51
+    assert not hasattr(Card("♤", "A"), "__dict__")
+
+
+def test_card_interned():
+    """
+    Cardクラスのインスタンスが共有されることをテストします。
+
+    Tests:
+        同じスートとランクのカードは同じインスタンスになる。
+        カードは変更できない。
+        pickle やコピーをしても同じインスタンスになる。
+        事前計算された値が ID と対応している。
+    """
+    card = Card("♡", "Q")
+    assert card is Card("♡", "Q")
+    assert card is Card.from_id(card.id)
+    assert len({Card(suit, rank) for rank in Card.VALID_RANKS for suit in Card.VALID_SUITS}) == 52
+
+    with pytest.raises(AttributeError):
+        card.rank = "K"
+    with pytest.raises(ValueError):
+        Card("♤", "1")
+
+    assert pickle.loads(pickle.dumps(card)) is card
+    assert copy.copy(card) is card
+    assert copy.deepcopy([card])[0] is card
+
+    assert (card.rank_index, card.rank_value, card.suit_index, card.suit_bit) == (10, 12, 1, 2)
+    assert card.rank_weight == 5 ** 10
+    assert card.suit_count == 1 << 4
+    assert card.rank_mask == 1 << 13 + 10
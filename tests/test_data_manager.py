@@ -1,3 +1,4 @@
+import data_manager as data_manager_module
 from data_manager import DataManager
 
 
@@ -11,3 +12,61 @@ def test_data_manager_initialization():
     file_path = "./data/user_data.json"
     data_manager = DataManager(file_path)
     print(data_manager)
+
+
+def test_data_manager_adjust_user_data(tmp_path):
+    """チップ数の増減がファイルに保存されることを確認
+
+    """
+    path = str(tmp_path / "user_data.json")
+    data_manager = DataManager(path)
+    data_manager.add_new_user("Alice", 100)
+    assert data_manager.adjust_user_data("Alice", -30) == 70
+    assert DataManager(path).get_user_data("Alice") == 70
+
+
+def test_data_manager_write_behind(tmp_path):
+    """書き込みを遅延させた場合に、変更したキーの数か flush でまとめて保存されることを確認
+
+    """
+    path = tmp_path / "user_data.json"
+    data_manager = DataManager(str(path), write_behind=True, max_dirty=3, flush_interval=None)
+    data_manager.add_new_user("Alice", 100)
+    for chips in range(10):
+        data_manager.update_user_data("Alice", chips)
+    assert not path.exists()
+
+    data_manager.add_new_user("Bob", 200)
+    data_manager.delete_user("Bob")
+    assert not path.exists()
+    data_manager.add_new_user("Carol", 300)
+    assert DataManager(str(path)).data == {"Alice": 9, "Carol": 300}
+
+    data_manager.adjust_user_data("Carol", -50)
+    data_manager.close()
+    assert DataManager(str(path)).data == {"Alice": 9, "Carol": 250}
+    assert [file.name for file in tmp_path.iterdir()] == ["user_data.json"]
+
+
+def test_data_manager_tick(tmp_path, monkeypatch):
+    """更新が途絶えても、間隔が経過した後に tick を呼べば遅延させている変更が保存されることを確認
+
+    """
+    now = [100.0]
+    monkeypatch.setattr(data_manager_module.time, "monotonic", lambda: now[0])
+    path = tmp_path / "user_data.json"
+    data_manager = DataManager(str(path), write_behind=True, max_dirty=100, flush_interval=5.0)
+    data_manager.add_new_user("Alice", 100)
+    data_manager.tick()
+    assert not path.exists()
+
+    now[0] += 5.0
+    data_manager.tick()
+    assert DataManager(str(path)).data == {"Alice": 100}
+
+    data_manager.update_user_data("Alice", 50)
+    data_manager.tick()
+    assert DataManager(str(path)).data == {"Alice": 100}
+    now[0] += 5.0
+    data_manager.tick()
+    assert DataManager(str(path)).data == {"Alice": 50}
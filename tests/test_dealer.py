@@ -1,6 +1,7 @@
 from dealer import Dealer
-from message_handler import MessageHandler
+from message_handler import MessageHandler, NullMessageHandler
 from input_handler import InputHandler
+from player import Player
 
 
 def test_dealer_initialization():
@@ -14,3 +15,36 @@ def test_dealer_initialization():
     input_handler = InputHandler(message_handler)
     dealer = Dealer(message_handler, input_handler)
     print(dealer)
+
+
+def test_distribute_pots_odd_chips():
+    """割り切れない端数のチップが、ボタンの左隣から席順で先の勝者に配られることを確認
+
+    """
+    dealer = Dealer(NullMessageHandler(), None)
+    players = [Player(name=name, chips=0, input_handler=None, is_cpu=True) for name in ["A", "B", "C", "D"]]
+    players[2].is_dealer = True
+    for player in players:
+        player.hand_score = 1
+    # ボタンの C から記録しても、端数はボタンの左隣の D から配る
+    players[1].is_folded = True
+    for player, amount in [(players[2], 5), (players[0], 5), (players[3], 5), (players[1], 2)]:
+        dealer.pot_ledger.add(player, amount)
+
+    dealer.distribute_pots(players)
+    assert [player.chips for player in players] == [6, 0, 5, 6]
+
+
+def test_distribute_pots_no_eligible_player():
+    """獲得資格のあるプレイヤーがいないポットのチップが、出したプレイヤーに返されることを確認
+
+    """
+    dealer = Dealer(NullMessageHandler(), None)
+    players = [Player(name=name, chips=0, input_handler=None, is_cpu=True) for name in ["A", "B", "C"]]
+    players[0].is_dealer = True
+    for player, amount in [(players[1], 1), (players[2], 2), (players[0], 4)]:
+        dealer.pot_ledger.add(player, amount)
+        player.is_folded = True
+
+    dealer.distribute_pots(players)
+    assert [player.chips for player in players] == [4, 1, 2]
@@ -1,3 +1,5 @@
+import random
+
 import pytest
 
 from card import Card
@@ -45,3 +47,45 @@ def test_deck_draw():
         assert isinstance(card, Card)
     with pytest.raises(IndexError):
         deck.draw()
+
+
+def test_deck_seeded_rng():
+    """
+    同じシードの乱数生成器を渡したデッキが同じ順番になることをテストします。
+    """
+    def draw_all(deck):
+        return [deck.draw() for _ in range(52)]
+
+    assert draw_all(Deck(random.Random(7))) == draw_all(Deck(random.Random(7)))
+    assert draw_all(Deck(random.Random(7))) != draw_all(Deck(random.Random(8)))
+
+    deck = Deck()
+    deck.seed(7)
+    first = draw_all(deck)
+    deck.seed(7)
+    assert draw_all(deck) == first
+
+
+def test_deck_reset():
+    """
+    Deckクラスのリセットをテストします。
+
+    Tests:
+        リセットすると引いたカードが全て戻り、同じCardインスタンスが再利用される。
+        除外したカードは引かれない。
+    """
+    deck = Deck()
+    drawn = [deck.draw() for _ in range(10)]
+    assert len(deck) == 42
+    deck.reset()
+    assert len(deck) == 52
+    assert all(card is Deck.FULL_DECK[card.id] for card in deck.cards)
+    assert set(drawn) <= set(deck.cards)
+
+    dead_cards = [Card("♤", "A"), Card("♡", "A"), Card("♤", "A")]
+    deck.reset(dead_cards)
+    assert len(deck) == 50
+    cards = [deck.draw() for _ in range(50)]
+    assert not set(dead_cards) & set(cards)
+    with pytest.raises(IndexError):
+        deck.draw()
@@ -0,0 +1,141 @@
+import random
+from itertools import combinations
+
+import pytest
+
+from card import Card
+from equity_calculator import EquityCalculator, EquityResult
+
+
+calculator = EquityCalculator(rng=random.Random(0))
+
+
+def test_pocket_aces_heads_up():
+    """AAのヘッズアップのエクイティが既知の値 (約85%) に近いことを確認
+
+    """
+    result = calculator.calculate([Card("♤", "A"), Card("♡", "A")], num_players=2, samples=20000)
+    assert result.samples == 20000
+    assert abs(result.equity - 0.85) < 0.02
+    assert abs(result.win + result.tie + result.lose - 1.0) < 1e-9
+
+
+def test_board_plays():
+    """ボードがロイヤルフラッシュの場合は必ず引き分けになることを確認
+
+    """
+    board = [Card("♧", "A"), Card("♧", "K"), Card("♧", "Q"), Card("♧", "J"), Card("♧", "10")]
+    result = calculator.calculate([Card("♤", "2"), Card("♡", "3")], board_cards=board, num_players=3, samples=500)
+    assert result.tie == 1.0
+    assert result.equity == pytest.approx(1 / 3)
+
+
+def test_nuts_on_river():
+    """リバーでナッツを持っている場合は必ず勝つことを確認
+
+    """
+    board = [Card("♤", "K"), Card("♤", "Q"), Card("♤", "J"), Card("♡", "2"), Card("♢", "3")]
+    result = calculator.calculate([Card("♤", "A"), Card("♤", "10")], board_cards=board, num_players=6, samples=500)
+    assert result.win == 1.0
+
+
+def test_dead_cards():
+    """除外したカードが残りのデッキに含まれないことを確認
+
+    """
+    dead_cards = [Card("♧", "A"), Card("♧", "K")]
+    _, _, remaining_ids = calculator.split_deck([Card("♡", "A"), Card("♢", "A")], None, dead_cards)
+    assert len(remaining_ids) == 48
+    assert all(card.id not in remaining_ids for card in dead_cards)
+
+
+def test_convergence_stop():
+    """許容誤差に達した時点で試行が打ち切られることを確認
+
+    """
+    result = calculator.calculate([Card("♤", "7"), Card("♡", "2")], samples=1000000, tolerance=0.02, batch_size=500)
+    assert result.samples < 1000000
+    assert result.samples % 500 == 0
+
+
+@pytest.mark.parametrize("hole_cards, board_cards, num_players", [
+    ([Card("♤", "A")], None, 2),
+    ([Card("♤", "A"), Card("♤", "A")], None, 2),
+    ([Card("♤", "A"), Card("♡", "A")], [Card("♤", "A")], 2),
+    ([Card("♤", "A"), Card("♡", "A")], None, 1),
+    ([Card("♤", "A"), Card("♡", "A")], None, 30),
+])
+def test_invalid_arguments(hole_cards, board_cards, num_players):
+    """不正な引数で ValueError が発生することを確認
+
+    """
+    with pytest.raises(ValueError):
+        calculator.calculate(hole_cards, board_cards=board_cards, num_players=num_players, samples=10)
+
+
+@pytest.mark.parametrize("samples, batch_size", [(0, 1000), (-1, 1000), (100, 0), (100, -5)])
+def test_invalid_sampling_arguments(samples, batch_size):
+    """試行回数か収束判定の間隔が1未満の場合に、無限ループせずに ValueError が発生することを確認
+
+    """
+    with pytest.raises(ValueError):
+        calculator.calculate([Card("♤", "A"), Card("♡", "A")], samples=samples, batch_size=batch_size)
+
+
+def test_equity_result_merge():
+    """結果の合算を確認
+
+    """
+    result = EquityResult(wins=3, ties=1, losses=1, share=3.5, share_squares=3.25)
+    result.merge(EquityResult(wins=1, losses=3, share=1.0, share_squares=1.0))
+    assert result.samples == 9
+    assert result.win == pytest.approx(4 / 9)
+    assert result.equity == pytest.approx(4.5 / 9)
+
+
+def test_calculate_exact_matches_brute_force():
+    """差分列挙の結果が、全ランアウトを7枚ずつ評価した結果と一致することを確認
+
+    """
+    hands = [[Card("♤", "A"), Card("♡", "K")], [Card("♢", "9"), Card("♢", "8")], [Card("♧", "Q"), Card("♤", "Q")]]
+    board = [Card("♢", "7"), Card("♡", "6"), Card("♢", "K")]
+    results = calculator.calculate_exact(hands, board_cards=board)
+
+    known = {card.id for hand in hands for card in hand} | {card.id for card in board}
+    remaining = [card_id for card_id in range(52) if card_id not in known]
+    evaluator = calculator.hand_evaluator
+    wins = [0, 0, 0]
+    ties = [0, 0, 0]
+    for runout in combinations(remaining, 2):
+        board_ids = [card.id for card in board] + list(runout)
+        scores = [evaluator.score_from_ids([card.id for card in hand] + board_ids) for hand in hands]
+        best = max(scores)
+        for index, score in enumerate(scores):
+            if score == best and scores.count(best) == 1:
+                wins[index] += 1
+            elif score == best:
+                ties[index] += 1
+
+    for index, result in enumerate(results):
+        assert result.samples == len(list(combinations(remaining, 2)))
+        assert result.wins == wins[index]
+        assert result.ties == ties[index]
+
+
+def test_calculate_exact_river():
+    """リバーではランアウトが1通りで、スプリットが正しく分配されることを確認
+
+    """
+    board = [Card("♧", "A"), Card("♧", "K"), Card("♧", "Q"), Card("♧", "J"), Card("♧", "10")]
+    hands = [[Card("♤", "2"), Card("♡", "3")], [Card("♢", "4"), Card("♡", "5")]]
+    results = calculator.calculate_exact(hands, board_cards=board)
+    assert [result.samples for result in results] == [1, 1]
+    assert [result.equity for result in results] == [0.5, 0.5]
+
+
+def test_calculate_exact_duplicate_cards():
+    """プレイヤー間でカードが重複している場合に ValueError が発生することを確認
+
+    """
+    with pytest.raises(ValueError):
+        calculator.calculate_exact([[Card("♤", "A"), Card("♡", "A")], [Card("♤", "A"), Card("♢", "K")]])
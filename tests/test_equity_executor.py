@@ -0,0 +1,39 @@
+from card import Card
+from equity_calculator import EquityCalculator
+from equity_executor import EquityExecutor
+
+
+HOLE_CARDS = [Card("♤", "A"), Card("♡", "A")]
+HANDS = [[Card("♤", "A"), Card("♡", "K")], [Card("♢", "9"), Card("♢", "8")]]
+FLOP = [Card("♢", "7"), Card("♡", "6"), Card("♢", "K")]
+
+
+def test_calculate_is_deterministic():
+    """同じシードとシャード数であれば同じ結果になることを確認
+
+    """
+    with EquityExecutor(max_workers=2, seed=42) as executor:
+        first = executor.calculate(HOLE_CARDS, samples=4000, num_shards=4)
+        second = executor.calculate(HOLE_CARDS, samples=4000, num_shards=4)
+    assert first.samples == 4000
+    assert (first.wins, first.ties, first.losses) == (second.wins, second.ties, second.losses)
+    assert abs(first.equity - 0.85) < 0.03
+
+
+def test_calculate_exact_matches_single_process():
+    """並列の全列挙が1プロセスの全列挙と一致することを確認
+
+    """
+    expected = EquityCalculator().calculate_exact(HANDS, board_cards=FLOP)
+    with EquityExecutor(max_workers=2) as executor:
+        results = executor.calculate_exact(HANDS, board_cards=FLOP, num_shards=5)
+    for result, expected_result in zip(results, expected):
+        assert (result.wins, result.ties, result.losses) == (expected_result.wins, expected_result.ties, expected_result.losses)
+
+
+def test_shard_seeds():
+    """シャードのシードがシードから決定的に導出されることを確認
+
+    """
+    assert EquityExecutor(seed=1).shard_seeds(3) == EquityExecutor(seed=1).shard_seeds(3)
+    assert len(set(EquityExecutor(seed=1).shard_seeds(8))) == 8
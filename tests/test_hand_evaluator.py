@@ -279,3 +279,28 @@ def test_individual_check():
     category, rank = evaluator.evaluate_hand(hand, community_card)
 
     assert category.strength == HandCategory.THREE_OF_A_KIND.strength
+
+
+def test_hand_score_ordering():
+    """スコアの大小がカテゴリとランクの強さの順序と一致することを確認
+
+    """
+    hands = [
+        (HandCategory.HIGH_CARD, [14, 13, 12, 11, 9]),
+        (HandCategory.ONE_PAIR, [2, 5, 4, 3]),
+        (HandCategory.ONE_PAIR, [2, 6, 4, 3]),
+        (HandCategory.TWO_PAIR, [14, 13, 12]),
+        (HandCategory.THREE_OF_A_KIND, [2, 4, 3]),
+        (HandCategory.STRAIGHT, 5),
+        (HandCategory.STRAIGHT, 14),
+        (HandCategory.FLUSH, [7, 5, 4, 3, 2]),
+        (HandCategory.FULL_HOUSE, [2, 3]),
+        (HandCategory.FOUR_OF_A_KIND, [14, 13]),
+        (HandCategory.STRAIGHT_FLUSH, 13),
+        (HandCategory.ROYAL_FLUSH, None),
+    ]
+    scores = [HandEvaluator.hand_score(category, rank) for category, rank in hands]
+    assert scores == sorted(scores)
+    assert len(set(scores)) == len(scores)
+    assert all(score < 1 << 24 for score in scores)
+    assert [HandEvaluator.category_from_score(score) for score in scores] == [category for category, _ in hands]
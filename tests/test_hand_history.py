@@ -0,0 +1,90 @@
+import random
+
+import pytest
+
+from card import Card
+from hand_event import ActionTaken, BlindPosted, BoardDealt, HandEnded, HandStarted, HoleCardsDealt, PotAwarded
+from hand_history import (HandHistoryWriter, evaluate_showdown, format_cards, format_hand, parse_cards, parse_hand,
+                          read_hand_histories, split_hands, to_hand_record)
+from headless_game import HeadlessGame
+from lookup_hand_evaluator import LookupHandEvaluator
+
+
+EVENTS = [
+    HandStarted(2 ** 63 + 5, 'no', 1, 2, 1, (("Alice", 300), ("Bob Smith", 100))),
+    BlindPosted("Bob Smith", 1),
+    BlindPosted("Alice", 2),
+    HoleCardsDealt("Bob Smith", (Card("♤", "A"), Card("♡", "K"))),
+    HoleCardsDealt("Alice", (Card("♢", "10"), Card("♧", "7"))),
+    ActionTaken("pre_flop", "Bob Smith", "call", 1),
+    ActionTaken("pre_flop", "Alice", "check", 0),
+    BoardDealt("flop", (Card("♢", "7"), Card("♡", "6"), Card("♢", "K"))),
+    ActionTaken("flop", "Alice", "bet", 2),
+    ActionTaken("flop", "Bob Smith", "all-in", 98),
+    ActionTaken("flop", "Alice", "call", 96),
+    BoardDealt("turn", (Card("♧", "2"),)),
+    BoardDealt("river", (Card("♤", "3"),)),
+    PotAwarded(0, "Bob Smith", 200),
+    HandEnded((200, 200)),
+]
+
+
+def test_format_parse_cards():
+    """カードが2文字表記で変換、復元されることを確認
+
+    """
+    cards = (Card("♤", "A"), Card("♢", "10"), Card("♧", "2"))
+    assert format_cards(cards) == "As Td 2c"
+    assert parse_cards("As Td 2c") == cards
+    with pytest.raises(ValueError):
+        parse_cards("As 1x")
+
+
+def test_format_parse_hand():
+    """1ハンド分のイベントがテキストを経由して復元されることを確認
+
+    """
+    lines = format_hand(EVENTS, 7)
+    assert lines[0] == f"Hand #7: Hold'em No Limit (1/2) - Seed {2 ** 63 + 5}"
+    assert "Bob Smith: posts small blind 1" in lines
+    assert "*** FLOP *** [7d 6h Kd]" in lines
+    assert "*** TURN *** [7d 6h Kd] [2c]" in lines
+    assert parse_hand(lines) == EVENTS
+    with pytest.raises(ValueError):
+        parse_hand(lines[:3] + ["Alice: dances"])
+
+
+def test_split_hands():
+    """空行区切りで1ハンドずつに分けられることを確認
+
+    """
+    lines = ["a\n", "b\n", "\n", "\n", "c\r\n"]
+    assert list(split_hands(iter(lines))) == [["a", "b"], ["c"]]
+
+
+def test_evaluate_showdown():
+    """フォールドしていないプレイヤーの手が評価し直されることを確認
+
+    """
+    evaluator = LookupHandEvaluator()
+    scores = evaluate_showdown(EVENTS, evaluator)
+    assert set(scores) == {"Alice", "Bob Smith"}
+    assert scores["Bob Smith"] > scores["Alice"]
+    assert evaluate_showdown(EVENTS[:8], evaluator) == {}
+
+
+def test_hand_history_round_trip(tmp_path):
+    """ゲームのハンド履歴を読み込み、同じハンドを再実行できることを確認
+
+    """
+    path = tmp_path / "hands.txt"
+    records = []
+    seats = [{'name': f"ボット{i + 1}", 'chips': 150} for i in range(6)]
+    with HandHistoryWriter(path) as writer:
+        HeadlessGame(seats, 'no', 1, 2, rng=random.Random(3), event_sink=writer.emit).run(30, on_hand=records.append)
+    assert writer.hand_number == len(records)
+
+    imported = [to_hand_record(events) for events in read_hand_histories(path)]
+    assert imported == records
+    for record in imported[:5]:
+        assert HeadlessGame.replay_hand(record) == record
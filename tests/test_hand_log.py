@@ -0,0 +1,125 @@
+import random
+
+import pytest
+
+from card import Card
+from hand_event import ActionTaken, BlindPosted, BoardDealt, HandEnded, HandStarted, HoleCardsDealt, PotAwarded
+import hand_log
+from hand_log import HandLogReader, HandLogWriter, decode_hand, encode_hand
+from headless_game import HeadlessGame
+
+
+def play_logged_hands(path, num_hands, seed=0):
+    """ログを書きながらハンドをプレイし、ハンドの記録を返す。
+
+    """
+    records = []
+    seats = [{'name': f"ボット{i + 1}", 'chips': 150} for i in range(6)]
+    with HandLogWriter(path) as writer:
+        HeadlessGame(seats, 'no', 1, 2, rng=random.Random(seed), event_sink=writer.emit).run(num_hands, on_hand=records.append)
+    return records
+
+
+def test_hand_event():
+    """イベントの比較、表示、引数の数の検査を確認
+
+    """
+    event = ActionTaken("flop", "Alice", "bet", 10)
+    assert event == ActionTaken("flop", "Alice", "bet", 10)
+    assert event != ActionTaken("flop", "Alice", "bet", 20)
+    assert repr(event) == "ActionTaken(street='flop', player='Alice', action='bet', amount=10)"
+    with pytest.raises(TypeError):
+        BlindPosted("Alice")
+
+
+def test_encode_decode_hand():
+    """1ハンド分のイベントがバイト列を経由して復元されることを確認
+
+    """
+    events = [
+        HandStarted(2 ** 63 + 5, 'no', 1, 2, 1, (("Alice", 300), ("Bob", 100000))),
+        BlindPosted("Bob", 1),
+        BlindPosted("Alice", 2),
+        HoleCardsDealt("Bob", (Card("♤", "A"), Card("♡", "K"))),
+        HoleCardsDealt("Alice", (Card("♢", "2"), Card("♧", "7"))),
+        ActionTaken("pre_flop", "Bob", "raise", 200),
+        ActionTaken("pre_flop", "Alice", "all-in", 298),
+        BoardDealt("flop", (Card("♢", "7"), Card("♡", "6"), Card("♢", "K"))),
+        PotAwarded(0, "Bob", 600),
+        HandEnded((0, 100300)),
+    ]
+    assert decode_hand(encode_hand(events)) == events
+    with pytest.raises(ValueError):
+        encode_hand(events[1:])
+
+
+def test_hand_log_round_trip(tmp_path):
+    """ゲームのイベントがログに書かれ、メモリマップで読み戻せることを確認
+
+    """
+    path = tmp_path / "hands.log"
+    records = play_logged_hands(path, 100)
+
+    with HandLogReader(path) as reader:
+        hands = list(reader)
+    assert len(hands) == 100
+
+    for events, record in zip(hands, records):
+        start, end = events[0], events[-1]
+        assert isinstance(start, HandStarted) and isinstance(end, HandEnded)
+        assert (start.seed, start.button, list(start.seats)) == (record.seed, record.button, record.seats)
+        assert list(end.stacks) == record.result
+        assert sum(1 for event in events if isinstance(event, HoleCardsDealt)) == len(record.seats)
+        actions = [(event.street, event.player, event.action, event.amount) for event in events if isinstance(event, ActionTaken)]
+        assert actions == record.actions
+
+        # 支払われたチップと獲得したチップが一致する
+        paid = sum(event.amount for event in events if isinstance(event, (BlindPosted, ActionTaken)))
+        assert paid == sum(event.amount for event in events if isinstance(event, PotAwarded))
+
+
+def test_hand_log_append_and_truncated_tail(tmp_path):
+    """既存のログへの追記と、書き込み途中で途切れた末尾の無視を確認
+
+    """
+    path = tmp_path / "hands.log"
+    play_logged_hands(path, 10)
+    play_logged_hands(path, 5, seed=1)
+    with open(path, "ab") as file:
+        file.write(b"\x40\x00\x00\x00\x01\x02")
+
+    with HandLogReader(path) as reader:
+        assert sum(1 for _ in reader.records()) == 15
+
+    # 途切れた末尾のあとに追記しても、途切れたレコードを捨てて全てのハンドが読める
+    play_logged_hands(path, 5, seed=2)
+    with HandLogReader(path) as reader:
+        assert sum(1 for _ in reader) == 20
+
+    other = tmp_path / "other.log"
+    other.write_bytes(b"not a hand log")
+    with pytest.raises(ValueError):
+        HandLogWriter(other)
+    with pytest.raises(ValueError):
+        HandLogReader(other)
+
+
+def test_hand_log_reopen_checks_only_tail(tmp_path, monkeypatch):
+    """完全なログを開き直すときは末尾だけを確かめ、途中で切れたログは最後の完全なレコードまで切り詰めることを確認
+
+    """
+    path = tmp_path / "hands.log"
+    play_logged_hands(path, 3)
+
+    def fail_scan(file, size):
+        raise AssertionError("scanned the whole log")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(hand_log, "_complete_frames_end", fail_scan)
+        play_logged_hands(path, 2, seed=1)
+
+    with open(path, "r+b") as file:
+        file.truncate(file.seek(0, 2) - 7)
+    play_logged_hands(path, 5, seed=2)
+    with HandLogReader(path) as reader:
+        assert sum(1 for _ in reader) == 4 + 5
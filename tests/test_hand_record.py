@@ -0,0 +1,55 @@
+import json
+import random
+
+import pytest
+
+from hand_record import HandRecord
+from headless_game import HeadlessGame
+
+
+def play_records(seed, bet_type, num_hands):
+    """シードを固定したゲームでハンドの記録を集める。
+
+    """
+    records = []
+    seats = [{'name': f"Bot{i + 1}", 'chips': 100} for i in range(5)]
+    HeadlessGame(seats, bet_type, 1, 2, rng=random.Random(seed)).run(num_hands, on_hand=records.append)
+    return records
+
+
+def test_seeded_game_is_reproducible():
+    """同じシードであれば全ハンドが同じになることを確認
+
+    """
+    assert play_records(3, 'no', 200) == play_records(3, 'no', 200)
+    assert play_records(3, 'no', 200) != play_records(4, 'no', 200)
+
+
+@pytest.mark.parametrize("bet_type", ['no', 'fix'])
+def test_replay_hand(bet_type):
+    """記録したハンドを再実行すると同じ結果になることを確認
+
+    """
+    for record in play_records(11, bet_type, 200):
+        assert HeadlessGame.replay_hand(record) == record
+
+
+def test_hand_record_round_trip():
+    """JSON を経由しても記録が変わらないことを確認
+
+    """
+    record = play_records(5, 'no', 1)[0]
+    restored = HandRecord.from_dict(json.loads(json.dumps(record.to_dict())))
+    assert restored == record
+    assert HeadlessGame.replay_hand(restored) == record
+
+
+def test_replay_diverged():
+    """記録と異なるアクションしかできない場合に ValueError が発生することを確認
+
+    """
+    record = play_records(5, 'no', 1)[0]
+    street, name, _, amount = record.actions[0]
+    record.actions[0] = (street, name, 'check', amount)
+    with pytest.raises(ValueError):
+        HeadlessGame.replay_hand(record)
@@ -0,0 +1,64 @@
+import random
+
+import pytest
+
+from headless_game import HeadlessGame
+
+
+def make_seats(num_seats, chips, rng, calls):
+    """ランダムに行動するコールバックを持つ席の設定を作る。
+
+    """
+    def action_callback(player, available_actions):
+        calls.append(player.name)
+        return rng.choice(available_actions)
+
+    def bet_amount_callback(player, min_amount, max_amount):
+        return rng.randint(min_amount, max_amount)
+
+    return [{'name': f"Bot{i + 1}", 'chips': chips, 'action_callback': action_callback,
+             'bet_amount_callback': bet_amount_callback} for i in range(num_seats)]
+
+
+def test_headless_game_run():
+    """表示と入力待ちなしで指定数のハンドをプレイできることを確認
+
+    """
+    calls = []
+    game = HeadlessGame(make_seats(6, 200, random.Random(0), calls), 'no', 1, 2)
+    players = game.run(300)
+    assert game.hands_played == 300
+    assert len(players) == 6
+    assert set(calls) <= {f"Bot{i + 1}" for i in range(6)}
+    assert len(calls) > 300
+
+
+def test_headless_game_without_rebuy():
+    """リバイしない場合、チップが0になったプレイヤーが席を立つことを確認
+
+    """
+    game = HeadlessGame(make_seats(4, 20, random.Random(1), []), 'no', 1, 2, rebuy=False)
+    players = game.run(500)
+    assert all(player.chips > 0 for player in players)
+    assert len(players) < 4
+    assert sum(player.is_dealer for player in players) == 1 or len(players) == 1
+
+
+@pytest.mark.parametrize("bet_type", ['no', 'fix'])
+def test_headless_game_conserves_chips(bet_type):
+    """オール・インやサイドポットがあってもチップの合計が変わらないことを確認
+
+    """
+    rng = random.Random(2)
+    seats = [{'name': f"Bot{i + 1}", 'chips': rng.randint(5, 300)} for i in range(9)]
+    total = sum(seat['chips'] for seat in seats)
+    game = HeadlessGame(seats, bet_type, 1, 2, rebuy=False, rng=rng)
+    game.run(300, on_hand=lambda record: assert_conserved(record, total))
+
+
+def assert_conserved(record, total):
+    """ハンドの前後でチップの合計が変わらないことを確認する。
+
+    """
+    assert sum(chips for _, chips in record.seats) == total
+    assert sum(record.result) == total
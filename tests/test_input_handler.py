@@ -1,6 +1,6 @@
 from unittest.mock import patch
 
-from input_handler import InputHandler
+from input_handler import HeadlessInputHandler, InputHandler
 from message_handler import MessageHandler
 
 message = MessageHandler()
@@ -60,3 +60,15 @@ def test_select_bet_amount():
     with patch('builtins.input', return_value='200'):
         amount = handler.select_bet_amount(100, 500)
     assert amount == 200
+
+
+def test_headless_input_handler():
+    """
+    HeadlessInputHandlerクラスが入力を待たないことをテストします。
+    """
+    handler = HeadlessInputHandler(message)
+
+    with patch('builtins.input', side_effect=AssertionError("input() must not be called")):
+        assert handler.wait_for_user() is None
+        assert handler.continue_to_game() == 0
+        assert handler.rebuy_to_game() == 0
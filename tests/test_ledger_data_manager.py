@@ -0,0 +1,66 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from ledger_data_manager import LedgerDataManager
+
+
+def test_ledger_data_manager(tmp_path):
+    """ユーザーの追加、取得、更新、増減、削除と、再オープン後の永続化を確認
+
+    """
+    path = tmp_path / "user_data.sqlite3"
+    data_manager = LedgerDataManager(str(path))
+    assert data_manager.get_or_create_user_data("Alice") == 10000
+    assert data_manager.get_or_create_user_data("Alice", default_chips=5) == 10000
+    data_manager.update_user_data("Bob", 300)
+    assert data_manager.adjust_user_data("Bob", -120) == 180
+    assert data_manager.adjust_user_data("Alice", 50) == 10050
+    with pytest.raises(KeyError):
+        data_manager.adjust_user_data("Carol", 10)
+    data_manager.delete_user("Alice")
+    assert data_manager.get_user_data("Alice") is None
+    data_manager.close()
+
+    data_manager = LedgerDataManager(str(path))
+    assert data_manager.data == {"Bob": 180}
+    data_manager.close()
+
+
+def test_ledger_data_manager_imports_legacy_json(tmp_path):
+    """新しいデータベースを作成したときだけ JSON のデータを取り込むことを確認
+
+    """
+    legacy_path = tmp_path / "user_data.json"
+    legacy_path.write_text(json.dumps({"Alice": 5000, "Bob": 3000}))
+    path = str(tmp_path / "user_data.sqlite3")
+
+    data_manager = LedgerDataManager(path, legacy_json_path=str(legacy_path))
+    assert data_manager.data == {"Alice": 5000, "Bob": 3000}
+    data_manager.adjust_user_data("Alice", -1000)
+    data_manager.close()
+
+    data_manager = LedgerDataManager(path, legacy_json_path=str(legacy_path))
+    assert data_manager.get_user_data("Alice") == 4000
+    data_manager.close()
+
+
+def test_ledger_data_manager_concurrent_adjust(tmp_path):
+    """複数の接続から同時に増減しても、増減が失われないことを確認
+
+    """
+    path = str(tmp_path / "user_data.sqlite3")
+    data_manager = LedgerDataManager(path)
+    data_manager.update_user_data("Alice", 0)
+
+    def deposit(_):
+        other = LedgerDataManager(path)
+        for _ in range(50):
+            other.adjust_user_data("Alice", 1)
+        other.close()
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(deposit, range(4)))
+    assert data_manager.get_user_data("Alice") == 200
+    data_manager.close()
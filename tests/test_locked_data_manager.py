@@ -0,0 +1,47 @@
+from concurrent.futures import ProcessPoolExecutor
+import os
+
+from data_manager import DataManager
+from locked_data_manager import LockedDataManager
+
+
+def deposit(path, num_deposits):
+    """別のプロセスからチップを1ずつ増やす。
+
+    """
+    data_manager = LockedDataManager(path)
+    for _ in range(num_deposits):
+        data_manager.adjust_user_data("Alice", 1)
+        data_manager.get_or_create_user_data(f"user{os.getpid()}", 0)
+    data_manager.close()
+
+
+def test_locked_data_manager(tmp_path):
+    """他のインスタンスの更新を読み直し、上書きしないことを確認
+
+    """
+    path = str(tmp_path / "user_data.json")
+    first = LockedDataManager(path)
+    second = LockedDataManager(path)
+    first.add_new_user("Alice", 100)
+    second.add_new_user("Bob", 200)
+    assert first.get_user_data("Bob") == 200
+    assert second.adjust_user_data("Alice", -30) == 70
+    assert first.adjust_user_data("Alice", -30) == 40
+    first.close()
+    second.close()
+    assert DataManager(path).data == {"Alice": 40, "Bob": 200}
+
+
+def test_locked_data_manager_concurrent_processes(tmp_path):
+    """複数のプロセスから同時に増減しても、増減が失われないことを確認
+
+    """
+    path = str(tmp_path / "user_data.json")
+    data_manager = LockedDataManager(path)
+    data_manager.add_new_user("Alice", 0)
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        list(executor.map(deposit, [path] * 4, [25] * 4))
+    assert data_manager.get_user_data("Alice") == 100
+    assert len(DataManager(path).data) == 5
+    data_manager.close()
@@ -0,0 +1,95 @@
+import random
+
+import pytest
+
+from card import Card
+from hand_evaluator import HandEvaluator, HandCategory
+from lookup_hand_evaluator import LookupHandEvaluator
+
+
+evaluator = LookupHandEvaluator()
+reference_evaluator = HandEvaluator()
+
+DECK = [Card(suit, rank) for suit in Card.VALID_SUITS for rank in Card.VALID_RANKS]
+
+
+def test_matches_reference_evaluator():
+    """ランダムな5～7枚のハンドで従来の評価結果と一致することを確認
+
+    """
+    rng = random.Random(0)
+    for _ in range(3000):
+        cards = rng.sample(DECK, rng.choice([5, 6, 7]))
+        assert evaluator.best_hand_from_seven(cards) == reference_evaluator.best_hand_from_seven(cards)
+
+
+@pytest.mark.parametrize("hand, community_cards, expected", [
+    ([Card("♤", "A"), Card("♤", "K")], [Card("♤", "Q"), Card("♤", "J"), Card("♤", "10"), Card("♡", "2"), Card("♢", "3")],
+     (HandCategory.ROYAL_FLUSH, None)),
+    ([Card("♡", "A"), Card("♡", "2")], [Card("♡", "3"), Card("♡", "4"), Card("♡", "5"), Card("♤", "6"), Card("♢", "7")],
+     (HandCategory.STRAIGHT_FLUSH, 5)),
+    ([Card("♤", "9"), Card("♡", "9")], [Card("♢", "9"), Card("♧", "9"), Card("♤", "K"), Card("♡", "K"), Card("♢", "K")],
+     (HandCategory.FOUR_OF_A_KIND, [9, 13])),
+    ([Card("♤", "8"), Card("♡", "8")], [Card("♢", "8"), Card("♤", "4"), Card("♡", "4"), Card("♢", "4"), Card("♧", "2")],
+     (HandCategory.FULL_HOUSE, [8, 4])),
+    ([Card("♢", "A"), Card("♢", "2")], [Card("♢", "6"), Card("♢", "9"), Card("♢", "J"), Card("♡", "J"), Card("♧", "J")],
+     (HandCategory.FLUSH, [14, 11, 9, 6, 2])),
+    ([Card("♤", "Q"), Card("♡", "Q")], [Card("♢", "7"), Card("♧", "7"), Card("♤", "3"), Card("♡", "3"), Card("♢", "K")],
+     (HandCategory.TWO_PAIR, [12, 7, 13])),
+])
+def test_seven_card_hands(hand, community_cards, expected):
+    """7枚から最も強い手が選ばれることを確認
+
+    """
+    assert evaluator.evaluate_hand(hand, community_cards) == expected
+
+
+def test_best_hand_from_ids():
+    """カードIDからの評価がカードからの評価と一致することを確認
+
+    """
+    rng = random.Random(1)
+    for _ in range(500):
+        cards = rng.sample(DECK, 7)
+        assert evaluator.best_hand_from_ids([card.id for card in cards]) == evaluator.best_hand_from_seven(cards)
+
+
+def test_score_from_ids():
+    """テーブルから求めたスコアがハンドの評価結果から求めたスコアと一致することを確認
+
+    """
+    rng = random.Random(2)
+    for _ in range(500):
+        cards = rng.sample(DECK, 7)
+        expected = HandEvaluator.hand_score(*reference_evaluator.best_hand_from_seven(cards))
+        assert evaluator.score_from_ids([card.id for card in cards]) == expected
+        assert evaluator.evaluate_score(cards[:2], cards[2:]) == expected
+
+
+def test_evaluate_batch():
+    """NumPy のまとめての評価が1ハンドずつの評価と一致することを確認
+
+    """
+    np = pytest.importorskip("numpy")
+    rng = np.random.default_rng(3)
+    cards_array = np.argsort(rng.random((5000, 52)), axis=1)[:, :7]
+    scores = evaluator.evaluate_batch(cards_array)
+    assert scores.shape == (5000,)
+    assert scores.tolist() == [evaluator.score_from_ids(row) for row in cards_array.tolist()]
+
+    # フラッシュやストレートフラッシュを含む行
+    royal_flush = [Card("♤", rank).id for rank in ["A", "K", "Q", "J", "10"]] + [Card("♡", "2").id, Card("♢", "3").id]
+    full_house_and_flush = [Card("♢", rank).id for rank in ["A", "2", "6", "9", "J"]] + [Card("♡", "J").id, Card("♧", "J").id]
+    scores = evaluator.evaluate_batch([royal_flush, full_house_and_flush])
+    assert scores.tolist() == [evaluator.score_from_ids(royal_flush), evaluator.score_from_ids(full_house_and_flush)]
+
+
+def test_evaluate_batch_invalid():
+    """不正な配列で ValueError が発生することを確認
+
+    """
+    pytest.importorskip("numpy")
+    with pytest.raises(ValueError):
+        evaluator.evaluate_batch([[0, 1, 2, 3]])
+    with pytest.raises(ValueError):
+        evaluator.evaluate_batch([[48, 49, 50, 51, 48, 0, 1]])
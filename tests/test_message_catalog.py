@@ -0,0 +1,62 @@
+import pytest
+
+from message_catalog import AVAILABLE_LOCALES, MESSAGES, LazyMessage, MessageTemplate, get_catalog
+from message_handler import MessageHandler
+from output_sink import INFO, PROMPT, MemorySink
+
+
+def test_message_template():
+    """コンパイルした文言が str.format と同じ文字列を組み立てることを確認
+
+    """
+    for text in ["ゲーム終了。", "{{x}} {a}", "{a!r:>6}|{b:03d}", "{b.real} {a}", "'\"\\ {a}"]:
+        assert MessageTemplate(text).format(a="q", b=7, c=None) == text.format(a="q", b=7, c=None)
+    template = MessageTemplate("{player_name} - {chips}")
+    assert template.fields == {"player_name", "chips"}
+    with pytest.raises(KeyError):
+        template.format(player_name="Alice")
+
+
+def test_message_catalog():
+    """カタログがロケールごとに1つだけ作られ、全てのロケールが同じキーを持つことを確認
+
+    """
+    assert get_catalog() is get_catalog("ja") is get_catalog("ja_JP.UTF-8")
+    assert get_catalog("en-US").locale == "en"
+    assert get_catalog("en").format("pots", pots=600) == "Pot: 600"
+    assert get_catalog("ja").format("non_existing_key") == "メッセージが見つかりません。"
+    for locale in AVAILABLE_LOCALES:
+        assert MESSAGES[locale].keys() == MESSAGES["ja"].keys()
+        for key, text in MESSAGES[locale].items():
+            assert MessageTemplate(text).fields == MessageTemplate(MESSAGES["ja"][key]).fields
+    with pytest.raises(ValueError):
+        get_catalog("xx")
+
+
+def test_lazy_message():
+    """LazyMessage が文字列に変換されるまで組み立てず、出力先が捨てたメッセージは組み立てないことを確認
+
+    """
+    class Value:
+        formatted = 0
+
+        def __format__(self, spec):
+            Value.formatted += 1
+            return "v"
+
+    message = get_catalog().lazy("now_chips", chips=Value())
+    assert isinstance(message, LazyMessage) and Value.formatted == 0
+    assert str(message) == str(message) == "現在のチップ: v" and Value.formatted == 1
+    with pytest.raises(KeyError):
+        get_catalog().lazy("now_chips")
+
+    sink = MemorySink(level=PROMPT)
+    handler = MessageHandler(sink, locale="en")
+    handler.get_message("now_chips", chips=Value())
+    handler.get_message("user_input")
+    assert Value.formatted == 1
+    assert sink.records == [(PROMPT, "user_input", "Enter your user name:")]
+
+    sink.level = INFO
+    handler.display_tables_info([{'no': 1, 'SB': 1, 'BB': 2, 'bet_type': 'no', 'CPUs': []}], 'existing')
+    assert sink.texts[-1].startswith("+----------+\n| Existing |\n+----------+\n")
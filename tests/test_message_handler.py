@@ -1,4 +1,4 @@
-from message_handler import MessageHandler
+from message_handler import DeltaMessageHandler, MessageHandler, NullMessageHandler
 from pot import Pot
 
 
@@ -56,3 +56,49 @@ def test_message_handler_display_community_cards(capfd):
     out, err = capfd.readouterr()
     assert "A♥" in out and "K♠" in out and "J♦" in out
     assert "600" in out
+
+
+def test_null_message_handler(capfd):
+    """
+    NullMessageHandlerクラスが何も表示しないことをテストします。
+    """
+    handler = NullMessageHandler()
+    handler.get_message("button_holder", player_name="Alice")
+    handler.display_players_info([MockPlayer("Alice", 1000, ["A♥", "K♠"], 200, True, "call", 0)])
+    handler.display_community_cards(["A♥", "K♠"], 600)
+    out, err = capfd.readouterr()
+    assert out == ""
+
+
+def test_delta_message_handler(capfd):
+    """変わった行だけが表示され、列幅が変わると表全体が表示し直されることを確認
+
+    """
+    handler = DeltaMessageHandler()
+    players = [
+        MockPlayer("Alice", 1000, ["A♥", "K♠"], 0, True, [], 0),
+        MockPlayer("Bob", 900, ["J♦", "Q♦"], 0, False, [], 0)
+    ]
+    handler.display_players_info(players)
+    out, _ = capfd.readouterr()
+    assert "PlayerName" in out and "Alice" in out and "Bob" in out
+
+    handler.display_players_info(players)
+    out, _ = capfd.readouterr()
+    assert out == ""
+
+    players[1].current_bet = 100
+    players[1].last_action = ["Call"]
+    handler.display_players_info(players)
+    out, _ = capfd.readouterr()
+    assert out.count("\n") == 1 and "Bob" in out and "Alice" not in out
+
+    players[1].chips = 1234567890
+    handler.display_players_info(players)
+    out, _ = capfd.readouterr()
+    assert "PlayerName" in out and "Alice" in out and "1234567890" in out
+
+    handler.display_community_cards(["A♥"], 100)
+    handler.display_community_cards(["A♥"], 100)
+    out, _ = capfd.readouterr()
+    assert out.count("A♥") == 1
@@ -0,0 +1,152 @@
+import asyncio
+import random
+
+import pytest
+
+from load_client import LoadStats, run_client, run_load
+from net_server import ProtocolServer
+from table_protocol import apply_delta, decode_message, encode_message, state_delta
+
+
+def test_encode_decode_message():
+    """メッセージが1行の JSON で変換、復元されることを確認
+
+    """
+    line = encode_message("act", action="raise", amount=10)
+    assert line.endswith(b"\n") and line.count(b"\n") == 1
+    assert decode_message(line) == {"type": "act", "action": "raise", "amount": 10}
+    with pytest.raises(ValueError):
+        decode_message(b"[1, 2]\n")
+
+
+def test_state_delta():
+    """変わったキーとリストの位置だけが差分になり、適用すると元の状態に戻ることを確認
+
+    """
+    previous = {"stacks": [100, 100, 100], "board": "", "pot": 3, "names": ["a", "b", "c"]}
+    current = {"stacks": [100, 90, 100], "board": "As Kd 2c", "pot": 13, "names": ["a", "b"]}
+    delta = state_delta(previous, current)
+    assert delta == {"stacks": {"1": 90}, "board": "As Kd 2c", "pot": 13, "names": ["a", "b"]}
+    assert state_delta(current, current) == {}
+    assert apply_delta({key: list(value) if isinstance(value, list) else value for key, value in previous.items()}, delta) == current
+
+
+def test_protocol_server():
+    """一覧、着席、アクションの要求と応答、エラーを確認
+
+    """
+    async def main():
+        server = ProtocolServer(seats_per_table=1, num_cpus=2, hands_per_table=3, rng=random.Random(0))
+        port = await server.start()
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+        async def request(message_type, **fields):
+            writer.write(encode_message(message_type, **fields))
+            await writer.drain()
+            return decode_message(await reader.readline())
+
+        tables = (await request("list_tables"))["tables"]
+        assert tables[0] == {"no": "1", "sb": 1, "bb": 2, "bet_type": "no", "seats": 1, "waiting": 0}
+        assert (await request("act", action="fold"))["type"] == "error"
+        assert (await request("dance"))["type"] == "error"
+        writer.close()
+
+        stats = LoadStats()
+        state = await run_client("127.0.0.1", port, "Alice", "4", stats, random.Random(1))
+        await server.close()
+        return stats, state
+
+    stats, state = asyncio.run(main())
+    assert stats.errors == 0
+    assert len(stats.hands) == 3
+    assert len(stats.latencies) > 0
+    assert sorted(state["names"]) == ["Alice", "CPU1", "CPU2"]
+    assert sum(state["stacks"]) == 200 * 3
+
+
+def test_protocol_server_rejects_invalid_sit():
+    """型の違うフィールドや重複した名前の着席はエラーを返すだけで、接続は続くことを確認
+
+    """
+    async def main():
+        server = ProtocolServer(seats_per_table=2, num_cpus=1, rng=random.Random(0))
+        port = await server.start()
+        replies = []
+        connections = [await asyncio.open_connection("127.0.0.1", port) for _ in range(2)]
+
+        async def request(index, message_type, **fields):
+            reader, writer = connections[index]
+            writer.write(encode_message(message_type, **fields))
+            await writer.drain()
+            return decode_message(await reader.readline())
+
+        for fields in [{"chips": None}, {"chips": [1]}, {"chips": {"a": 1}}, {"chips": True}, {"name": None},
+                       {"name": ["Alice"]}, {"table": None}, {"table": {"no": 1}}]:
+            message = {"table": "1", "name": "Alice", **fields}
+            replies.append((await request(0, "sit", **message))["type"])
+        assert (await request(0, "sit", table="1", name="Alice"))["type"] == "waiting"
+        replies.append((await request(1, "sit", table="1", name="Alice"))["type"])
+        replies.append((await request(1, "sit", table="1", name="CPU1"))["type"])
+        assert (await request(1, "list_tables"))["type"] == "tables"
+        for _, writer in connections:
+            writer.close()
+        await server.close()
+        return replies
+
+    assert asyncio.run(main()) == ["error"] * 10
+
+
+def test_protocol_server_rejects_invalid_amount():
+    """不正なベット額はエラーを返すだけで、テーブルは止まらずに進むことを確認
+
+    """
+    async def main():
+        server = ProtocolServer(seats_per_table=1, num_cpus=2, hands_per_table=2, rng=random.Random(0))
+        port = await server.start()
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(encode_message("sit", table="1", name="Alice"))
+        replies = []
+        actions = None
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            message = decode_message(line)
+            replies.append(message["type"])
+            if message["type"] == "prompt":
+                # 1回目の手番では不正な額を送り、エラーを受け取ってから同じ手番に正しいアクションを送る
+                actions = message["actions"]
+                amount = "abc" if "error" not in replies else None
+                writer.write(encode_message("act", action=actions[0], amount=amount))
+                await writer.drain()
+            elif message["type"] == "error":
+                writer.write(encode_message("act", action=actions[0]))
+                await writer.drain()
+            elif message["type"] == "table_closed":
+                break
+        writer.close()
+        await server.close()
+        return replies
+
+    replies = asyncio.run(main())
+    assert replies.count("error") == 1
+    assert replies.count("hand_end") == 2
+    assert replies[-1] == "table_closed"
+
+
+def test_run_load():
+    """複数のクライアントがテーブルを埋めて最後までプレイすることを確認
+
+    """
+    async def main():
+        server = ProtocolServer(seats_per_table=3, num_cpus=0, hands_per_table=2, rng=random.Random(0))
+        port = await server.start()
+        result = await run_load("127.0.0.1", port, 10, seed=0)
+        await server.close()
+        return result
+
+    result = asyncio.run(main())
+    assert result["clients"] == 9
+    assert result["hands"] == 3 * 2
+    assert result["errors"] == 0
+    assert result["messages_per_second"] > 0
@@ -0,0 +1,92 @@
+import io
+import json
+import random
+
+import pytest
+
+from headless_game import HeadlessGame
+from message_handler import MessageHandler
+from output_sink import (ACTION, INFO, PROMPT, STATE, ConnectionSink, JsonLogSink, MemorySink, MultiSink, NullSink, OutputSink,
+                         StdoutSink, level_from_name)
+
+
+class FakeWriter:
+    def __init__(self):
+        self.data = b""
+
+    def is_closing(self):
+        return False
+
+    def write(self, data):
+        self.data += data
+
+
+def test_output_sink_levels():
+    """レベル未満のメッセージが捨てられることを確認
+
+    """
+    sink = MemorySink(level=STATE)
+    sink.emit("action", ACTION)
+    sink.emit("state", STATE, key="players_info")
+    sink.emit("prompt", PROMPT)
+    assert sink.records == [(STATE, "players_info", "state"), (PROMPT, None, "prompt")]
+    assert not NullSink().enabled(PROMPT)
+    assert level_from_name("State") == STATE
+    with pytest.raises(ValueError):
+        level_from_name("verbose")
+
+    # write を実装していない出力先は作成時にエラーになる
+    class IncompleteSink(OutputSink):
+        pass
+
+    with pytest.raises(TypeError):
+        IncompleteSink()
+
+
+def test_stdout_sink_batches():
+    """件数がたまるか、入力を求めるメッセージでまとめて書き込まれることを確認
+
+    """
+    stream = io.StringIO()
+    sink = StdoutSink(stream=stream, batch_size=3)
+    sink.emit("a")
+    sink.emit("b")
+    assert stream.getvalue() == ""
+    sink.emit("c")
+    assert stream.getvalue() == "a\nb\nc\n"
+    sink.emit("d")
+    sink.emit("入力してください:", PROMPT)
+    assert stream.getvalue().endswith("d\n入力してください:\n")
+
+
+def test_json_log_and_connection_sinks(tmp_path):
+    """JSON のログと接続への送信の形式を確認
+
+    """
+    path = tmp_path / "messages.log"
+    writer = FakeWriter()
+    sink = MultiSink([JsonLogSink(str(path), level=INFO), ConnectionSink(writer, level=ACTION)])
+    sink.emit("hello", INFO, key="welcome_user")
+    sink.emit("row", ACTION, key="players_info")
+    sink.close()
+
+    records = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [(record["level"], record["key"], record["text"]) for record in records] == [("info", "welcome_user", "hello")]
+    messages = [json.loads(line) for line in writer.data.splitlines()]
+    assert [message["text"] for message in messages] == ["hello", "row"]
+    assert messages[0]["type"] == "message" and messages[1]["level"] == "action"
+
+
+def test_message_handler_suppresses_action_displays():
+    """出力先のレベルだけで、1アクションごとの表示を抑制できることを確認
+
+    """
+    counts = {}
+    for level in (ACTION, STATE):
+        sink = MemorySink(level=level)
+        game = HeadlessGame([{'name': f"CPU{i}", 'chips': 100} for i in range(4)], 'no', 1, 2, rng=random.Random(0))
+        game.message_handler = game.table.dealer.message_handler = MessageHandler(sink)
+        game.run(5)
+        counts[level] = len(sink.records)
+        assert all(record_level >= level for record_level, _, _ in sink.records)
+    assert 0 < counts[STATE] < counts[ACTION]
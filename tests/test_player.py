@@ -68,3 +68,14 @@ def test_player_select_bet_amount():
 
     player_human = Player("Alice", 1000, MockInputHandler(), is_cpu=False)
     assert player_human.select_bet_amount(10) == 10
+
+
+def test_player_callbacks():
+    """
+    Playerクラスのコールバックによるアクションとベット額の選択をテストします。
+    """
+    player = Player("Bot", 1000, MockInputHandler(), is_cpu=True,
+                    action_callback=lambda player, actions: actions[-1],
+                    bet_amount_callback=lambda player, min_amount, max_amount: max_amount)
+    assert player.select_action(['fold', 'call', 'raise']) == 'raise'
+    assert player.select_bet_amount(10, 500) == 500
@@ -1,9 +1,10 @@
-from pot import Pot
+from pot import Pot, PotLedger
 
 
 class MockPlayer:
-    def __init__(self, name):
+    def __init__(self, name, is_folded=False):
         self.name = name
+        self.is_folded = is_folded
 
 
 def test_pot_add_contribution():
@@ -60,3 +61,36 @@ def test_pot_get_eligible_players():
     assert player1 not in eligible_players
     assert player2 in eligible_players
     assert player3 not in eligible_players
+
+
+def test_pot_ledger():
+    """
+    PotLedgerクラスのサイドポットの計算をテストします。
+    """
+    ledger = PotLedger()
+    short = MockPlayer("Short")
+    middle = MockPlayer("Middle")
+    big = MockPlayer("Big")
+    folded = MockPlayer("Folded", is_folded=True)
+
+    # ベットのたびに累計額が記録される
+    for player, amount in [(short, 20), (middle, 20), (big, 20), (folded, 20),
+                           (short, 30), (middle, 100), (big, 100), (folded, 40), (big, 80)]:
+        ledger.add(player, amount)
+    assert ledger.total == 430
+
+    main_pot, side_pot, uncalled = ledger.pots()
+    # メインポット: 4人が50ずつ
+    assert main_pot.total == 200
+    assert main_pot.eligible_players == [short, middle, big]
+    # サイドポット: Middle と Big が70ずつ、Folded が10
+    assert side_pot.total == 150
+    assert side_pot.get_eligible_players() == [middle, big]
+    # 誰にもコールされなかった80は Big だけが獲得できる
+    assert uncalled.total == 80
+    assert uncalled.get_eligible_players() == [big]
+    assert sum(pot.total for pot in ledger.pots()) == ledger.total
+
+    ledger.reset()
+    assert ledger.total == 0
+    assert [pot.total for pot in ledger.pots()] == [0]
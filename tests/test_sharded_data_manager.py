@@ -0,0 +1,55 @@
+import sharded_data_manager as sharded_data_manager_module
+from data_manager import DataManager
+from sharded_data_manager import ShardedDataManager
+
+
+def test_sharded_data_manager(tmp_path):
+    """ユーザーがシャードに分けて保存され、読み込むシャードの数が制限されることを確認
+
+    """
+    directory = str(tmp_path / "users")
+    data_manager = ShardedDataManager(directory, num_shards=8, max_resident_shards=2, write_behind=True, flush_interval=None)
+    for index in range(100):
+        data_manager.add_new_user(f"user{index}", index)
+    assert data_manager.resident_shards == 2
+    assert data_manager.adjust_user_data("user7", 10) == 17
+    assert data_manager.get_or_create_user_data("user42") == 42
+    data_manager.delete_user("user0")
+    data_manager.close()
+
+    data_manager = ShardedDataManager(directory, num_shards=3)
+    assert data_manager.num_shards == 8
+    assert data_manager.resident_shards == 0
+    assert data_manager.get_user_data("user7") == 17
+    assert data_manager.get_user_data("user0") is None
+    assert data_manager.resident_shards == len({data_manager.shard_index("user7"), data_manager.shard_index("user0")})
+    data_manager.update_user_data("user7", 70)
+    data = data_manager.data
+    assert len(data) == 99 and data["user7"] == 70 and data["user99"] == 99
+    assert data_manager.resident_shards == len({data_manager.shard_index("user7"), data_manager.shard_index("user0")})
+    assert sum(len(DataManager(str(path)).data) for path in (tmp_path / "users").glob("shard-*.json")) == 99
+
+
+def test_sharded_data_manager_data_cache(tmp_path, monkeypatch):
+    """全ユーザーのデータをまとめた結果が、更新されるまでファイルを読み直さずに使われることを確認
+
+    """
+    directory = str(tmp_path / "users")
+    data_manager = ShardedDataManager(directory, num_shards=8, max_resident_shards=2)
+    for index in range(20):
+        data_manager.add_new_user(f"user{index}", index)
+    data_manager.close()
+
+    data_manager = ShardedDataManager(directory)
+    loads = []
+    json_load = sharded_data_manager_module.json.load
+    monkeypatch.setattr(sharded_data_manager_module.json, "load", lambda file: loads.append(file.name) or json_load(file))
+    assert len(data_manager.data) == 20
+    num_loads = len(loads)
+    assert num_loads > 0
+    data = data_manager.data
+    data["user1"] = 1000
+    assert data_manager.data["user1"] == 1 and len(loads) == num_loads
+
+    data_manager.update_user_data("user1", 100)
+    assert data_manager.data["user1"] == 100 and len(loads) > num_loads
@@ -0,0 +1,82 @@
+import asyncio
+import random
+
+import pytest
+
+from table_server import AsyncTable, HumanSeat, TableServer
+
+
+def make_seats(num_seats, chips=150, human=None):
+    """席の設定を作る。human を指定した場合は最初の席を人間のプレイヤーにする。
+
+    """
+    seats = [{'name': f"ボット{i + 1}", 'chips': chips} for i in range(num_seats)]
+    if human is not None:
+        seats[0] = {'name': "あなた", 'chips': chips, 'bot': human}
+    return seats
+
+
+def test_table_server_runs_tables_concurrently():
+    """複数のテーブルが並行して進み、チップの合計が保たれることを確認
+
+    """
+    async def main():
+        server = TableServer()
+        tables = [server.open_table(f"table{i}", make_seats(6), 'no', 1, 2, num_hands=20, rebuy=False,
+                                    rng=random.Random(i))
+                  for i in range(50)]
+        assert len(server.tables) == 50
+        await server.wait_closed()
+        return server, tables
+
+    server, tables = asyncio.run(main())
+    assert server.tables == {}
+    for table in tables:
+        assert 0 < table.hands_played <= 20
+        assert sum(player.chips for player in table.players) == 150 * 6
+
+
+def test_async_table_matches_headless_game():
+    """ボットだけのテーブルが HeadlessGame と同じハンドをプレイすることを確認
+
+    """
+    from headless_game import HeadlessGame
+
+    expected = []
+    HeadlessGame(make_seats(6), 'no', 1, 2, rng=random.Random(5)).run(30, on_hand=expected.append)
+    records = []
+    table = AsyncTable("table", make_seats(6), 'no', 1, 2, rng=random.Random(5))
+    asyncio.run(table.run_async(30, on_hand=lambda _, record: records.append(record)))
+    assert records == expected
+
+
+def test_human_seat():
+    """人間のプレイヤーの入力を待ち、制限時間を過ぎたらチェックかフォールドすることを確認
+
+    """
+    prompts = []
+
+    def on_prompt(seat, actions):
+        prompts.append(list(actions))
+        if len(prompts) == 1:
+            with pytest.raises(ValueError):
+                seat.submit("dance")
+            for amount in ("abc", 1.5, True):
+                with pytest.raises(ValueError):
+                    seat.submit(actions[0], amount)
+            asyncio.get_running_loop().call_soon(seat.submit, "call" if "call" in actions else "check")
+
+    human = HumanSeat(on_prompt=on_prompt)
+
+    async def main():
+        server = TableServer(decision_timeout=0.01)
+        table = server.open_table("table", make_seats(3, human=human), 'no', 1, 2, num_hands=3, rng=random.Random(1))
+        await server.wait_closed()
+        return table
+
+    table = asyncio.run(main())
+    assert table.hands_played == 3
+    assert prompts and human.timeouts == len(prompts) - 1
+    assert not human.is_waiting
+    with pytest.raises(RuntimeError):
+        human.submit("fold")